@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Batch Solver Module
+
+Scores many puzzles in parallel across a process pool, for pre-computing
+optimal move counts offline.
+
+Input is JSONL, one puzzle per line:
+
+    {"id": "p1", "edges": [[1, 2], [2, 3]], "tiles": {"1": 3, "2": 1, "3": 2}}
+
+Output is JSONL in the same order, one result per input line:
+
+    {"id": "p1", "optimal_moves": 2, "exact": true, "lower_bound": 2,
+     "upper_bound": 2, "strategy": "path"}
+
+Usage:
+    python batch_solver.py puzzles.jsonl -o scores.jsonl --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from itertools import islice
+
+from graph import Graph
+from score_calculator import ScoreCalculator
+
+
+def solve_record(record, time_budget=None):
+    """
+    Score a single puzzle record.
+
+    Args:
+        record: dict with 'edges' (list of node pairs), 'tiles' (dict of
+            node -> tile, keys may be strings as in JSON) and optional 'id'
+        time_budget: Optional search time limit in seconds
+
+    Returns:
+        Result dict; holds 'error' instead of the scores if the record
+        is malformed (including lines _read_records could not parse)
+    """
+    result = {'id': _record_id(record)}
+    try:
+        if not isinstance(record, dict):
+            raise TypeError("Record must be a JSON object")
+        if _PARSE_ERROR in record:
+            result['error'] = record[_PARSE_ERROR]
+            return result
+
+        graph = Graph()
+        for node1, node2 in record['edges']:
+            graph.add_edge(int(node1), int(node2))
+        tiles = {int(node): int(tile) for node, tile in record['tiles'].items()}
+        if not graph.is_connected():
+            raise ValueError("Graph is not connected")
+
+        solved = ScoreCalculator.solve(graph, tiles, time_budget)
+        result.update({
+            'optimal_moves': solved.optimal_moves,
+            'exact': solved.exact,
+            'lower_bound': solved.lower_bound,
+            'upper_bound': solved.upper_bound,
+            'strategy': solved.strategy
+        })
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+# Key marking a line _read_records could not parse
+_PARSE_ERROR = '_parse_error'
+
+
+def _record_id(record):
+    """The record's 'id', or None if the record is not an object."""
+    return record.get('id') if isinstance(record, dict) else None
+
+
+def _solve_chunk(records, time_budget):
+    """Worker entry point: score a list of records."""
+    return [solve_record(record, time_budget) for record in records]
+
+
+class BatchSolver:
+    """
+    Fans puzzle records out over a ProcessPoolExecutor.
+
+    Records are grouped into chunks to amortize inter-process overhead.
+    A bounded number of chunks is kept in flight so memory stays flat on
+    arbitrarily long inputs, and results are yielded in input order.
+    """
+
+    def __init__(self, workers=None, chunk_size=32, time_budget=None, timeout=None):
+        """
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            chunk_size: Records sent to a worker at a time
+            time_budget: Search time limit per puzzle, passed to ScoreCalculator
+            timeout: Seconds to wait for a chunk once it is next in line;
+                records of a chunk that misses it are reported as errors.
+                The clock starts when the caller begins waiting on the
+                chunk, not when a worker picks it up, so a chunk queued
+                behind slow ones gets extra time. A chunk that already
+                started keeps its worker busy until it finishes, since
+                running tasks cannot be interrupted; use time_budget to
+                bound the work per puzzle.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.time_budget = time_budget
+        self.timeout = timeout
+
+    def _chunks(self, records):
+        """Split an iterable of records into lists of chunk_size."""
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def solve(self, records):
+        """
+        Score records in parallel.
+
+        Args:
+            records: Iterable of puzzle record dicts
+
+        Yields:
+            Result dicts (see solve_record) in the same order as the input
+        """
+        executor = ProcessPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        chunks = self._chunks(records)
+        try:
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(_solve_chunk, chunk, self.time_budget)))
+                if len(pending) >= 2 * self.workers:
+                    yield from self._collect(*pending.popleft())
+            while pending:
+                yield from self._collect(*pending.popleft())
+        finally:
+            # Don't block on chunks abandoned after a timeout
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _collect(self, chunk, future):
+        """
+        Wait for one chunk's results, converting a timeout or a failed
+        worker into per-record errors so the rest of the batch goes on.
+        """
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            error = 'timeout'
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        return [{'id': _record_id(record), 'error': error} for record in chunk]
+
+
+def _read_records(stream):
+    """
+    Parse JSONL records, skipping blank lines. A line that is not valid
+    JSON is passed on marked with its parse error, so it becomes an error
+    result in its place instead of stopping the run.
+    """
+    for line in stream:
+        line = line.strip()
+        if line:
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield {_PARSE_ERROR: f"{type(e).__name__}: {e}"}
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Score Tile Swap puzzles in parallel.")
+    parser.add_argument('input', nargs='?', default='-', help="JSONL puzzle file ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL result file ('-' for stdout)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=32, help="records per task")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="search seconds per puzzle before falling back to bounds")
+    parser.add_argument('--timeout', type=float, default=None,
+                        help="seconds to wait for a task once it is next in line before "
+                             "reporting its records as timed out (a started task still runs "
+                             "to completion in its worker)")
+    args = parser.parse_args(argv)
+
+    solver = BatchSolver(args.workers, args.chunk_size, args.time_budget, args.timeout)
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        for result in solver.solve(_read_records(source)):
+            target.write(json.dumps(result) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Bound Tracker Module
+
+Keeps the distance-to-goal lower bounds of a game in progress up to date
+after every swap, without recomputing them from scratch.
+"""
+
+from solution_bounds import SolutionBounds
+
+
+class BoundTracker:
+    """
+    Incrementally maintained lower bounds on the moves left.
+
+    Tracks the number of permutation cycles (cycle-decomposition bound) and
+    the total shortest-path distance of tiles from home (distance bound).
+    Must be told about every swap via apply_swap(), after the swap is made.
+    """
+
+    def __init__(self, graph, counts=None):
+        """
+        Args:
+            graph: Graph whose tiles are tracked
+            counts: Optional (cycle_count, distance_total) saved from an
+                earlier tracker for the same tiles, skipping the recount
+        """
+        self.graph = graph
+        self.num_nodes = len(graph.tiles)
+
+        # The distance bound needs shortest paths, which are only
+        # affordable below the same size limit SolutionBounds uses
+        self.track_distance = self.num_nodes <= SolutionBounds.DISTANCE_BOUND_MAX_NODES
+        if counts is not None:
+            self.cycle_count, self.distance_total = counts
+            return
+
+        self.cycle_count = self._count_cycles()
+        self.distance_total = 0
+        if self.track_distance:
+            for node, tile in graph.tiles.items():
+                self.distance_total += graph.distance(tile, node)
+
+    def _count_cycles(self):
+        """Count cycles of the node -> tile permutation."""
+        tiles = self.graph.tiles
+        visited = set()
+        cycles = 0
+        for start in tiles:
+            if start in visited:
+                continue
+            cycles += 1
+            current = start
+            while current not in visited:
+                visited.add(current)
+                current = tiles[current]
+        return cycles
+
+    def apply_swap(self, node1, node2):
+        """
+        Update the bounds after the tiles on node1 and node2 were swapped.
+
+        Runs in O(length of the affected cycle) plus O(1) distance lookups,
+        or two BFS when the distance matrix has not been built.
+        """
+        # A transposition either splits one cycle or merges two. Swapping is
+        # its own inverse, so if the nodes share a cycle now they did not
+        # before and the swap merged two cycles.
+        tiles = self.graph.tiles
+        current = tiles[node1]
+        while current != node1 and current != node2:
+            current = tiles[current]
+        if current == node2:
+            self.cycle_count -= 1
+        else:
+            self.cycle_count += 1
+
+        if self.track_distance:
+            tile1, tile2 = tiles[node1], tiles[node2]
+            graph = self.graph
+            if graph.distance_matrix_size():
+                distance = graph.distance
+                self.distance_total += (distance(tile1, node1) + distance(tile2, node2)
+                                        - distance(tile1, node2) - distance(tile2, node1))
+            else:
+                # Restored from counts: two BFS instead of the whole matrix
+                from1, from2 = graph.distances_from(tile1), graph.distances_from(tile2)
+                self.distance_total += from1[node1] + from2[node2] - from1[node2] - from2[node1]
+
+    def cycle_lower_bound(self):
+        """Swaps needed on a complete graph: nodes minus cycles."""
+        return self.num_nodes - self.cycle_count
+
+    def distance_lower_bound(self):
+        """Half the total tile distance from home, rounded up (None if untracked)."""
+        if not self.track_distance:
+            return None
+        return (self.distance_total + 1) // 2
+
+    def moves_left_lower_bound(self):
+        """Best lower bound on the number of moves still needed."""
+        return max(self.cycle_lower_bound(), self.distance_lower_bound() or 0)
+
+    def as_dict(self):
+        """Bounds for JSON responses."""
+        return {
+            'cycle': self.cycle_lower_bound(),
+            'distance': self.distance_lower_bound(),
+            'moves_left': self.moves_left_lower_bound()
+        }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compact Graph Module
+
+Frozen, array-backed (CSR) view of a Tile Swap graph for hot loops and
+for holding many graphs in memory at once.
+"""
+
+from array import array
+from bisect import bisect_left
+
+
+class CompactGraph:
+    """
+    Immutable compressed-sparse-row graph.
+
+    Node labels are mapped to dense indices 0..n-1 in sorted order. The
+    neighbors of index i are targets[offsets[i]:offsets[i + 1]], sorted,
+    so hot paths can walk adjacency with integer arithmetic only.
+    """
+
+    __slots__ = ('nodes', 'index', 'offsets', 'targets')
+
+    def __init__(self, nodes, offsets, targets):
+        object.__setattr__(self, 'nodes', tuple(nodes))
+        object.__setattr__(self, 'index', {node: i for i, node in enumerate(self.nodes)})
+        object.__setattr__(self, 'offsets', offsets)
+        object.__setattr__(self, 'targets', targets)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompactGraph is immutable")
+
+    def __reduce__(self):
+        # Pickle through the constructor; the default slot restore would
+        # go through __setattr__
+        return (CompactGraph, (self.nodes, self.offsets, self.targets))
+
+    @classmethod
+    def from_adjacency(cls, adjacency_list):
+        """Build from a dict mapping node -> iterable of neighbors."""
+        nodes = sorted(adjacency_list)
+        index = {node: i for i, node in enumerate(nodes)}
+
+        offsets = array('i', [0])
+        targets = array('i')
+        for node in nodes:
+            targets.extend(sorted(index[neighbor] for neighbor in adjacency_list[node]))
+            offsets.append(len(targets))
+
+        return cls(nodes, offsets, targets)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Build from an iterable of (node1, node2) pairs."""
+        adjacency_list = {}
+        for node1, node2 in edges:
+            adjacency_list.setdefault(node1, set()).add(node2)
+            adjacency_list.setdefault(node2, set()).add(node1)
+        return cls.from_adjacency(adjacency_list)
+
+    def num_nodes(self):
+        """Return the number of nodes."""
+        return len(self.nodes)
+
+    def num_edges(self):
+        """Return the number of undirected edges."""
+        return len(self.targets) // 2
+
+    def neighbors(self, i):
+        """Return the dense neighbor indices of dense index i."""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def degree(self, i):
+        """Return the degree of dense index i."""
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def has_edge(self, i, j):
+        """Check if dense indices i and j are adjacent."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        position = bisect_left(self.targets, j, start, end)
+        return position < end and self.targets[position] == j
+
+    def are_connected(self, node1, node2):
+        """Check if two node labels are directly connected."""
+        index = self.index
+        if node1 not in index or node2 not in index:
+            return False
+        return self.has_edge(index[node1], index[node2])
+
+    def edges(self):
+        """Yield each undirected edge once as a (node1, node2) label pair."""
+        nodes, offsets, targets = self.nodes, self.offsets, self.targets
+        for i in range(len(nodes)):
+            for k in range(offsets[i], offsets[i + 1]):
+                j = targets[k]
+                if i < j:
+                    yield (nodes[i], nodes[j])
@@ -5,7 +5,7 @@ Game Display Module
 Handles all game display and visualization for Tile Swap.
 """
 
-import math
+from layout_engine import LayoutEngine
 
 
 class GameDisplay:
@@ -30,22 +30,21 @@ class GameDisplay:
             print(f"  Node {node}: Tile {tile} {match}")
 
     def display_visual_graph(self):
-        """Display a visual representation of the graph with tiles (circular layout)."""
+        """Display a visual representation of the graph with tiles."""
         nodes = self.graph.get_nodes()
         num_nodes = len(nodes)
 
         if num_nodes == 0:
             return
 
-        # Always show circular layout
-        self._display_circular_layout()
+        self._display_graph_layout()
 
     def display_adjacency_matrix(self):
         """Display adjacency matrix (for reference at game start)."""
         self._display_adjacency_matrix()
 
-    def _display_circular_layout(self):
-        """Display small graphs using ASCII art in a circular layout."""
+    def _display_graph_layout(self):
+        """Display the graph as ASCII art, placed by LayoutEngine."""
         nodes = self.graph.get_nodes()
         num_nodes = len(nodes)
 
@@ -53,16 +52,16 @@ class GameDisplay:
         print("=" * 60)
 
         radius = max(8, num_nodes * 2)
-        center_x = radius + 5
-        center_y = radius + 5
 
-        # Calculate positions for each node
+        # Map the layout's [0.1, 0.9] box onto the grid, keeping 5 cells of
+        # border (a circular layout lands exactly on a circle of this radius)
+        margin = LayoutEngine.MARGIN
+        scale = 2 * radius / (1 - 2 * margin)
         node_positions = {}
-        for i, node in enumerate(nodes):
-            angle = 2 * math.pi * i / num_nodes - math.pi / 2
-            x = int(center_x + radius * math.cos(angle))
-            y = int(center_y + radius * math.sin(angle))
-            node_positions[node] = (x, y)
+        for node, (px, py) in zip(nodes, LayoutEngine.layout(self.graph)):
+            # The epsilon keeps float noise from truncating a cell short
+            node_positions[node] = (int(5 + (px - margin) * scale + 1e-9),
+                                    int(5 + (py - margin) * scale + 1e-9))
 
         # Create a 2D grid for drawing
         grid_size = 2 * radius + 10
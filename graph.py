@@ -5,8 +5,12 @@ Graph Module
 Represents an undirected connected graph data structure for Tile Swap.
 """
 
+import hashlib
+from array import array
 from collections import deque
 
+from compact_graph import CompactGraph
+
 
 class Graph:
     """Represents an undirected connected graph with tile assignments."""
@@ -14,9 +18,18 @@ class Graph:
     def __init__(self):
         self.adjacency_list = {}
         self.tiles = {}
+        self._compact = None    # Frozen CSR view, built lazily
+        self._distances = None  # Flat all-pairs distance matrix, built lazily
+        self._fingerprint = None
+        self._family = None     # '' once detected as no special family
 
     def add_edge(self, node1, node2):
         """Add an edge between two nodes."""
+        self._compact = None
+        self._distances = None
+        self._fingerprint = None
+        self._family = None
+
         if node1 not in self.adjacency_list:
             self.adjacency_list[node1] = set()
         if node2 not in self.adjacency_list:
@@ -27,7 +40,18 @@ class Graph:
 
     def get_nodes(self):
         """Return sorted list of all nodes."""
-        return sorted(self.adjacency_list.keys())
+        return list(self.compact().nodes)
+
+    def compact(self):
+        """
+        Return a frozen array-backed (CSR) view of the graph.
+
+        Cached until the next add_edge(); its nodes attribute is the sorted
+        node tuple and dense indices follow that order.
+        """
+        if self._compact is None:
+            self._compact = CompactGraph.from_adjacency(self.adjacency_list)
+        return self._compact
 
     def get_neighbors(self, node):
         """Return the neighbors of a node."""
@@ -60,3 +84,120 @@ class Graph:
     def are_connected(self, node1, node2):
         """Check if two nodes are directly connected."""
         return node2 in self.get_neighbors(node1)
+
+    def fingerprint(self):
+        """
+        Return a canonical hash of the edge set.
+
+        Equal for any two graphs with the same edges regardless of insertion
+        order, and stable across processes, so it can key shared caches.
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for node1, node2 in self.compact().edges():
+                digest.update(f"{node1}-{node2};".encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def family(self):
+        """
+        Detect whether the graph belongs to a special family.
+
+        Checked in order, so overlapping small cases resolve to the first
+        match (a triangle is 'complete', a three-node path is 'path').
+
+        Returns:
+            'complete', 'path', 'star', 'cycle', or None for any other graph
+        """
+        if self._family is None:
+            compact = self.compact()
+            n = compact.num_nodes()
+            m = compact.num_edges()
+            degrees = [compact.degree(i) for i in range(n)]
+
+            if n == 0:
+                self._family = ''
+            elif m == n * (n - 1) // 2:
+                self._family = 'complete'
+            elif m == n - 1 and max(degrees) <= 2 and self.is_connected():
+                self._family = 'path'
+            elif m == n - 1 and max(degrees) == n - 1:
+                self._family = 'star'
+            elif m == n and min(degrees) == max(degrees) == 2 and self.is_connected():
+                self._family = 'cycle'
+            else:
+                self._family = ''
+
+        return self._family or None
+
+    def distance_matrix(self):
+        """
+        Return the all-pairs shortest-path distance matrix.
+
+        Computed once with one BFS per node and cached until the next
+        add_edge(). Unreachable pairs hold -1.
+
+        Returns:
+            Tuple (node_index, distances) where node_index maps node -> dense
+            index (sorted node order) and distances is a flat array('i') with
+            the distance from u to v at distances[index[u] * n + index[v]]
+        """
+        compact = self.compact()
+        if self._distances is None:
+            size = compact.num_nodes()
+            offsets, targets = compact.offsets, compact.targets
+            distances = array('i', [-1]) * (size * size)
+
+            for source in range(size):
+                row = source * size
+                distances[row + source] = 0
+                queue = deque([source])
+                while queue:
+                    current = queue.popleft()
+                    next_distance = distances[row + current] + 1
+                    for k in range(offsets[current], offsets[current + 1]):
+                        neighbor = targets[k]
+                        if distances[row + neighbor] < 0:
+                            distances[row + neighbor] = next_distance
+                            queue.append(neighbor)
+
+            self._distances = distances
+
+        return compact.index, self._distances
+
+    def distance_matrix_size(self):
+        """Return the bytes held by the cached distance matrix (0 if not built)."""
+        if self._distances is None:
+            return 0
+        return self._distances.itemsize * len(self._distances)
+
+    def distance(self, node1, node2):
+        """Return the shortest-path distance between two nodes (-1 if unreachable)."""
+        index, distances = self.distance_matrix()
+        return distances[index[node1] * len(index) + index[node2]]
+
+    def distances_from(self, node):
+        """
+        Return a dict of shortest-path distances from one node.
+
+        A single BFS; cheaper than distance() while the all-pairs matrix
+        has not been built. Unreachable nodes are left out.
+        """
+        distances = {node: 0}
+        queue = deque([node])
+        adjacency_list = self.adjacency_list
+        while queue:
+            current = queue.popleft()
+            next_distance = distances[current] + 1
+            for neighbor in adjacency_list[current]:
+                if neighbor not in distances:
+                    distances[neighbor] = next_distance
+                    queue.append(neighbor)
+        return distances
+
+    def eccentricity(self, node):
+        """Return the greatest distance from a node to any other node."""
+        index, distances = self.distance_matrix()
+        size = len(index)
+        row = index[node] * size
+        return max(distances[row:row + size])
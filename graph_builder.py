@@ -12,6 +12,36 @@ from graph import Graph
 class GraphBuilder:
     """Handles graph creation from various sources."""
 
+    # Node cap for normal play; large-graph mode raises it
+    DEFAULT_MAX_NODES = 20
+    LARGE_GRAPH_MAX_NODES = 5000
+    max_nodes = DEFAULT_MAX_NODES
+
+    @staticmethod
+    def enable_large_graph_mode(max_nodes=LARGE_GRAPH_MAX_NODES):
+        """Allow graphs with up to max_nodes nodes (for training and benchmarks)."""
+        GraphBuilder.max_nodes = max(GraphBuilder.DEFAULT_MAX_NODES, max_nodes)
+
+    @staticmethod
+    def disable_large_graph_mode():
+        """Restore the default node cap."""
+        GraphBuilder.max_nodes = GraphBuilder.DEFAULT_MAX_NODES
+
+    @staticmethod
+    def is_large_graph(num_nodes):
+        """Check if a graph of this size is only allowed in large-graph mode."""
+        return num_nodes > GraphBuilder.DEFAULT_MAX_NODES
+
+    @staticmethod
+    def new_seed():
+        """Pick a fresh 32-bit seed for a reproducible puzzle."""
+        return random.getrandbits(32)
+
+    @staticmethod
+    def rng(seed=None):
+        """Private generator for a seed, or the shared module generator if None."""
+        return random.Random(seed) if seed is not None else random
+
     @staticmethod
     def create_manually():
         """Allow user to create a graph by entering edges manually."""
@@ -56,8 +86,8 @@ class GraphBuilder:
             print("No edges were added. Graph creation cancelled.")
             return None
 
-        if len(graph.get_nodes()) > 20:
-            print(f"Graph has {len(graph.get_nodes())} nodes. Maximum 20 nodes allowed.")
+        if len(graph.get_nodes()) > GraphBuilder.max_nodes:
+            print(f"Graph has {len(graph.get_nodes())} nodes. Maximum {GraphBuilder.max_nodes} nodes allowed.")
             return None
 
         if not graph.is_connected():
@@ -112,8 +142,8 @@ class GraphBuilder:
                 print("No valid edges found in file.")
                 return None
 
-            if len(graph.get_nodes()) > 20:
-                print(f"Graph has {len(graph.get_nodes())} nodes. Maximum 20 nodes allowed.")
+            if len(graph.get_nodes()) > GraphBuilder.max_nodes:
+                print(f"Graph has {len(graph.get_nodes())} nodes. Maximum {GraphBuilder.max_nodes} nodes allowed.")
                 return None
 
             if not graph.is_connected():
@@ -144,8 +174,8 @@ class GraphBuilder:
             if num_nodes < 2:
                 print("Need at least 2 nodes.")
                 return None
-            if num_nodes > 20:
-                print("Maximum 20 nodes allowed.")
+            if num_nodes > GraphBuilder.max_nodes:
+                print(f"Maximum {GraphBuilder.max_nodes} nodes allowed.")
                 return None
         except ValueError:
             print("Invalid input.")
@@ -174,49 +204,26 @@ class GraphBuilder:
                 print("Invalid input.")
                 return None
 
-        graph = Graph()
-        nodes = list(range(1, num_nodes + 1))
-
-        # Create a random spanning tree to ensure connectivity
-        remaining_nodes = nodes[1:]
-        random.shuffle(remaining_nodes)
-        connected_nodes = [nodes[0]]
-
-        for node in remaining_nodes:
-            connect_to = random.choice(connected_nodes)
-            graph.add_edge(node, connect_to)
-            connected_nodes.append(node)
-
-        # Add additional random edges
-        edges_added = num_nodes - 1
-        max_attempts = num_edges * 3
-        attempts = 0
-
-        while edges_added < num_edges and attempts < max_attempts:
-            attempts += 1
-            node1 = random.choice(nodes)
-            node2 = random.choice(nodes)
-
-            if node1 != node2 and node2 not in graph.get_neighbors(node1):
-                graph.add_edge(node1, node2)
-                edges_added += 1
+        graph = GraphBuilder._generate_random_graph(num_nodes, num_edges)
 
-        print(f"Generated random graph with {num_nodes} nodes and {edges_added} edges.")
+        print(f"Generated random graph with {num_nodes} nodes and {num_edges} edges.")
         return graph
 
     @staticmethod
-    def create_random_with_params(num_nodes, num_edges):
+    def create_random_with_params(num_nodes, num_edges, seed=None):
         """
         Generate a random connected graph with specified parameters.
 
         Args:
             num_nodes: Number of nodes to create
             num_edges: Number of edges to create
+            seed: Optional seed; the same (seed, num_nodes, num_edges)
+                always produces the same graph
 
         Returns:
             Graph object or None if invalid parameters
         """
-        if num_nodes < 2 or num_nodes > 20:
+        if num_nodes < 2 or num_nodes > GraphBuilder.max_nodes:
             return None
 
         min_edges = num_nodes - 1
@@ -225,31 +232,52 @@ class GraphBuilder:
         if num_edges < min_edges or num_edges > max_edges:
             return None
 
+        return GraphBuilder._generate_random_graph(num_nodes, num_edges, seed)
+
+    @staticmethod
+    def _generate_random_graph(num_nodes, num_edges, seed=None):
+        """
+        Build a random connected graph with exactly num_edges edges.
+
+        A random spanning tree guarantees connectivity. Extra edges are
+        rejection-sampled while the graph is sparse; once more than half of
+        the remaining pairs are needed they are drawn from the explicit list
+        of free pairs instead, so generation stays linear in the output size.
+        With a seed all randomness comes from a private random.Random.
+        """
+        rng = GraphBuilder.rng(seed)
         graph = Graph()
         nodes = list(range(1, num_nodes + 1))
+        edge_set = set()
 
         # Create a random spanning tree to ensure connectivity
         remaining_nodes = nodes[1:]
-        random.shuffle(remaining_nodes)
+        rng.shuffle(remaining_nodes)
         connected_nodes = [nodes[0]]
 
         for node in remaining_nodes:
-            connect_to = random.choice(connected_nodes)
+            connect_to = rng.choice(connected_nodes)
             graph.add_edge(node, connect_to)
+            edge_set.add((min(node, connect_to), max(node, connect_to)))
             connected_nodes.append(node)
 
         # Add additional random edges
-        edges_added = num_nodes - 1
-        max_attempts = num_edges * 3
-        attempts = 0
-
-        while edges_added < num_edges and attempts < max_attempts:
-            attempts += 1
-            node1 = random.choice(nodes)
-            node2 = random.choice(nodes)
-
-            if node1 != node2 and node2 not in graph.get_neighbors(node1):
+        extra_edges = num_edges - (num_nodes - 1)
+        free_pairs = num_nodes * (num_nodes - 1) // 2 - len(edge_set)
+
+        if extra_edges * 2 <= free_pairs:
+            while extra_edges > 0:
+                node1 = rng.randint(1, num_nodes)
+                node2 = rng.randint(1, num_nodes)
+                edge = (min(node1, node2), max(node1, node2))
+                if node1 != node2 and edge not in edge_set:
+                    edge_set.add(edge)
+                    graph.add_edge(node1, node2)
+                    extra_edges -= 1
+        else:
+            candidates = [(node1, node2) for node1 in nodes for node2 in range(node1 + 1, num_nodes + 1)
+                          if (node1, node2) not in edge_set]
+            for node1, node2 in rng.sample(candidates, extra_edges):
                 graph.add_edge(node1, node2)
-                edges_added += 1
 
         return graph
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Hint Engine Module
+
+Suggests the best next swap from the current tile configuration.
+"""
+
+import threading
+from collections import OrderedDict
+
+from ida_star_solver import IDAStarSolver
+from score_calculator import ScoreCalculator
+from solution_bounds import SolutionBounds
+
+
+class HintEngine:
+    """
+    Finds a swap that lies on a shortest solution.
+
+    Solvers and solved plans are cached per graph fingerprint and shared by
+    every game on the same graph, so following hints (or several players on
+    the same puzzle) costs a dictionary lookup after the first search. When
+    the exact search cannot finish inside LATENCY_BUDGET a greedy move is
+    suggested instead and marked as not exact.
+    """
+
+    # Seconds the exact search may take before the greedy fallback is used;
+    # leaves headroom under a 50 ms response target
+    LATENCY_BUDGET = 0.03
+
+    MAX_CACHED_GRAPHS = 64
+    MAX_CACHED_PLANS = 4096
+
+    _graphs = OrderedDict()
+    _graphs_lock = threading.Lock()
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.nodes = graph.compact().nodes
+        self.entry = HintEngine._entry_for(graph)
+
+    @staticmethod
+    def _entry_for(graph):
+        """Get or create the shared solver cache entry for a graph."""
+        key = graph.fingerprint()
+        with HintEngine._graphs_lock:
+            entry = HintEngine._graphs.get(key)
+            if entry is None:
+                # Idle solvers; None when the graph is too big for exact search
+                solvers = None
+                if len(graph.adjacency_list) <= ScoreCalculator.EXACT_SEARCH_MAX_NODES:
+                    solvers = [IDAStarSolver(graph, HintEngine.LATENCY_BUDGET)]
+                entry = {'solvers': solvers, 'plans': OrderedDict(), 'lock': threading.Lock()}
+                HintEngine._graphs[key] = entry
+                if len(HintEngine._graphs) > HintEngine.MAX_CACHED_GRAPHS:
+                    HintEngine._graphs.popitem(last=False)
+            else:
+                HintEngine._graphs.move_to_end(key)
+            return entry
+
+    def suggest(self, tiles):
+        """
+        Suggest the next swap.
+
+        Args:
+            tiles: dict mapping node -> tile number
+
+        Returns:
+            dict with 'node1', 'node2', 'exact' and 'moves_left' (None when
+            not exact), or None if the puzzle is already solved
+        """
+        key = tuple(tiles[node] for node in self.nodes)
+        if key == self.nodes:
+            return None
+
+        # The lock only guards the plan table and the solver pool; searches
+        # run outside it so concurrent hints on one graph do not queue up
+        entry = self.entry
+        solver = None
+        with entry['lock']:
+            plans = entry['plans']
+            plan = plans.get(key)
+            if plan is not None:
+                plans.move_to_end(key)
+                return self._hint(plan[0], True, len(plan))
+            if entry['solvers']:
+                solver = entry['solvers'].pop()
+
+        if entry['solvers'] is not None:
+            # A solver keeps per-search state, so each search needs its own
+            if solver is None:
+                solver = IDAStarSolver(self.graph, HintEngine.LATENCY_BUDGET)
+            result = solver.solve(tiles)
+            with entry['lock']:
+                entry['solvers'].append(solver)
+                if result.exact:
+                    self._store_plan(key, result.moves)
+            if result.exact:
+                return self._hint(result.moves[0], True, len(result.moves))
+
+        return self._hint(self._greedy_move(tiles), False, None)
+
+    def _store_plan(self, key, moves):
+        """Cache the remaining optimal plan for every state along a solution."""
+        plans = self.entry['plans']
+        index = {node: i for i, node in enumerate(self.nodes)}
+        state = list(key)
+
+        for step, (node1, node2) in enumerate(moves):
+            plans[tuple(state)] = moves[step:]
+            i, j = index[node1], index[node2]
+            state[i], state[j] = state[j], state[i]
+
+        while len(plans) > HintEngine.MAX_CACHED_PLANS:
+            plans.popitem(last=False)
+
+    def _greedy_move(self, tiles):
+        """
+        Fast heuristic move.
+
+        Prefers a swap that brings both tiles closer to home; otherwise the
+        first move of the spanning-tree greedy solution.
+        """
+        if len(tiles) <= SolutionBounds.DISTANCE_BOUND_MAX_NODES:
+            distance = self.graph.distance
+            for node1, node2 in self.graph.compact().edges():
+                tile1, tile2 = tiles[node1], tiles[node2]
+                if distance(tile1, node2) < distance(tile1, node1) and \
+                        distance(tile2, node1) < distance(tile2, node2):
+                    return (node1, node2)
+
+        return SolutionBounds.greedy_upper_bound(self.graph, tiles)[0]
+
+    @staticmethod
+    def _hint(move, exact, moves_left):
+        """Format a hint response."""
+        return {'node1': move[0], 'node2': move[1], 'exact': exact, 'moves_left': moves_left}
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Layout Engine Module
+
+Node positions for drawing a graph: circular, spectral and
+Fruchterman-Reingold force-directed layouts, computed once per graph and
+cached by fingerprint. NumPy is used when it is installed; the pure
+Python fallback gives the same kind of layout, only slower.
+"""
+
+import math
+import random
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+class LayoutEngine:
+    """
+    Graph layouts in the unit square.
+
+    Positions are returned in sorted node order, scaled into
+    [MARGIN, 1 - MARGIN] on both axes. Method 'auto' keeps small graphs on
+    a circle, uses force-directed placement for medium graphs and the
+    spectral layout beyond FORCE_MAX_NODES, where O(n^2) repulsion per
+    iteration gets too slow.
+    """
+
+    METHODS = ('auto', 'circular', 'spectral', 'force')
+
+    # Method used when none is given (set from TILE_SWAP_LAYOUT by the apps)
+    DEFAULT_METHOD = 'auto'
+
+    MARGIN = 0.1
+
+    # 'auto' thresholds
+    CIRCULAR_MAX_NODES = 8
+    FORCE_MAX_NODES = 500 if np is not None else 150
+
+    SPECTRAL_ITERATIONS = 300
+    FORCE_ITERATIONS = 60
+
+    CACHE_SIZE = 256
+    _cache = OrderedDict()  # (fingerprint, method) -> positions
+    _lock = threading.Lock()
+
+    @staticmethod
+    def layout(graph, method=None):
+        """
+        Positions for every node of the graph.
+
+        Args:
+            graph: Graph to lay out
+            method: One of METHODS (default DEFAULT_METHOD)
+
+        Returns:
+            List of (x, y) tuples in graph.get_nodes() order
+
+        Raises:
+            ValueError: if the method is unknown
+        """
+        method = method or LayoutEngine.DEFAULT_METHOD
+        if method not in LayoutEngine.METHODS:
+            raise ValueError(f"Unknown layout method: {method!r}")
+
+        compact = graph.compact()
+        size = compact.num_nodes()
+        if method == 'auto':
+            method = LayoutEngine.auto_method(size)
+
+        key = (graph.fingerprint(), method)
+        with LayoutEngine._lock:
+            positions = LayoutEngine._cache.get(key)
+            if positions is not None:
+                LayoutEngine._cache.move_to_end(key)
+                return positions
+
+        if method == 'circular' or size < 3:
+            positions = LayoutEngine.circular(size)
+        elif method == 'spectral':
+            positions = LayoutEngine._normalize(LayoutEngine.spectral(compact))
+        else:
+            positions = LayoutEngine._normalize(LayoutEngine.force_directed(compact))
+
+        with LayoutEngine._lock:
+            LayoutEngine._cache[key] = positions
+            while len(LayoutEngine._cache) > LayoutEngine.CACHE_SIZE:
+                LayoutEngine._cache.popitem(last=False)
+        return positions
+
+    @staticmethod
+    def auto_method(size):
+        """Layout method 'auto' picks for a graph of this many nodes."""
+        if size <= LayoutEngine.CIRCULAR_MAX_NODES:
+            return 'circular'
+        if size <= LayoutEngine.FORCE_MAX_NODES:
+            return 'force'
+        return 'spectral'
+
+    @staticmethod
+    def circular(size):
+        """Nodes evenly spaced on a circle, the first at the top."""
+        radius = 0.5 - LayoutEngine.MARGIN
+        positions = []
+        for i in range(size):
+            angle = 2 * math.pi * i / size - math.pi / 2
+            positions.append((0.5 + radius * math.cos(angle), 0.5 + radius * math.sin(angle)))
+        return positions
+
+    @staticmethod
+    def _normalize(positions):
+        """Scale raw coordinates into the margin box, axis by axis."""
+        low, high = LayoutEngine.MARGIN, 1 - LayoutEngine.MARGIN
+        scaled = []
+        for axis in (0, 1):
+            values = [p[axis] for p in positions]
+            smallest, largest = min(values), max(values)
+            if largest - smallest < 1e-12:
+                scaled.append([0.5] * len(values))
+            else:
+                factor = (high - low) / (largest - smallest)
+                scaled.append([low + (v - smallest) * factor for v in values])
+        return list(zip(scaled[0], scaled[1]))
+
+    @staticmethod
+    def _start_vectors(size):
+        """Deterministic pseudo-random starting coordinates."""
+        rng = random.Random(size)
+        return [[rng.uniform(-1, 1) for _ in range(size)] for _ in range(2)]
+
+    @staticmethod
+    def spectral(compact):
+        """
+        Coordinates from the two Laplacian eigenvectors with the smallest
+        non-zero eigenvalues.
+
+        Found by subspace iteration on I - L / (2 * max degree), whose
+        dominant eigenvectors (once the constant vector is projected out)
+        are exactly those, so each step is a sparse product over the CSR
+        arrays instead of a dense eigendecomposition.
+        """
+        size = compact.num_nodes()
+        offsets, targets = compact.offsets, compact.targets
+        degree = [offsets[i + 1] - offsets[i] for i in range(size)]
+        scale = 1.0 / (2 * max(degree))
+        x_vec, y_vec = LayoutEngine._start_vectors(size)
+
+        if np is not None:
+            starts = np.array(offsets[:-1], dtype=np.intp)
+            target_index = np.array(targets, dtype=np.intp)
+            deg = np.array(degree, dtype=float)
+            basis = np.array([x_vec, y_vec]).T
+            for _ in range(LayoutEngine.SPECTRAL_ITERATIONS):
+                neighbor_sums = np.add.reduceat(basis[target_index], starts, axis=0)
+                basis = basis - scale * (deg[:, None] * basis - neighbor_sums)
+                basis -= basis.mean(axis=0)
+                basis, _ = np.linalg.qr(basis)
+            return [tuple(row) for row in basis.tolist()]
+
+        vectors = [x_vec, y_vec]
+        for _ in range(LayoutEngine.SPECTRAL_ITERATIONS):
+            for k, vec in enumerate(vectors):
+                stepped = []
+                for i in range(size):
+                    neighbor_sum = 0.0
+                    for t in range(offsets[i], offsets[i + 1]):
+                        neighbor_sum += vec[targets[t]]
+                    stepped.append(vec[i] - scale * (degree[i] * vec[i] - neighbor_sum))
+                mean = sum(stepped) / size
+                stepped = [v - mean for v in stepped]
+
+                # Gram-Schmidt against the vectors already orthonormalized
+                for other in vectors[:k]:
+                    dot = sum(a * b for a, b in zip(stepped, other))
+                    stepped = [a - dot * b for a, b in zip(stepped, other)]
+                norm = math.sqrt(sum(v * v for v in stepped)) or 1.0
+                vectors[k] = [v / norm for v in stepped]
+        return list(zip(vectors[0], vectors[1]))
+
+    @staticmethod
+    def force_directed(compact):
+        """
+        Fruchterman-Reingold: edges pull like springs, all node pairs repel,
+        and a cooling step limit settles the layout. Starts from the
+        spectral layout, so the result is deterministic.
+        """
+        size = compact.num_nodes()
+        start = LayoutEngine._normalize(LayoutEngine.spectral(compact))
+        edges = [(i, j) for i in range(size) for j in compact.neighbors(i) if i < j]
+        k = math.sqrt(1.0 / size)
+        iterations = LayoutEngine.FORCE_ITERATIONS
+        temperature = 0.1
+
+        if np is not None:
+            pos = np.array(start)
+            sources = np.array([i for i, _ in edges], dtype=np.intp)
+            sinks = np.array([j for _, j in edges], dtype=np.intp)
+            for _ in range(iterations):
+                delta = pos[:, None, :] - pos[None, :, :]
+                distance = np.maximum(np.sqrt((delta ** 2).sum(axis=2)), 1e-6)
+                displacement = (delta * (k * k / distance ** 2)[:, :, None]).sum(axis=1)
+
+                edge_delta = pos[sources] - pos[sinks]
+                edge_distance = np.maximum(np.sqrt((edge_delta ** 2).sum(axis=1)), 1e-6)
+                pull = edge_delta * (edge_distance / k)[:, None]
+                np.subtract.at(displacement, sources, pull)
+                np.add.at(displacement, sinks, pull)
+
+                length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 1e-6)
+                pos += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+                temperature -= 0.1 / iterations
+            return [tuple(row) for row in pos.tolist()]
+
+        pos = [list(p) for p in start]
+        for _ in range(iterations):
+            displacement = [[0.0, 0.0] for _ in range(size)]
+            for i in range(size):
+                xi, yi = pos[i]
+                for j in range(i + 1, size):
+                    dx, dy = xi - pos[j][0], yi - pos[j][1]
+                    distance_sq = max(dx * dx + dy * dy, 1e-12)
+                    force = k * k / distance_sq
+                    displacement[i][0] += dx * force
+                    displacement[i][1] += dy * force
+                    displacement[j][0] -= dx * force
+                    displacement[j][1] -= dy * force
+            for i, j in edges:
+                dx, dy = pos[i][0] - pos[j][0], pos[i][1] - pos[j][1]
+                pull = max(math.sqrt(dx * dx + dy * dy), 1e-6) / k
+                displacement[i][0] -= dx * pull
+                displacement[i][1] -= dy * pull
+                displacement[j][0] += dx * pull
+                displacement[j][1] += dy * pull
+            for i in range(size):
+                dx, dy = displacement[i]
+                length = max(math.sqrt(dx * dx + dy * dy), 1e-6)
+                step = min(length, temperature) / length
+                pos[i][0] += dx * step
+                pos[i][1] += dy * step
+            temperature -= 0.1 / iterations
+        return [tuple(p) for p in pos]
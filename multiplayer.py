@@ -9,10 +9,14 @@ Supports both real-time and turn-based modes with up to 30 players per room.
 import random
 import string
 import time
+from array import array
+from bisect import bisect_left, insort
 from typing import Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
+from compact_graph import CompactGraph
+
 
 class GameMode(Enum):
     """Game mode enum."""
@@ -41,6 +45,12 @@ class Player:
     finish_rank: Optional[int] = None
     current_turn: bool = False  # For turn-based mode
 
+    # Server-side board: tiles[i] is the dense index (into the room's
+    # CompactGraph) of the tile on node i, and misplaced counts the nodes
+    # whose tile is not their own
+    tiles: Optional[array] = None
+    misplaced: int = 0
+
 
 @dataclass
 class GameRoom:
@@ -55,6 +65,11 @@ class GameRoom:
     # Game configuration (same for all players)
     graph_edges: List[tuple] = field(default_factory=list)
     initial_tiles: Dict[int, int] = field(default_factory=dict)
+    # Seed descriptor clients regenerate the puzzle from; when set, the
+    # edges and tiles above are not sent
+    puzzle_seed: Optional[Dict] = None
+    # Shared immutable graph the players' moves are checked against
+    graph: Optional[CompactGraph] = None
 
     # Turn-based specific
     current_turn_index: int = 0
@@ -65,6 +80,34 @@ class GameRoom:
     started_at: Optional[float] = None
     finished_at: Optional[float] = None
 
+    # Leaderboard order kept incrementally: sorted keys (see
+    # _leaderboard_key) plus the current key of each player, and counters
+    # so ready/finished checks need no scan
+    ranking: List[tuple] = field(default_factory=list)
+    ranking_keys: Dict[str, tuple] = field(default_factory=dict)
+    join_order: Dict[str, int] = field(default_factory=dict)
+    joined_total: int = 0
+    finished_count: int = 0
+    ready_count: int = 0
+
+    # Leaderboard diffing: players changed since the last delta, and the
+    # positions clients were last told about
+    leaderboard_version: int = 0
+    changed_players: set = field(default_factory=set)
+    sent_positions: Dict[str, int] = field(default_factory=dict)
+    deltas_since_snapshot: int = 0
+    last_snapshot_at: float = 0.0
+
+    # A full leaderboard is sent instead of a delta this often, so clients
+    # that missed a delta resync
+    SNAPSHOT_EVERY_DELTAS = 20
+    SNAPSHOT_INTERVAL = 5.0
+
+    # Real-time rooms coalesce progress into one broadcast per tick
+    # (seconds); broadcast_pending marks changes waiting for the next tick
+    BROADCAST_TICK = 0.1
+    broadcast_pending: bool = False
+
     def add_player(self, session_id: str, name: str) -> bool:
         """Add a player to the room."""
         if len(self.players) >= self.max_players:
@@ -77,6 +120,9 @@ class GameRoom:
         if not self.host_session_id:
             self.host_session_id = session_id
 
+        # Rejoining replaces the old entry
+        self._forget_player(session_id)
+
         # Assign player number based on current count
         player_number = len(self.players) + 1
 
@@ -91,12 +137,38 @@ class GameRoom:
             name=display_name,
             player_number=player_number
         )
+        self.joined_total += 1
+        self.join_order[session_id] = self.joined_total
+        self._rerank(session_id)
         return True
 
+    def _forget_player(self, session_id: str) -> None:
+        """Drop a player and their ranking entry and counter contributions."""
+        player = self.players.pop(session_id, None)
+        if player is None:
+            return
+        key = self.ranking_keys.pop(session_id)
+        del self.ranking[bisect_left(self.ranking, key)]
+        del self.join_order[session_id]
+        if player.solved:
+            self.finished_count -= 1
+        if player.ready:
+            self.ready_count -= 1
+
+    def _rerank(self, session_id: str) -> None:
+        """Move a player's ranking entry after their moves or solve changed."""
+        old_key = self.ranking_keys.get(session_id)
+        if old_key is not None:
+            del self.ranking[bisect_left(self.ranking, old_key)]
+        key = self._leaderboard_key(self.players[session_id]) + \
+            (self.join_order[session_id], session_id)
+        self.ranking_keys[session_id] = key
+        insort(self.ranking, key)
+
     def remove_player(self, session_id: str) -> None:
         """Remove a player from the room."""
-        if session_id in self.players:
-            del self.players[session_id]
+        self._forget_player(session_id)
+        self.changed_players.discard(session_id)
 
         # If host left, assign new host
         if session_id == self.host_session_id and self.players:
@@ -109,7 +181,10 @@ class GameRoom:
     def set_player_ready(self, session_id: str, ready: bool) -> None:
         """Set player ready status."""
         if session_id in self.players:
-            self.players[session_id].ready = ready
+            player = self.players[session_id]
+            if player.ready != ready:
+                self.ready_count += 1 if ready else -1
+            player.ready = ready
 
     def change_player_name(self, session_id: str, new_name: str) -> bool:
         """Change a player's name, keeping the player number prefix."""
@@ -122,16 +197,26 @@ class GameRoom:
 
     def all_players_ready(self) -> bool:
         """Check if all players are ready."""
-        if not self.players:
-            return False
-        return all(p.ready for p in self.players.values())
+        return bool(self.players) and self.ready_count == len(self.players)
 
-    def start_game(self, graph_edges: List[tuple], initial_tiles: Dict[int, int]) -> None:
+    def start_game(self, graph_edges: List[tuple], initial_tiles: Dict[int, int],
+                   puzzle_seed: Optional[Dict] = None) -> None:
         """Start the game with the given configuration."""
         self.graph_edges = graph_edges
         self.initial_tiles = initial_tiles
+        self.puzzle_seed = puzzle_seed
         self.state = RoomState.PLAYING
         self.started_at = time.time()
+        self.changed_players.clear()
+
+        # Every player starts from a copy of the same tile array
+        self.graph = CompactGraph.from_edges(graph_edges)
+        index = self.graph.index
+        tiles = array('i', (index[initial_tiles.get(node, node)] for node in self.graph.nodes))
+        misplaced = sum(1 for i, tile in enumerate(tiles) if tile != i)
+        for player in self.players.values():
+            player.tiles = array('i', tiles)
+            player.misplaced = misplaced
 
         # Setup turn order for turn-based mode
         if self.mode == GameMode.TURN_BASED:
@@ -140,6 +225,9 @@ class GameRoom:
             if self.turn_order:
                 self.players[self.turn_order[0]].current_turn = True
 
+        # game_started carries the full leaderboard; deltas start from it
+        self.sent_positions = {sid: i for i, sid in enumerate(self._leaderboard_order())}
+
     def update_player_progress(self, session_id: str, moves: int, solved: bool) -> None:
         """Update a player's progress."""
         if session_id not in self.players:
@@ -147,21 +235,71 @@ class GameRoom:
 
         player = self.players[session_id]
         player.moves = moves
+        self.changed_players.add(session_id)
 
         # Handle solve
         if solved and not player.solved:
             player.solved = True
             player.finish_time = time.time()
 
-            # Calculate rank
-            finished_count = sum(1 for p in self.players.values() if p.solved)
-            player.finish_rank = finished_count
+            self.finished_count += 1
+            player.finish_rank = self.finished_count
 
             # Check if all finished
-            if all(p.solved for p in self.players.values()):
+            if self.finished_count == len(self.players):
                 self.state = RoomState.FINISHED
                 self.finished_at = time.time()
 
+        self._rerank(session_id)
+
+    def apply_move(self, session_id: str, node1: int, node2: int) -> Dict:
+        """
+        Validate and apply one swap on a player's server-side board.
+
+        Moves and solved status are derived here, so clients only report
+        which nodes they swapped.
+
+        Returns:
+            dict with 'success' boolean and optional 'message' string; a
+            successful move also carries 'changed_tiles', 'moves',
+            'tiles_remaining' and 'solved'
+        """
+        if self.state != RoomState.PLAYING or self.graph is None:
+            return {'success': False, 'message': 'Game not active'}
+
+        player = self.players.get(session_id)
+        if player is None or player.tiles is None:
+            return {'success': False, 'message': 'Not in this game'}
+        if player.solved:
+            return {'success': False, 'message': 'Puzzle already solved'}
+        if self.mode == GameMode.TURN_BASED and not player.current_turn:
+            return {'success': False, 'message': 'Not your turn'}
+
+        index = self.graph.index
+        i, j = index.get(node1), index.get(node2)
+        if i is None or j is None:
+            return {'success': False, 'message': 'Invalid nodes'}
+        if not self.graph.has_edge(i, j):
+            return {'success': False, 'message': 'Nodes are not connected'}
+
+        # Only the two swapped nodes can change the misplaced count
+        tiles = player.tiles
+        before = (tiles[i] != i) + (tiles[j] != j)
+        tiles[i], tiles[j] = tiles[j], tiles[i]
+        player.misplaced += (tiles[i] != i) + (tiles[j] != j) - before
+
+        solved = player.misplaced == 0
+        self.update_player_progress(session_id, player.moves + 1, solved)
+
+        nodes = self.graph.nodes
+        return {
+            'success': True,
+            'changed_tiles': {str(node1): nodes[tiles[i]], str(node2): nodes[tiles[j]]},
+            'moves': player.moves,
+            'tiles_remaining': player.misplaced,
+            'solved': solved
+        }
+
     def next_turn(self) -> Optional[str]:
         """Advance to next player's turn (turn-based mode only)."""
         if self.mode != GameMode.TURN_BASED or not self.turn_order:
@@ -170,6 +308,7 @@ class GameRoom:
         # Clear current turn
         current_session = self.turn_order[self.current_turn_index]
         self.players[current_session].current_turn = False
+        self.changed_players.add(current_session)
 
         # Find next player who hasn't solved yet
         attempts = 0
@@ -180,6 +319,7 @@ class GameRoom:
             # If this player hasn't solved, give them the turn
             if not self.players[next_session].solved:
                 self.players[next_session].current_turn = True
+                self.changed_players.add(next_session)
                 return next_session
 
             attempts += 1
@@ -187,35 +327,109 @@ class GameRoom:
         # All players have solved - no one gets a turn
         return None
 
+    def _leaderboard_entry(self, session_id: str, player: Player) -> Dict:
+        """Leaderboard row for one player."""
+        return {
+            'session_id': session_id,
+            'name': player.name,
+            'moves': player.moves,
+            'solved': player.solved,
+            'ready': player.ready,
+            'rank': player.finish_rank,
+            'is_current_turn': player.current_turn,
+            'is_host': session_id == self.host_session_id
+        }
+
+    @staticmethod
+    def _leaderboard_key(player: Player) -> tuple:
+        """Sort solved players by rank, then by moves, then unsolved by moves."""
+        if player.solved:
+            return (0, player.finish_rank, player.moves)
+        return (1, player.moves, 0)
+
+    def _leaderboard_order(self) -> List[str]:
+        """Session ids in leaderboard order."""
+        return [key[-1] for key in self.ranking]
+
     def get_leaderboard(self) -> List[Dict]:
         """Get sorted leaderboard data."""
-        players_list = []
-
-        for session_id, player in self.players.items():
-            players_list.append({
-                'session_id': session_id,
-                'name': player.name,
-                'moves': player.moves,
-                'solved': player.solved,
-                'ready': player.ready,
-                'rank': player.finish_rank,
-                'is_current_turn': player.current_turn,
-                'is_host': session_id == self.host_session_id
-            })
-
-        # Sort: solved players by rank, then by moves, then unsolved by moves
-        def sort_key(p):
-            if p['solved']:
-                return (0, p['rank'], p['moves'])
-            else:
-                return (1, p['moves'], 0)
+        return self.get_top_players(len(self.ranking))
+
+    def get_top_players(self, k: int) -> List[Dict]:
+        """Leaderboard rows of the first k players."""
+        return [self._leaderboard_entry(key[-1], self.players[key[-1]]) for key in self.ranking[:k]]
 
-        players_list.sort(key=sort_key)
-        return players_list
+    def get_position(self, session_id: str) -> Optional[int]:
+        """0-based leaderboard position of a player, or None if not in the room."""
+        key = self.ranking_keys.get(session_id)
+        if key is None:
+            return None
+        return bisect_left(self.ranking, key)
+
+    def snapshot_due(self) -> bool:
+        """Check whether the next leaderboard broadcast should be a full snapshot."""
+        return (self.deltas_since_snapshot >= self.SNAPSHOT_EVERY_DELTAS or
+                time.time() - self.last_snapshot_at >= self.SNAPSHOT_INTERVAL)
+
+    def get_leaderboard_snapshot(self) -> Dict:
+        """
+        Full leaderboard, resetting the delta tracking.
+
+        Use it for every room-wide message carrying the leaderboard
+        (joins, leaves, ready and name changes as well as resyncs), so the
+        next delta is computed against what clients last received.
+
+        Returns:
+            room_info without the puzzle
+        """
+        self.leaderboard_version += 1
+        self.changed_players.clear()
+        self.sent_positions = {sid: i for i, sid in enumerate(self._leaderboard_order())}
+        self.deltas_since_snapshot = 0
+        self.last_snapshot_at = time.time()
+
+        return self.get_room_info(include_puzzle=False)
+
+    def get_leaderboard_delta(self) -> Dict:
+        """
+        Changes since the previous delta or snapshot.
+
+        Returns:
+            dict with 'version', 'entries' (rows of players whose data
+            changed), 'positions' (session_id -> new 0-based position, only
+            for players that moved), 'removed' (session ids that left),
+            'state' and 'current_turn_session'
+        """
+        self.leaderboard_version += 1
+        self.deltas_since_snapshot += 1
+
+        positions = {sid: i for i, sid in enumerate(self._leaderboard_order())}
+        moved = {sid: pos for sid, pos in positions.items() if self.sent_positions.get(sid) != pos}
+        removed = [sid for sid in self.sent_positions if sid not in positions]
+        entries = [self._leaderboard_entry(sid, self.players[sid])
+                   for sid in self.changed_players if sid in self.players]
+
+        self.changed_players.clear()
+        self.sent_positions = positions
 
-    def get_room_info(self) -> Dict:
-        """Get room information for clients."""
         return {
+            'version': self.leaderboard_version,
+            'entries': entries,
+            'positions': moved,
+            'removed': removed,
+            'state': self.state.value,
+            'current_turn_session': self.turn_order[self.current_turn_index] if self.turn_order else None
+        }
+
+    def get_room_info(self, include_puzzle: bool = True) -> Dict:
+        """
+        Get room information for clients.
+
+        The puzzle (its seed, or the full edges and tiles for unseeded
+        puzzles) is only included when include_puzzle is set; lobby and
+        leaderboard updates leave it out.
+        """
+        info = {
             'code': self.code,
             'mode': self.mode.value,
             'state': self.state.value,
@@ -223,17 +437,28 @@ class GameRoom:
             'max_players': self.max_players,
             'all_ready': self.all_players_ready(),
             'leaderboard': self.get_leaderboard(),
-            'graph_edges': self.graph_edges,
-            'initial_tiles': self.initial_tiles,
+            'leaderboard_version': self.leaderboard_version,
             'current_turn_session': self.turn_order[self.current_turn_index] if self.turn_order else None
         }
+        if include_puzzle:
+            if self.puzzle_seed:
+                info['puzzle_seed'] = self.puzzle_seed
+            else:
+                info['graph_edges'] = self.graph_edges
+                info['initial_tiles'] = self.initial_tiles
+        return info
 
 
 class MultiplayerManager:
     """Manages all multiplayer rooms."""
 
-    def __init__(self):
-        self.rooms: Dict[str, GameRoom] = {}
+    def __init__(self, rooms=None):
+        """
+        Args:
+            rooms: Optional mapping code -> GameRoom to keep rooms in (e.g. a
+                shared state backend's); a plain dict by default
+        """
+        self.rooms: Dict[str, GameRoom] = rooms if rooms is not None else {}
 
     def generate_room_code(self) -> str:
         """Generate a unique room code."""
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Optimal Solver Module
+
+Graph-aware exact solver for Tile Swap. Unlike plain cycle decomposition,
+which is only exact on complete graphs, this searches over tile
+permutations using the actual edge set of the graph.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from solution_bounds import SolutionBounds
+
+
+@dataclass
+class SolverResult:
+    """Outcome of an optimal-move computation."""
+    optimal_moves: int                 # Exact optimum, or best known upper bound
+    exact: bool                        # False when the search fell back to bounds
+    lower_bound: int
+    upper_bound: int
+    moves: Optional[List[Tuple[int, int]]] = None
+    nodes_expanded: int = 0
+    strategy: str = ""
+
+
+class PermutationEncoder:
+    """
+    Packs a tile permutation into a single integer.
+
+    Node i (in sorted order) owns a fixed-width bit field holding the dense
+    index of the tile currently sitting on it, so a state is one hashable int
+    and a swap is two shifts and an xor.
+    """
+
+    def __init__(self, graph):
+        compact = graph.compact()
+        self.nodes = compact.nodes
+        self.index = compact.index
+        self.bits = max(1, (len(self.nodes) - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+
+        self.edges = []
+        for i in range(len(self.nodes)):
+            for j in compact.neighbors(i):
+                if i < j:
+                    self.edges.append((i * self.bits, j * self.bits))
+
+        self.goal = self.encode({node: node for node in self.nodes})
+
+    def encode(self, tile_configuration):
+        """Encode a node -> tile mapping."""
+        state = 0
+        for node, tile in tile_configuration.items():
+            state |= self.index[tile] << (self.index[node] * self.bits)
+        return state
+
+    def swap(self, state, edge):
+        """Return the state after swapping the tiles on an encoded edge."""
+        shift1, shift2 = edge
+        diff = ((state >> shift1) ^ (state >> shift2)) & self.mask
+        return state ^ (diff << shift1) ^ (diff << shift2)
+
+    def edge_nodes(self, edge):
+        """Translate an encoded edge back to node labels."""
+        return (self.nodes[edge[0] // self.bits], self.nodes[edge[1] // self.bits])
+
+
+class OptimalSolver:
+    """Exact minimum-swap solver using bidirectional BFS over permutations."""
+
+    def __init__(self, graph, time_budget=1.0, max_states=2000000):
+        self.graph = graph
+        self.time_budget = time_budget
+        self.max_states = max_states
+        self.encoder = PermutationEncoder(graph)
+
+    def solve(self, tile_configuration):
+        """
+        Find a shortest swap sequence for the given tile configuration.
+
+        Falls back to lower/upper bounds if the time budget or state limit
+        is exhausted before the two searches meet.
+
+        Returns:
+            SolverResult
+        """
+        if set(tile_configuration) != set(self.encoder.nodes) or \
+                set(tile_configuration.values()) != set(self.encoder.nodes):
+            raise ValueError("Tile configuration must be a permutation of the graph's nodes")
+
+        lower = SolutionBounds.lower_bound(self.graph, tile_configuration)
+        greedy = SolutionBounds.greedy_upper_bound(self.graph, tile_configuration)
+
+        if lower == len(greedy):
+            return SolverResult(lower, True, lower, lower, greedy, 0, "bounds")
+
+        found = self._search(self.encoder.encode(tile_configuration))
+        path, expanded = found
+        if path is not None:
+            return SolverResult(len(path), True, len(path), len(path), path, expanded,
+                                "bidirectional_bfs")
+
+        return SolverResult(len(greedy), False, lower, len(greedy), greedy, expanded,
+                            "bidirectional_bfs")
+
+    def _search(self, start):
+        """Layered bidirectional BFS. Returns (path or None, nodes expanded)."""
+        encoder = self.encoder
+        goal = encoder.goal
+        if start == goal:
+            return [], 0
+
+        deadline = time.monotonic() + self.time_budget
+        forward = {start: None}     # state -> (previous state, edge)
+        backward = {goal: None}     # state -> (next state toward goal, edge)
+        forward_layer, backward_layer = [start], [goal]
+        expanded = 0
+
+        while forward_layer and backward_layer:
+            if len(forward_layer) <= len(backward_layer):
+                layer, seen, other = forward_layer, forward, backward
+            else:
+                layer, seen, other = backward_layer, backward, forward
+
+            next_layer = []
+            meeting = None
+            for state in layer:
+                expanded += 1
+                if expanded & 1023 == 0:
+                    if time.monotonic() > deadline or len(forward) + len(backward) > self.max_states:
+                        return None, expanded
+
+                for edge in encoder.edges:
+                    child = encoder.swap(state, edge)
+                    if child in seen:
+                        continue
+                    seen[child] = (state, edge)
+                    if child in other:
+                        meeting = child
+                        break
+                    next_layer.append(child)
+                if meeting is not None:
+                    break
+
+            if meeting is not None:
+                return self._build_path(meeting, forward, backward), expanded
+
+            if seen is forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        return None, expanded
+
+    def _build_path(self, meeting, forward, backward):
+        """Join the forward and backward parent chains at the meeting state."""
+        encoder = self.encoder
+        path = []
+
+        state = meeting
+        while forward[state] is not None:
+            state, edge = forward[state]
+            path.append(encoder.edge_nodes(edge))
+        path.reverse()
+
+        state = meeting
+        while backward[state] is not None:
+            state, edge = backward[state]
+            path.append(encoder.edge_nodes(edge))
+
+        return path
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Puzzle Bank Module
+
+SQLite store of pre-generated, pre-scored puzzles so new games can be
+served with a single indexed fetch instead of generating and scoring on
+the request path.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+
+from graph_builder import GraphBuilder
+from optimal_solver import SolverResult
+from puzzle_generator import PuzzleGenerator
+from score_calculator import ScoreCalculator
+
+
+class PuzzleBank:
+    """
+    Pre-scored puzzles bucketed by (node count, edge count, difficulty).
+
+    Each puzzle is served once: take() deletes the row it returns, inside
+    a write transaction so several processes can share one file. A
+    background refill worker keeps the configured buckets stocked. Other
+    shapes are never banked, so requests cannot make the worker take on
+    more buckets. Difficulty is None for a uniform shuffle or one of
+    PuzzleGenerator.LEVELS.
+    """
+
+    DEFAULT_STOCK = 20
+
+    # Seconds between refill passes when nothing has been taken
+    REFILL_INTERVAL = 5.0
+
+    def __init__(self, db_path, stock=DEFAULT_STOCK, buckets=()):
+        """
+        Args:
+            db_path: SQLite file holding the puzzles
+            stock: Puzzles to keep in each bucket
+            buckets: (num_nodes, num_edges, difficulty) tuples to serve;
+                more can be added with add_bucket()
+        """
+        self.db_path = db_path
+        self.stock = stock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS puzzles ("
+            "id INTEGER PRIMARY KEY, num_nodes INTEGER, num_edges INTEGER, difficulty TEXT, "
+            "edges TEXT, tiles TEXT, optimal_moves INTEGER, exact INTEGER, "
+            "lower_bound INTEGER, upper_bound INTEGER)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS puzzles_bucket "
+            "ON puzzles (num_nodes, num_edges, difficulty)"
+        )
+        self._db.commit()
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._worker = None
+
+        # Stock already in the file is served again after a restart
+        self.buckets = set()
+        for bucket in buckets:
+            self.add_bucket(*bucket)
+
+    @staticmethod
+    def is_valid_bucket(num_nodes, num_edges, difficulty=None):
+        """Check that puzzles of this shape can be generated."""
+        return (2 <= num_nodes <= GraphBuilder.max_nodes and
+                num_nodes - 1 <= num_edges <= num_nodes * (num_nodes - 1) // 2 and
+                (difficulty is None or difficulty in PuzzleGenerator.LEVELS))
+
+    def add_bucket(self, num_nodes, num_edges, difficulty=None):
+        """Start keeping a bucket stocked. Returns False if it is invalid."""
+        if not PuzzleBank.is_valid_bucket(num_nodes, num_edges, difficulty):
+            return False
+        with self._lock:
+            if (num_nodes, num_edges, difficulty) not in self.buckets:
+                self.buckets.add((num_nodes, num_edges, difficulty))
+                self._wake.set()
+        return True
+
+    def add(self, edges, tiles, result, difficulty=None):
+        """
+        Store a scored puzzle.
+
+        Args:
+            edges: List of (node1, node2) tuples
+            tiles: dict mapping node -> tile number
+            result: SolverResult for the tiles
+            difficulty: Level the puzzle was generated for, or None
+        """
+        nodes = sorted(tiles)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO puzzles (num_nodes, num_edges, difficulty, edges, tiles, "
+                "optimal_moves, exact, lower_bound, upper_bound) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (len(nodes), len(edges), difficulty or '',
+                 json.dumps([list(edge) for edge in edges]),
+                 json.dumps([tiles[node] for node in nodes]),
+                 result.optimal_moves, int(result.exact), result.lower_bound, result.upper_bound)
+            )
+            self._db.commit()
+
+    def take(self, num_nodes, num_edges, difficulty=None):
+        """
+        Remove and return one puzzle from a bucket.
+
+        Only configured buckets are served; the caller generates anything
+        else on the spot.
+
+        Returns:
+            dict with 'edges', 'tiles', 'difficulty' and 'result'
+            (SolverResult), or None if the bucket is empty or not banked
+        """
+        with self._lock:
+            if (num_nodes, num_edges, difficulty) not in self.buckets:
+                return None
+
+            # BEGIN IMMEDIATE takes the write lock before the row is picked,
+            # so two processes cannot both take it
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    "DELETE FROM puzzles WHERE id = (SELECT id FROM puzzles "
+                    "WHERE num_nodes = ? AND num_edges = ? AND difficulty = ? LIMIT 1) "
+                    "RETURNING edges, tiles, optimal_moves, exact, lower_bound, upper_bound",
+                    (num_nodes, num_edges, difficulty or '')
+                ).fetchall()
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+
+        self._wake.set()
+        if not rows:
+            return None
+
+        row = rows[0]
+        edges = [tuple(edge) for edge in json.loads(row[0])]
+        nodes = sorted({node for edge in edges for node in edge})
+        return {
+            'edges': edges,
+            'tiles': dict(zip(nodes, json.loads(row[1]))),
+            'difficulty': difficulty,
+            'result': SolverResult(row[2], bool(row[3]), row[4], row[5], None, 0, "puzzle_bank")
+        }
+
+    def count(self, num_nodes, num_edges, difficulty=None):
+        """Number of puzzles stocked in a bucket."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM puzzles WHERE num_nodes = ? AND num_edges = ? AND difficulty = ?",
+                (num_nodes, num_edges, difficulty or '')
+            ).fetchone()[0]
+
+    @staticmethod
+    def generate(num_nodes, num_edges, difficulty=None):
+        """
+        Generate and score one puzzle.
+
+        Returns:
+            (edges, tiles, SolverResult), or None if the graph could not
+            be generated
+        """
+        graph = GraphBuilder.create_random_with_params(num_nodes, num_edges)
+        if graph is None:
+            return None
+
+        if difficulty is None:
+            nodes = graph.get_nodes()
+            shuffled = nodes.copy()
+            while shuffled == nodes:
+                random.shuffle(shuffled)
+            tiles = dict(zip(nodes, shuffled))
+        else:
+            tiles = PuzzleGenerator.generate(graph, difficulty)
+
+        return list(graph.compact().edges()), tiles, ScoreCalculator.solve(graph, tiles)
+
+    def refill(self, limit=None):
+        """
+        Top up every known bucket to the stock level.
+
+        Args:
+            limit: Optional cap on puzzles generated in this pass
+
+        Returns:
+            Number of puzzles added
+        """
+        added = 0
+        with self._lock:
+            buckets = list(self.buckets)
+
+        for bucket in buckets:
+            missing = self.stock - self.count(*bucket)
+            while missing > 0 and (limit is None or added < limit) and not self._stop.is_set():
+                puzzle = PuzzleBank.generate(*bucket)
+                if puzzle is None:
+                    with self._lock:
+                        self.buckets.discard(bucket)
+                    break
+                self.add(*puzzle, bucket[2])
+                added += 1
+                missing -= 1
+        return added
+
+    def start_refill_worker(self):
+        """Refill buckets in a background daemon thread."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(target=self._refill_loop, name="puzzle-bank-refill",
+                                        daemon=True)
+        self._worker.start()
+
+    def stop_refill_worker(self):
+        """Ask the refill worker to finish and wait for it."""
+        self._stop.set()
+        self._wake.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def _refill_loop(self):
+        """Worker body: refill, then sleep until woken or the interval passes."""
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.refill()
+            except Exception as e:
+                print(f"Puzzle bank refill failed: {e}")
+            self._wake.wait(PuzzleBank.REFILL_INTERVAL)
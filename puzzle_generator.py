@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Puzzle Generator Module
+
+Generates tile layouts that hit a requested difficulty instead of relying
+on a uniform shuffle.
+"""
+
+import random
+import time
+
+from bound_tracker import BoundTracker
+from score_calculator import ScoreCalculator
+from solution_bounds import SolutionBounds
+
+
+class PuzzleGenerator:
+    """
+    Difficulty-targeted tile layouts.
+
+    Layouts are built by walking k swaps away from the solved state, which
+    caps the optimal solution at k, and steering each step towards swaps
+    that raise the incrementally tracked lower bound. Candidates are
+    rejected against the fast bounds; the exact solver only runs when an
+    exact move count is requested and the bounds cannot confirm it.
+
+    A difficulty is one of:
+        int: the exact optimal number of moves
+        (low, high): a band for the lower bound on the moves (high may be None)
+        str: a named level from LEVELS, scaled to the graph
+    """
+
+    # Lower-bound bands as fractions of a uniform shuffle's lower bound
+    LEVELS = {
+        'easy': (0.25, 0.5),
+        'medium': (0.5, 0.8),
+        'hard': (0.8, None),
+    }
+
+    MAX_ATTEMPTS = 200
+
+    # Seconds spent searching for an exact move count before settling for
+    # the closest candidate
+    TIME_BUDGET = 1.0
+
+    # Random edges tried per step before settling for one that does not
+    # raise the lower bound
+    STEP_TRIES = 4
+
+    @staticmethod
+    def generate(graph, difficulty, max_attempts=None, time_budget=None, seed=None):
+        """
+        Generate a tile layout for the graph.
+
+        Args:
+            graph: Graph to place tiles on
+            difficulty: int, (low, high) band or level name (see class docs)
+            max_attempts: Optional cap on candidate layouts tried
+            time_budget: Optional seconds allowed for an exact target
+            seed: Optional seed for a private random.Random; bands and
+                levels are then reproducible (exact targets only while the
+                time budget is not hit)
+
+        Returns:
+            dict mapping node -> tile; the closest candidate found if the
+            target could not be hit within max_attempts or time_budget
+
+        Raises:
+            ValueError: if the difficulty is not understood
+        """
+        if max_attempts is None:
+            max_attempts = PuzzleGenerator.MAX_ATTEMPTS
+        if time_budget is None:
+            time_budget = PuzzleGenerator.TIME_BUDGET
+        rng = random.Random(seed) if seed is not None else random
+
+        saved_tiles = graph.tiles
+        try:
+            if isinstance(difficulty, bool):
+                raise ValueError(f"Unknown difficulty: {difficulty!r}")
+            if isinstance(difficulty, int):
+                if difficulty < 1:
+                    raise ValueError("Target move count must be at least 1")
+                return PuzzleGenerator._exact(graph, difficulty, max_attempts, time_budget, rng)
+            low, high = PuzzleGenerator.band(graph, difficulty, rng)
+            return PuzzleGenerator._banded(graph, low, high, max_attempts, rng)
+        finally:
+            graph.tiles = saved_tiles
+
+    @staticmethod
+    def band(graph, difficulty, rng=random):
+        """
+        Resolve a band or level name into a (low, high) lower-bound band.
+
+        Returns:
+            (low, high) with high None for no upper limit
+        """
+        if isinstance(difficulty, str):
+            if difficulty not in PuzzleGenerator.LEVELS:
+                raise ValueError(f"Unknown difficulty: {difficulty!r}")
+            low_fraction, high_fraction = PuzzleGenerator.LEVELS[difficulty]
+            scale = PuzzleGenerator._shuffle_scale(graph, rng)
+            low = max(1, round(low_fraction * scale))
+            high = None if high_fraction is None else max(low, round(high_fraction * scale))
+            return low, high
+
+        try:
+            low, high = difficulty
+            low = max(1, int(low))
+            high = None if high is None else int(high)
+        except (TypeError, ValueError):
+            raise ValueError(f"Unknown difficulty: {difficulty!r}")
+        if high is not None and high < low:
+            raise ValueError("Difficulty band is empty")
+        return low, high
+
+    @staticmethod
+    def _shuffle_scale(graph, rng, samples=3):
+        """Average lower bound of a uniform shuffle on this graph."""
+        nodes = graph.get_nodes()
+        total = 0
+        for _ in range(samples):
+            tiles = nodes.copy()
+            rng.shuffle(tiles)
+            total += SolutionBounds.lower_bound(graph, dict(zip(nodes, tiles)))
+        return total / samples
+
+    @staticmethod
+    def _walk(graph, steps, rng):
+        """
+        Walk the given number of swaps away from the solved state.
+
+        Returns:
+            (tiles, lower_bound) for the layout reached
+        """
+        nodes = graph.get_nodes()
+        edges = list(graph.compact().edges())
+        graph.tiles = {node: node for node in nodes}
+        tracker = BoundTracker(graph)
+        tiles = graph.tiles
+        previous = None
+
+        for _ in range(steps):
+            bound = tracker.moves_left_lower_bound()
+            for attempt in range(PuzzleGenerator.STEP_TRIES):
+                node1, node2 = rng.choice(edges)
+                if (node1, node2) == previous:
+                    continue
+                tiles[node1], tiles[node2] = tiles[node2], tiles[node1]
+                tracker.apply_swap(node1, node2)
+                if tracker.moves_left_lower_bound() > bound or \
+                        attempt == PuzzleGenerator.STEP_TRIES - 1:
+                    break
+                tiles[node1], tiles[node2] = tiles[node2], tiles[node1]
+                tracker.apply_swap(node1, node2)
+            previous = (node1, node2)
+
+        return dict(tiles), tracker.moves_left_lower_bound()
+
+    @staticmethod
+    def _banded(graph, low, high, max_attempts, rng):
+        """Random walks until the lower bound lands inside [low, high]."""
+        steps = low
+        best, best_miss = None, None
+
+        for _ in range(max_attempts):
+            tiles, bound = PuzzleGenerator._walk(graph, steps, rng)
+            if bound < low:
+                miss = low - bound
+                steps += 1
+            elif high is not None and bound > high:
+                miss = bound - high
+                steps = max(1, steps - 1)
+            else:
+                return tiles
+
+            if bound > 0 and (best_miss is None or miss < best_miss):
+                best, best_miss = tiles, miss
+
+        return best if best is not None else PuzzleGenerator._walk(graph, max(low, 1), rng)[0]
+
+    @staticmethod
+    def _exact(graph, target, max_attempts, time_budget, rng):
+        """Random walks of target swaps until the optimum is exactly target."""
+        deadline = time.monotonic() + time_budget
+        best, best_miss = None, None
+
+        for _ in range(max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 and best is not None:
+                break
+
+            tiles, bound = PuzzleGenerator._walk(graph, target, rng)
+
+            # The walk itself is a solution of length target, so a matching
+            # lower bound proves it optimal without any search
+            if bound == target:
+                return tiles
+
+            result = ScoreCalculator.solve(graph, tiles, max(remaining, 0.01))
+            if result.exact and result.optimal_moves == target:
+                return tiles
+
+            miss = abs(target - result.optimal_moves)
+            if result.optimal_moves > 0 and (best_miss is None or miss < best_miss):
+                best, best_miss = tiles, miss
+
+        return best if best is not None else tiles
@@ -5,22 +5,64 @@ Score Calculator Module
 Handles score and optimal solution calculations for Tile Swap.
 """
 
+from optimal_solver import OptimalSolver, SolverResult
+from ida_star_solver import IDAStarSolver
+from approximation_solver import ApproximationSolver
+from family_solver import FamilySolver
+from solution_bounds import SolutionBounds
+from solver_cache import SolverCache
+
 
 class ScoreCalculator:
     """Handles score and optimal solution calculations."""
 
+    # Seconds the exact search may spend before falling back to bounds
+    DEFAULT_TIME_BUDGET = 1.0
+
+    # Selectable exact search engines
+    STRATEGIES = {
+        'bidirectional': OptimalSolver,
+        'ida_star': IDAStarSolver,
+        'approximation': ApproximationSolver,
+    }
+    DEFAULT_STRATEGY = 'ida_star'
+
+    # Exact search is hopeless beyond this size; larger (large-graph mode)
+    # puzzles are scored with the polynomial approximation instead
+    EXACT_SEARCH_MAX_NODES = 20
+    LARGE_GRAPH_STRATEGY = 'approximation'
+
+    # Process-wide memo of results keyed by (edge set, permutation)
+    cache = SolverCache()
+
+    @staticmethod
+    def configure_cache(max_size=10000, db_path=None):
+        """Replace the result cache, optionally backed by a SQLite file."""
+        ScoreCalculator.cache = SolverCache(max_size, db_path)
+
     @staticmethod
-    def calculate_optimal_moves(tile_configuration):
+    def calculate_optimal_moves(tile_configuration, graph=None, time_budget=None, strategy=None):
         """
         Calculate the minimum number of swaps needed to sort tiles.
-        Uses cycle decomposition of the permutation.
+
+        Without a graph this uses cycle decomposition of the permutation,
+        which is only exact on a complete graph. With a graph the swap
+        search respects the edge set; see solve() for bound reporting.
 
         Args:
             tile_configuration: Dictionary mapping node -> tile number
+            graph: Optional Graph the tiles live on
+            time_budget: Optional search time limit in seconds
+            strategy: Optional key into STRATEGIES
 
         Returns:
-            Minimum number of swaps needed
+            Minimum number of swaps needed (best known upper bound if the
+            exact search ran out of time)
         """
+        if graph is not None:
+            return ScoreCalculator.solve(graph, tile_configuration, time_budget,
+                                         strategy).optimal_moves
+
         nodes = sorted(tile_configuration.keys())
 
         # Create a mapping of current position to target position
@@ -51,3 +93,61 @@ class ScoreCalculator:
                 num_swaps += cycle_length - 1
 
         return num_swaps
+
+    @staticmethod
+    def solve(graph, tile_configuration, time_budget=None, strategy=None):
+        """
+        Compute the optimal number of swaps on the given graph.
+
+        Args:
+            graph: Graph the tiles live on
+            tile_configuration: Dictionary mapping node -> tile number
+            time_budget: Optional search time limit in seconds
+            strategy: Optional key into STRATEGIES; when omitted, graphs
+                in a special family (see Graph.family) are solved exactly
+                by FamilySolver
+
+        Returns:
+            SolverResult; result.exact is False when the search fell back
+            to the [lower_bound, upper_bound] range, and
+            result.nodes_expanded shows how hard the search was
+        """
+        if time_budget is None:
+            time_budget = ScoreCalculator.DEFAULT_TIME_BUDGET
+        use_family = strategy is None
+        # Explicit strategies are cached apart from the default solve
+        cache_strategy = strategy
+        if strategy is None:
+            strategy = ScoreCalculator.DEFAULT_STRATEGY
+        if strategy not in ScoreCalculator.STRATEGIES:
+            raise ValueError(f"Unknown solver strategy: {strategy}")
+
+        cached = ScoreCalculator.cache.get(graph, tile_configuration, time_budget, cache_strategy)
+        if cached is not None:
+            return cached
+
+        # Paths, stars, cycles and complete graphs have exact formulas; an
+        # explicitly chosen strategy bypasses them so engines can be compared
+        result = FamilySolver.solve(graph, tile_configuration) if use_family else None
+
+        if result is None:
+            if len(tile_configuration) > ScoreCalculator.EXACT_SEARCH_MAX_NODES:
+                strategy = ScoreCalculator.LARGE_GRAPH_STRATEGY
+            solver = ScoreCalculator.STRATEGIES[strategy](graph, time_budget)
+            result = solver.solve(tile_configuration)
+
+        ScoreCalculator.cache.put(graph, tile_configuration, result, time_budget, cache_strategy)
+        return result
+
+    @staticmethod
+    def calculate_bounds(graph, tile_configuration):
+        """
+        Bound the optimal number of swaps without any exponential search.
+
+        Returns:
+            SolverResult holding the greedy solution as the upper bound;
+            exact only when the bounds happen to meet
+        """
+        lower = SolutionBounds.lower_bound(graph, tile_configuration)
+        greedy = SolutionBounds.greedy_upper_bound(graph, tile_configuration)
+        return SolverResult(len(greedy), lower == len(greedy), lower, len(greedy), greedy, 0, "bounds")
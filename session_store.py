@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Session Store Module
+
+Bounded per-session storage for single-player game states, so the web
+apps do not keep every visitor's WebGameState forever.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionStore:
+    """
+    LRU map of session id -> game state with an idle TTL.
+
+    Sessions are evicted least recently used first whenever there are more
+    than max_sessions of them or their estimated memory (the state's
+    approx_size(), re-measured on each access) exceeds max_bytes. Sessions
+    idle for longer than ttl seconds expire.
+    """
+
+    DEFAULT_MAX_SESSIONS = 10000
+    DEFAULT_TTL = 3600.0
+
+    def __init__(self, factory, max_sessions=DEFAULT_MAX_SESSIONS, ttl=DEFAULT_TTL, max_bytes=None):
+        """
+        Args:
+            factory: Callable creating the state for a new session
+            max_sessions: Maximum number of live sessions
+            ttl: Seconds a session may stay idle, or None for no expiry
+            max_bytes: Optional cap on the estimated total memory
+        """
+        self.factory = factory
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.expirations = 0
+        self.created = 0
+        self._sessions = OrderedDict()  # session_id -> [state, last_access, size]
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        """
+        Get the state for a session, creating it if needed.
+
+        Marks the session as most recently used.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = [self.factory(), now, 0]
+                self._sessions[session_id] = entry
+                self.created += 1
+            else:
+                self._sessions.move_to_end(session_id)
+                entry[1] = now
+            self._measure(entry)
+            self._evict(keep=session_id)
+            return entry[0]
+
+    def refresh(self, session_id):
+        """
+        Re-measure a session after its state changed (e.g. at the end of a
+        request) and evict if that pushed the store over max_bytes.
+        """
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._measure(entry)
+                self._evict(keep=session_id)
+
+    def peek(self, session_id):
+        """State for a session without creating it or touching its LRU position."""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            return entry[0] if entry is not None else None
+
+    def __contains__(self, session_id):
+        with self._lock:
+            return session_id in self._sessions
+
+    def __getitem__(self, session_id):
+        state = self.peek(session_id)
+        if state is None:
+            raise KeyError(session_id)
+        return state
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def remove(self, session_id):
+        """Drop a session if it exists."""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def stats(self):
+        """Return live session, memory and eviction counters."""
+        with self._lock:
+            return {
+                'live_sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'approx_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'created': self.created,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def _measure(self, entry):
+        """Refresh an entry's size estimate in the running total."""
+        measure = getattr(entry[0], 'approx_size', None)
+        size = measure() if measure is not None else 0
+        self._bytes += size - entry[2]
+        entry[2] = size
+
+    def _expire(self, now):
+        """Drop sessions idle for longer than the TTL (oldest are first)."""
+        if self.ttl is None:
+            return
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if now - entry[1] <= self.ttl:
+                break
+            del self._sessions[session_id]
+            self._bytes -= entry[2]
+            self.expirations += 1
+
+    def _evict(self, keep):
+        """Evict least recently used sessions until within the limits."""
+        while len(self._sessions) > 1 and (
+                len(self._sessions) > self.max_sessions or
+                (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            session_id, entry = next(iter(self._sessions.items()))
+            if session_id == keep:
+                break
+            del self._sessions[session_id]
+            self._bytes -= entry[2]
+            self.evictions += 1
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Solution Bounds Module
+
+Cheap lower and upper bounds on the number of swaps needed to solve
+a Tile Swap puzzle on an arbitrary connected graph.
+"""
+
+from collections import deque
+
+
+class SolutionBounds:
+    """Computes lower and upper bounds for graph-aware scoring."""
+
+    # Above this size the all-pairs distance matrix (n BFS passes, n^2
+    # memory) is too expensive, so only the linear-time cycle bound is used
+    DISTANCE_BOUND_MAX_NODES = 500
+
+    @staticmethod
+    def cycle_lower_bound(tile_configuration):
+        """
+        Lower bound from cycle decomposition of the permutation.
+
+        Exact on complete graphs; a lower bound on any other graph since
+        every swap changes the number of permutation cycles by one.
+        """
+        visited = set()
+        num_swaps = 0
+
+        for start in tile_configuration:
+            if start in visited:
+                continue
+
+            cycle_length = 0
+            current = start
+            while current not in visited:
+                visited.add(current)
+                cycle_length += 1
+                current = tile_configuration[current]
+
+            num_swaps += cycle_length - 1
+
+        return num_swaps
+
+    @staticmethod
+    def distance_lower_bound(graph, tile_configuration):
+        """
+        Lower bound from shortest-path distances.
+
+        Each swap moves two tiles by one edge, so at least half of the total
+        distance between tiles and their home nodes must be travelled.
+        """
+        total = 0
+        for node, tile in tile_configuration.items():
+            total += graph.distance(tile, node)
+        return (total + 1) // 2
+
+    @staticmethod
+    def lower_bound(graph, tile_configuration):
+        """Return the best available lower bound."""
+        if len(tile_configuration) > SolutionBounds.DISTANCE_BOUND_MAX_NODES:
+            return SolutionBounds.cycle_lower_bound(tile_configuration)
+        return max(
+            SolutionBounds.cycle_lower_bound(tile_configuration),
+            SolutionBounds.distance_lower_bound(graph, tile_configuration)
+        )
+
+    @staticmethod
+    def greedy_upper_bound(graph, tile_configuration):
+        """
+        Build a valid (not necessarily optimal) solution.
+
+        Nodes are finalised in reverse BFS order over a spanning tree, so the
+        node being filled is always a leaf of the remaining tree and routing
+        its tile home never disturbs nodes that are already finished.
+
+        Returns:
+            List of (node1, node2) swaps that solves the puzzle
+        """
+        compact = graph.compact()
+        nodes = compact.nodes
+        if not nodes:
+            return []
+
+        # BFS spanning tree over dense indices
+        parent = [-1] * len(nodes)
+        depth = [-1] * len(nodes)
+        depth[0] = 0
+        order = []
+        queue = deque([0])
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            for neighbor in compact.neighbors(current):
+                if depth[neighbor] < 0:
+                    parent[neighbor] = current
+                    depth[neighbor] = depth[current] + 1
+                    queue.append(neighbor)
+
+        index = compact.index
+        tiles = [index[tile_configuration[node]] for node in nodes]
+        position = [0] * len(nodes)
+        for pos, tile in enumerate(tiles):
+            position[tile] = pos
+        moves = []
+
+        for target in reversed(order):
+            source = position[target]
+            if source == target:
+                continue
+
+            # Tree path source -> target through their lowest common ancestor
+            up, down = [source], [target]
+            a, b = source, target
+            while depth[a] > depth[b]:
+                a = parent[a]
+                up.append(a)
+            while depth[b] > depth[a]:
+                b = parent[b]
+                down.append(b)
+            while a != b:
+                a = parent[a]
+                b = parent[b]
+                up.append(a)
+                down.append(b)
+            path = up + list(reversed(down[:-1]))
+
+            for i, j in zip(path, path[1:]):
+                tile1, tile2 = tiles[i], tiles[j]
+                tiles[i], tiles[j] = tile2, tile1
+                position[tile1], position[tile2] = j, i
+                moves.append((nodes[i], nodes[j]))
+
+        return moves
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Solver Cache Module
+
+Process-wide memoization of optimal-move results, keyed by a canonical
+fingerprint of the graph's edge set plus the tile permutation, with
+optional SQLite persistence across restarts.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from optimal_solver import SolverResult
+
+
+class SolverCache:
+    """
+    Size-bounded LRU cache of SolverResult objects.
+
+    Exact results are reused unconditionally. A result that fell back to
+    bounds is only reused for requests whose time budget is no larger than
+    the one it was computed with, so a bigger budget can still improve it.
+    """
+
+    def __init__(self, max_size=10000, db_path=None):
+        self.max_size = max_size
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()  # key -> (SolverResult, time_budget)
+        self._lock = threading.Lock()
+        self._db = None
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS solver_results ("
+                "key TEXT PRIMARY KEY, time_budget REAL, result TEXT)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(graph, tile_configuration, strategy=None):
+        """
+        Canonical key for a (graph, permutation) pair.
+
+        Results of an explicitly chosen solver strategy are keyed apart
+        from the default solve, which may come from a family formula.
+
+        Raises:
+            ValueError: if the tiles are not a permutation of the nodes
+        """
+        nodes = graph.compact().nodes
+        tiles = [tile_configuration.get(node) for node in nodes]
+        if len(tile_configuration) != len(nodes) or set(tiles) != set(nodes):
+            raise ValueError("Tile configuration must be a permutation of the graph's nodes")
+        permutation = ",".join(str(tile) for tile in tiles)
+        key = f"{graph.fingerprint()}|{permutation}"
+        if strategy is not None:
+            key += f"|{strategy}"
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get(self, graph, tile_configuration, time_budget, strategy=None):
+        """Return a cached SolverResult usable for this budget, or None."""
+        key = self.make_key(graph, tile_configuration, strategy)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                entry = self._load(key)
+                if entry is not None:
+                    self.disk_hits += 1
+                    self._remember(key, entry)
+
+            if entry is not None and (entry[0].exact or time_budget <= entry[1]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, graph, tile_configuration, result, time_budget, strategy=None):
+        """Store a result computed with the given time budget."""
+        key = self.make_key(graph, tile_configuration, strategy)
+        entry = (result, time_budget)
+
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO solver_results (key, time_budget, result) VALUES (?, ?, ?)",
+                    (key, time_budget, json.dumps(self._to_dict(result)))
+                )
+                self._db.commit()
+
+    def stats(self):
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'persistent': self._db is not None
+            }
+
+    def clear(self):
+        """Drop all in-memory entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = 0
+
+    def _remember(self, key, entry):
+        """Insert into the LRU, evicting the least recently used entry."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        """Read an entry back from SQLite."""
+        row = self._db.execute(
+            "SELECT time_budget, result FROM solver_results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return (self._from_dict(json.loads(row[1])), row[0])
+
+    @staticmethod
+    def _to_dict(result):
+        """Serialize a SolverResult for storage."""
+        return {
+            'optimal_moves': result.optimal_moves,
+            'exact': result.exact,
+            'lower_bound': result.lower_bound,
+            'upper_bound': result.upper_bound,
+            'moves': result.moves,
+            'nodes_expanded': result.nodes_expanded,
+            'strategy': result.strategy
+        }
+
+    @staticmethod
+    def _from_dict(data):
+        """Rebuild a SolverResult from storage."""
+        moves = data.get('moves')
+        if moves is not None:
+            moves = [tuple(move) for move in moves]
+        return SolverResult(data['optimal_moves'], data['exact'], data['lower_bound'],
+                            data['upper_bound'], moves, data.get('nodes_expanded', 0),
+                            data.get('strategy', ''))
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+State Backend Module
+
+Where the web apps keep per-session game states, multiplayer rooms and the
+session -> room / socket maps. The in-memory backend keeps everything in
+this process; the SQLite backend shares it between worker processes on one
+host, so the apps can run under several gunicorn workers.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager, nullcontext
+
+from session_store import SessionStore
+from web_game_state import WebGameState
+
+
+class StateBackend:
+    """
+    Interface shared by the state backends.
+
+    Attributes:
+        rooms: mapping room code -> GameRoom
+        session_rooms: mapping session id -> room code
+        session_sockets: mapping session id -> socket id
+
+    Rooms must be read and changed inside transaction(); the SQLite backend
+    writes changed rooms back when the transaction ends.
+    """
+
+    def get_game(self, session_id):
+        """Load the session's WebGameState, creating an empty one if needed."""
+        raise NotImplementedError
+
+    def save_game(self, session_id, game):
+        """Store the session's WebGameState after a request changed it."""
+        raise NotImplementedError
+
+    def touch_game(self, session_id):
+        """Mark the session's game state used by a request that left it unchanged."""
+        raise NotImplementedError
+
+    def transaction(self):
+        """Context manager serializing room edits across workers."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return live session and storage counters."""
+        raise NotImplementedError
+
+
+class InMemoryStateBackend(StateBackend):
+    """Everything in process dicts; single-process deployments only."""
+
+    def __init__(self, sessions=None):
+        """
+        Args:
+            sessions: SessionStore for the game states (default: one with
+                the default limits)
+        """
+        self.sessions = sessions if sessions is not None else SessionStore(WebGameState)
+        self.rooms = {}
+        self.session_rooms = {}
+        self.session_sockets = {}
+
+    def get_game(self, session_id):
+        return self.sessions.get(session_id)
+
+    def save_game(self, session_id, game):
+        # The stored object is the live one; only its size needs updating
+        self.sessions.refresh(session_id)
+
+    def touch_game(self, session_id):
+        # get() already refreshed its place in the LRU order
+        pass
+
+    def transaction(self):
+        return nullcontext()
+
+    def stats(self):
+        info = self.sessions.stats()
+        info['backend'] = 'memory'
+        return info
+
+
+class SQLiteMapping:
+    """
+    Dict-like view of one namespace of the SQLite backend's key/value table.
+
+    Values go through encode/decode. With write_back set, values read
+    inside a transaction are kept and written back when it commits, so
+    objects can be changed in place as with a plain dict; values whose
+    encoding did not change are not written.
+    """
+
+    def __init__(self, backend, namespace, encode, decode, write_back=False):
+        self.backend = backend
+        self.namespace = namespace
+        self.encode = encode
+        self.decode = decode
+        self.write_back = write_back
+
+    def _loaded(self):
+        """
+        Objects read in the current transaction as key -> (value, stored
+        blob), or None outside one.
+        """
+        loaded = getattr(self.backend._local, 'loaded', None) if self.write_back else None
+        return loaded.setdefault(self.namespace, {}) if loaded is not None else None
+
+    def __getitem__(self, key):
+        loaded = self._loaded()
+        if loaded is not None and key in loaded:
+            return loaded[key][0]
+        row = self.backend._db().execute(
+            "SELECT value FROM state WHERE namespace = ? AND key = ?", (self.namespace, key)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        value = self.decode(row[0])
+        if loaded is not None:
+            loaded[key] = (value, row[0])
+        return value
+
+    def __setitem__(self, key, value):
+        blob = self.encode(value)
+        self.backend._db().execute(
+            "INSERT OR REPLACE INTO state (namespace, key, value) VALUES (?, ?, ?)",
+            (self.namespace, key, blob)
+        )
+        loaded = self._loaded()
+        if loaded is not None:
+            loaded[key] = (value, blob)
+
+    def __delitem__(self, key):
+        loaded = self._loaded()
+        if loaded is not None:
+            loaded.pop(key, None)
+        cursor = self.backend._db().execute(
+            "DELETE FROM state WHERE namespace = ? AND key = ?", (self.namespace, key)
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.backend._db().execute(
+            "SELECT 1 FROM state WHERE namespace = ? AND key = ?", (self.namespace, key)
+        ).fetchone() is not None
+
+    def __len__(self):
+        return self.backend._db().execute(
+            "SELECT COUNT(*) FROM state WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [row[0] for row in self.backend._db().execute(
+            "SELECT key FROM state WHERE namespace = ?", (self.namespace,))]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def _flush(self):
+        """Write back the objects read in the current transaction that changed."""
+        loaded = self._loaded()
+        if loaded:
+            changed = []
+            for key, (value, stored) in loaded.items():
+                blob = self.encode(value)
+                if blob != stored:
+                    changed.append((blob, self.namespace, key))
+            self.backend._db().executemany(
+                "UPDATE state SET value = ? WHERE namespace = ? AND key = ?", changed
+            )
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    State shared between processes through one SQLite file.
+
+    Game states are stored as WebGameState.to_bytes() blobs, loaded when a
+    request first asks for them and saved after it if it changed them. Rooms are pickled and
+    compressed; transaction() takes SQLite's write lock, so room edits in
+    different workers are serialized.
+    """
+
+    DEFAULT_TTL = SessionStore.DEFAULT_TTL
+
+    # Idle game states are purged once every this many saves
+    EXPIRE_EVERY = 500
+
+    def __init__(self, db_path, ttl=DEFAULT_TTL):
+        """
+        Args:
+            db_path: SQLite file shared by the workers
+            ttl: Seconds a game state may stay idle, or None for no expiry
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.expirations = 0
+        self._saves = 0
+        self._local = threading.local()
+
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("CREATE TABLE IF NOT EXISTS games ("
+                   "session_id TEXT PRIMARY KEY, data BLOB, last_access REAL)")
+        db.execute("CREATE TABLE IF NOT EXISTS state ("
+                   "namespace TEXT, key TEXT, value BLOB, PRIMARY KEY (namespace, key))")
+
+        self.rooms = SQLiteMapping(self, 'room', SQLiteStateBackend._encode_room,
+                                   SQLiteStateBackend._decode_room, write_back=True)
+        self.session_rooms = SQLiteMapping(self, 'session_room', str, str)
+        self.session_sockets = SQLiteMapping(self, 'session_socket', str, str)
+
+    def _db(self):
+        """This thread's connection (sqlite3 connections are per thread)."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.db = db
+            self._local.depth = 0
+            self._local.loaded = None
+        return db
+
+    @staticmethod
+    def _encode_room(room):
+        return zlib.compress(pickle.dumps(room, pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _decode_room(blob):
+        return pickle.loads(zlib.decompress(blob))
+
+    def get_game(self, session_id):
+        row = self._db().execute(
+            "SELECT data FROM games WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return WebGameState.from_bytes(row[0]) if row is not None else WebGameState()
+
+    def save_game(self, session_id, game):
+        now = time.time()
+        db = self._db()
+        db.execute("INSERT OR REPLACE INTO games (session_id, data, last_access) VALUES (?, ?, ?)",
+                   (session_id, game.to_bytes(), now))
+
+        self._saves += 1
+        if self.ttl is not None and self._saves % SQLiteStateBackend.EXPIRE_EVERY == 0:
+            self.expirations += db.execute(
+                "DELETE FROM games WHERE last_access < ?", (now - self.ttl,)
+            ).rowcount
+
+    def touch_game(self, session_id):
+        self._db().execute("UPDATE games SET last_access = ? WHERE session_id = ?",
+                           (time.time(), session_id))
+
+    @contextmanager
+    def transaction(self):
+        db = self._db()
+        local = self._local
+        if local.depth:
+            local.depth += 1
+            try:
+                yield
+            finally:
+                local.depth -= 1
+            return
+
+        db.execute("BEGIN IMMEDIATE")
+        local.depth = 1
+        local.loaded = {}
+        try:
+            yield
+            self.rooms._flush()
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            local.depth = 0
+            local.loaded = None
+
+    def stats(self):
+        live, stored = self._db().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM games"
+        ).fetchone()
+        return {
+            'backend': 'sqlite',
+            'live_sessions': live,
+            'stored_bytes': stored,
+            'expirations': self.expirations,
+            'rooms': len(self.rooms)
+        }
@@ -356,6 +356,7 @@ class TileSwapGame {
         document.getElementById('new-game-btn').addEventListener('click', () => this.newGame());
         document.getElementById('custom-graph-btn').addEventListener('click', () => this.openGraphEditor());
         document.getElementById('undo-btn').addEventListener('click', () => this.undo());
+        document.getElementById('hint-btn').addEventListener('click', () => this.hint());
         document.getElementById('redo-btn').addEventListener('click', () => this.redo());
         document.getElementById('save-btn').addEventListener('click', () => this.saveGame());
         document.getElementById('load-btn').addEventListener('click', () => this.loadGame());
@@ -463,7 +464,7 @@ class TileSwapGame {
             const data = await response.json();
 
             if (data.success) {
-                this.gameState = data.state;
+                this.setGameState(data.state);
                 this.selectedNode = null;
                 this.updateUI();
                 this.draw();
@@ -487,21 +488,62 @@ class TileSwapGame {
         this.draw();
     }
 
-    async newGame(numNodesParam) {
-        // Use parameter if provided (multiplayer), otherwise read from input (single player)
+    setGameState(state) {
+        // Large graphs arrive as parallel arrays in node order; expand them
+        // into the per-node maps the renderer uses
+        if (state && state.compact) {
+            state.node_positions = {};
+            state.tiles = {};
+            state.nodes.forEach((node, i) => {
+                state.node_positions[node.toString()] = {
+                    x: state.positions[2 * i],
+                    y: state.positions[2 * i + 1]
+                };
+                const tile = state.tile_list[i];
+                state.tiles[node.toString()] = { tile: tile, matched: tile === node };
+            });
+        }
+        this.gameState = state;
+    }
+
+    async applyDelta(delta) {
+        // Swap, undo and redo only send the tiles that changed; the static
+        // graph part is kept from the last full state
+        if (!this.gameState || delta.graph_version !== this.gameState.graph_version) {
+            await this.refreshState();
+            return;
+        }
+
+        for (const [node, tile] of Object.entries(delta.changed_tiles)) {
+            this.gameState.tiles[node] = { tile: tile, matched: tile === parseInt(node) };
+        }
+        ['active', 'move_count', 'tiles_remaining', 'lower_bounds', 'can_undo', 'can_redo', 'state_version']
+            .forEach(key => {
+                if (key in delta) this.gameState[key] = delta[key];
+            });
+    }
+
+    async refreshState() {
+        const response = await fetch('/api/state');
+        this.setGameState(await response.json());
+    }
+
+    async newGame(numNodesParam, difficultyParam) {
+        // Use parameters if provided (multiplayer), otherwise read from inputs (single player)
         const numNodes = numNodesParam || parseInt(document.getElementById('num-nodes').value);
+        const difficulty = numNodesParam ? difficultyParam : document.getElementById('difficulty').value;
 
         try {
             const response = await fetch('/api/new_game', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ num_nodes: numNodes })
+                body: JSON.stringify({ num_nodes: numNodes, difficulty: difficulty || null })
             });
 
             const data = await response.json();
 
             if (data.success) {
-                this.gameState = data.state;
+                this.setGameState(data.state);
                 this.selectedNode = null;
                 this.updateUI();
                 this.draw();
@@ -530,7 +572,7 @@ class TileSwapGame {
                 // Animate the swap
                 await this.animateSwap(node1, node2);
 
-                this.gameState = data.state;
+                await this.applyDelta(data);
                 this.selectedNode = null;
                 this.updateUI();
                 this.draw();
@@ -582,7 +624,7 @@ class TileSwapGame {
             const data = await response.json();
 
             if (data.success) {
-                this.gameState = data.state;
+                await this.applyDelta(data);
                 this.selectedNode = null;
                 this.updateUI();
                 this.draw();
@@ -603,7 +645,7 @@ class TileSwapGame {
             const data = await response.json();
 
             if (data.success) {
-                this.gameState = data.state;
+                await this.applyDelta(data);
                 this.selectedNode = null;
                 this.updateUI();
                 this.draw();
@@ -614,6 +656,26 @@ class TileSwapGame {
         }
     }
 
+    async hint() {
+        if (!this.gameState || !this.gameState.active) return;
+
+        try {
+            const response = await fetch('/api/hint');
+            const data = await response.json();
+
+            if (data.success) {
+                // Pre-select the first node so one click completes the swap
+                this.selectedNode = data.node1;
+                this.draw();
+                this.showMessage('Hint', `Try swapping nodes ${data.node1} and ${data.node2}.`);
+            } else {
+                this.showMessage('Hint', data.message);
+            }
+        } catch (error) {
+            console.error('Error getting hint:', error);
+        }
+    }
+
     // ========================================================================
     // SAVE/LOAD
     // ========================================================================
@@ -664,7 +726,7 @@ class TileSwapGame {
                 const data = await response.json();
 
                 if (data.success) {
-                    this.gameState = data.state;
+                    this.setGameState(data.state);
                     this.selectedNode = null;
                     this.updateUI();
                     this.draw();
@@ -771,7 +833,10 @@ class TileSwapGame {
         }
 
         document.getElementById('move-count').textContent = this.gameState.move_count;
-        document.getElementById('optimal-moves').textContent = this.gameState.optimal_moves;
+        // When the exact search timed out the server only knows a range
+        document.getElementById('optimal-moves').textContent = this.gameState.optimal_exact === false
+            ? `${this.gameState.optimal_lower_bound}-${this.gameState.optimal_moves}`
+            : this.gameState.optimal_moves;
         document.getElementById('game-status').textContent =
             this.gameState.active ? 'Playing' : 'Game over';
 
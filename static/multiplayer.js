@@ -15,6 +15,9 @@ class MultiplayerClient {
         this.mySessionId = null;
         this.isMultiplayerMode = false;
         this.roomMode = null; // 'realtime' or 'turnbased'
+        this.inGame = false; // Moves go to the room while set
+        this.leaderboard = [];
+        this.leaderboardVersion = null;
 
         this.setupUI();
         this.connect();
@@ -44,6 +47,9 @@ class MultiplayerClient {
         this.socket.on('player_ready_changed', (data) => this.handlePlayerReadyChanged(data));
         this.socket.on('game_started', (data) => this.handleGameStarted(data));
         this.socket.on('leaderboard_update', (data) => this.handleLeaderboardUpdate(data));
+        this.socket.on('leaderboard_delta', (data) => this.handleLeaderboardDelta(data));
+        this.socket.on('move_accepted', (data) => this.handleMoveAccepted(data));
+        this.socket.on('move_failed', (data) => this.handleMoveFailed(data));
         this.socket.on('left_room', (data) => this.handleLeftRoom(data));
 
         // Test event to verify room broadcasts work
@@ -120,11 +126,12 @@ class MultiplayerClient {
         const playerName = document.getElementById('player-name').value.trim() || 'Player';
         const mode = document.getElementById('game-mode-select').value;
         const numNodes = parseInt(document.getElementById('mp-num-nodes').value);
+        const difficulty = document.getElementById('mp-difficulty').value || null;
 
         this.roomMode = mode;
 
         // Create game first
-        this.game.newGame(numNodes).then(() => {
+        this.game.newGame(numNodes, difficulty).then(() => {
             // Hide tiles until game starts (host should also not see tiles in lobby)
             this.game.showTiles = false;
             this.game.draw();
@@ -133,7 +140,8 @@ class MultiplayerClient {
             this.socket.emit('create_room', {
                 name: playerName,
                 mode: mode,
-                num_nodes: numNodes
+                num_nodes: numNodes,
+                difficulty: difficulty
             });
         });
     }
@@ -200,8 +208,8 @@ class MultiplayerClient {
 
         this.updateLobby(data.room_info);
 
-        // Load the game graph preview (without tiles showing) - same as non-host
-        this.loadMultiplayerGraph(data.room_info, false);
+        // Preview the game graph (without tiles showing) - same as non-host
+        this.previewBoard(data);
     }
 
     handleRoomJoined(data) {
@@ -216,8 +224,8 @@ class MultiplayerClient {
 
         this.updateLobby(data.room_info);
 
-        // Load the game graph preview (without tiles showing)
-        this.loadMultiplayerGraph(data.room_info, false);
+        // Preview the game graph (without tiles showing)
+        this.previewBoard(data);
     }
 
     handleJoinFailed(data) {
@@ -262,11 +270,9 @@ class MultiplayerClient {
 
         const roomInfo = data.room_info;
 
-        // DIAGNOSTIC: Check what tiles data we received
+        // DIAGNOSTIC: Check what puzzle data we received
+        console.log('DEBUG: roomInfo.puzzle_seed =', roomInfo.puzzle_seed);
         console.log('DEBUG: roomInfo.initial_tiles =', roomInfo.initial_tiles);
-        console.log('DEBUG: typeof roomInfo.initial_tiles =', typeof roomInfo.initial_tiles);
-        console.log('DEBUG: Object.keys(roomInfo.initial_tiles) =', Object.keys(roomInfo.initial_tiles));
-        console.log('DEBUG: Object.keys(roomInfo.initial_tiles).length =', Object.keys(roomInfo.initial_tiles).length);
 
         this.roomMode = roomInfo.mode;
 
@@ -274,15 +280,12 @@ class MultiplayerClient {
         document.getElementById('multiplayer-lobby').classList.add('hidden');
         document.getElementById('multiplayer-leaderboard').classList.remove('hidden');
 
-        // Load the graph if not host, otherwise just show tiles for host
-        if (!this.isHost) {
-            console.log('Non-host: Loading graph with tiles');
-            this.loadMultiplayerGraph(roomInfo, true); // Show tiles now
+        // The server sends the host's board, seeded or not. Moves go to the
+        // room over the socket
+        if (data.board) {
+            this.startBoard(data.board);
         } else {
-            console.log('Host: Revealing tiles');
-            // Host already has the graph, just reveal the tiles
-            this.game.showTiles = true;
-            this.game.draw();
+            this.loadMultiplayerGraph(roomInfo, true);
         }
 
         // For turn-based, disable controls if not my turn
@@ -303,10 +306,49 @@ class MultiplayerClient {
         }
     }
 
+    handleLeaderboardDelta(delta) {
+        // A missed delta means our copy is stale: ask for the full board
+        if (this.leaderboardVersion === null || delta.version !== this.leaderboardVersion + 1) {
+            this.socket.emit('request_leaderboard');
+            return;
+        }
+
+        const players = new Map(this.leaderboard.map(player => [player.session_id, player]));
+        delta.removed.forEach(sessionId => players.delete(sessionId));
+        delta.entries.forEach(entry => players.set(entry.session_id, entry));
+
+        // Players without a new position keep their old one
+        const ordered = new Array(players.size);
+        this.leaderboard.forEach((player, index) => {
+            if (players.has(player.session_id) && !(player.session_id in delta.positions)) {
+                ordered[index] = players.get(player.session_id);
+            }
+        });
+        for (const [sessionId, position] of Object.entries(delta.positions)) {
+            ordered[position] = players.get(sessionId);
+        }
+
+        if (ordered.length !== players.size || ordered.some(player => player === undefined)) {
+            this.socket.emit('request_leaderboard');
+            return;
+        }
+
+        this.leaderboard = ordered;
+        this.leaderboardVersion = delta.version;
+        this.renderLeaderboard();
+
+        if (this.roomMode === 'turnbased') {
+            this.updateTurnBasedControls(delta);
+        }
+    }
+
     handleLeftRoom(data) {
         this.currentRoom = null;
+        this.inGame = false;
         this.isHost = false;
         this.isReady = false;
+        this.leaderboard = [];
+        this.leaderboardVersion = null;
 
         // Reset UI
         document.getElementById('toggle-ready-btn').textContent = 'Ready';
@@ -331,6 +373,9 @@ class MultiplayerClient {
     // ========================================================================
 
     updateLobby(roomInfo) {
+        // Every full board is also the baseline for later deltas
+        this.updateLeaderboard(roomInfo);
+
         document.getElementById('lobby-room-code').textContent = roomInfo.code;
         document.getElementById('lobby-mode').textContent =
             roomInfo.mode === 'realtime' ? 'Real-Time Race' : 'Turn-Based';
@@ -381,10 +426,18 @@ class MultiplayerClient {
     }
 
     updateLeaderboard(roomInfo) {
+        this.leaderboard = roomInfo.leaderboard;
+        if (roomInfo.leaderboard_version !== undefined) {
+            this.leaderboardVersion = roomInfo.leaderboard_version;
+        }
+        this.renderLeaderboard();
+    }
+
+    renderLeaderboard() {
         const leaderboardList = document.getElementById('leaderboard-list');
         leaderboardList.innerHTML = '';
 
-        roomInfo.leaderboard.forEach((player, index) => {
+        this.leaderboard.forEach((player, index) => {
             const playerDiv = document.createElement('div');
             playerDiv.className = 'leaderboard-player';
 
@@ -457,6 +510,20 @@ class MultiplayerClient {
         }
     }
 
+    previewBoard(data) {
+        // The host's board comes with the room; fall back to rebuilding the
+        // graph from the room info if the host had none
+        if (!data.board) {
+            this.loadMultiplayerGraph(data.room_info, false);
+            return;
+        }
+        this.game.setGameState(data.board);
+        this.game.selectedNode = null;
+        this.game.showTiles = false; // Hide tiles in lobby
+        this.game.updateUI();
+        this.game.draw();
+    }
+
     loadMultiplayerGraph(roomInfo, showTilesNow = false) {
         // Load graph from room info
         const edges = roomInfo.graph_edges;
@@ -490,7 +557,7 @@ class MultiplayerClient {
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    this.game.gameState = data.state;
+                    this.game.setGameState(data.state);
                     this.game.selectedNode = null;
                     this.game.showTiles = false; // Hide tiles in lobby
                     this.game.updateUI();
@@ -518,7 +585,7 @@ class MultiplayerClient {
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                this.game.gameState = data.state;
+                this.game.setGameState(data.state);
                 this.game.selectedNode = null;
                 this.game.showTiles = showTilesNow; // Control tile visibility
                 this.game.updateUI();
@@ -532,21 +599,58 @@ class MultiplayerClient {
     // GAME INTEGRATION
     // ========================================================================
 
-    notifyMove(moves, solved) {
-        if (!this.currentRoom || !this.isMultiplayerMode) return;
+    startBoard(state) {
+        // The room validates and counts moves, so the board keeps no undo
+        // history or local bounds of its own
+        state.move_count = 0;
+        state.lower_bounds = null;
+        state.can_undo = false;
+        state.can_redo = false;
+        this.game.setGameState(state);
+        this.inGame = true;
+        this.game.selectedNode = null;
+        this.game.showTiles = true;
+        this.game.updateUI();
+        this.game.draw();
+    }
+
+    inMultiplayerGame() {
+        return this.isMultiplayerMode && this.currentRoom && this.inGame;
+    }
 
-        this.socket.emit('player_move', {
-            moves: moves,
-            solved: solved
-        });
+    sendMove(node1, node2) {
+        if (this.game.animating) return;
+        this.socket.emit('player_move', { node1: node1, node2: node2 });
+    }
+
+    async handleMoveAccepted(data) {
+        const game = this.game;
+        await game.animateSwap(data.node1, data.node2);
+
+        for (const [node, tile] of Object.entries(data.changed_tiles)) {
+            game.gameState.tiles[node] = { tile: tile, matched: tile === parseInt(node) };
+        }
+        game.gameState.move_count = data.moves;
+        game.gameState.tiles_remaining = data.tiles_remaining;
+        game.gameState.active = !data.solved;
+        game.selectedNode = null;
+        game.updateUI();
+        game.draw();
+        game.soundEffects.playSwap();
 
         // If solved in multiplayer, show local message too
-        if (solved) {
+        if (data.solved) {
             setTimeout(() => {
-                this.game.showMessage('Puzzle Solved!', `You finished in ${moves} moves!\n\nWait for other players to finish.`);
+                game.showMessage('Puzzle Solved!', `You finished in ${data.moves} moves!\n\nWait for other players to finish.`);
             }, 500);
         }
     }
+
+    handleMoveFailed(data) {
+        this.game.selectedNode = null;
+        this.game.draw();
+        this.game.showMessage('Invalid Move', data.message);
+    }
 }
 
 // ============================================================================
@@ -560,19 +664,14 @@ document.addEventListener('DOMContentLoaded', () => {
         if (window.game) {
             window.multiplayerClient = new MultiplayerClient(window.game);
 
-            // Hook into game's swap function
+            // Hook into game's swap function: in a multiplayer game the
+            // swap is sent to the room instead of the single-player API
             const originalSwap = window.game.swapTiles.bind(window.game);
             window.game.swapTiles = async function(node1, node2) {
-                await originalSwap(node1, node2);
-
-                // Notify multiplayer if in MP mode
-                if (window.multiplayerClient.isMultiplayerMode &&
-                    window.multiplayerClient.currentRoom &&
-                    this.gameState) {
-                    window.multiplayerClient.notifyMove(
-                        this.gameState.move_count,
-                        !this.gameState.active // solved = not active
-                    );
+                if (window.multiplayerClient.inMultiplayerGame()) {
+                    window.multiplayerClient.sendMove(node1, node2);
+                } else {
+                    await originalSwap(node1, node2);
                 }
             };
         }
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Test the happy-swap approximation solver."""
+
+import random
+import time
+
+from approximation_solver import ApproximationSolver
+from graph_builder import GraphBuilder
+from score_calculator import ScoreCalculator
+
+print("Testing Approximation Solver")
+print("=" * 80)
+
+random.seed(10)
+
+
+def random_puzzle(num_nodes, num_edges):
+    """Connected random graph plus a shuffled tile configuration."""
+    graph = GraphBuilder._generate_random_graph(num_nodes, num_edges)
+    nodes = graph.get_nodes()
+    shuffled = nodes[:]
+    random.shuffle(shuffled)
+    return graph, dict(zip(nodes, shuffled))
+
+
+def check_solution(graph, tiles, moves):
+    """Assert the moves are edges and sort the tiles."""
+    current = dict(tiles)
+    for node1, node2 in moves:
+        assert graph.are_connected(node1, node2)
+        current[node1], current[node2] = current[node2], current[node1]
+    assert all(node == tile for node, tile in current.items())
+
+
+# Test 1: Within a factor four of the exact optimum on small graphs
+print("\n1. Approximation ratio against exact search (200 puzzles, 2-9 nodes)")
+worst = 1.0
+for trial in range(200):
+    num_nodes = random.randint(2, 9)
+    num_edges = random.randint(num_nodes - 1, num_nodes * (num_nodes - 1) // 2)
+    graph, tiles = random_puzzle(num_nodes, num_edges)
+
+    result = ApproximationSolver(graph).solve(tiles)
+    check_solution(graph, tiles, result.moves)
+    assert result.optimal_moves == len(result.moves) == result.upper_bound
+
+    optimal = ScoreCalculator.solve(graph, tiles, time_budget=5.0).optimal_moves
+    assert result.lower_bound <= optimal <= result.optimal_moves <= 4 * optimal, f"trial {trial}"
+    if optimal:
+        worst = max(worst, result.optimal_moves / optimal)
+print(f"   Worst ratio: {worst:.2f}")
+print("   [OK] Every solution is valid and at most 4x optimal")
+
+# Test 2: Large graphs are solved quickly, including the spanning-tree mode
+print("\n2. Large graphs")
+GraphBuilder.enable_large_graph_mode()
+for num_nodes, num_edges in [(400, 900), (3000, 6000)]:
+    graph, tiles = random_puzzle(num_nodes, num_edges)
+    start = time.perf_counter()
+    result = ScoreCalculator.solve(graph, tiles)
+    elapsed = time.perf_counter() - start
+    assert result.strategy == 'approximation'
+    check_solution(graph, tiles, result.moves)
+    greedy = ScoreCalculator.calculate_bounds(graph, tiles).optimal_moves
+    print(f"   {num_nodes} nodes: between {result.lower_bound} and {result.upper_bound} "
+          f"(greedy {greedy}) in {elapsed:.3f}s")
+GraphBuilder.disable_large_graph_mode()
+print("   [OK] Valid solutions with an honest range")
+
+# Test 3: Selectable as a strategy at any size
+print("\n3. Strategy selection")
+graph, tiles = random_puzzle(8, 12)
+result = ScoreCalculator.solve(graph, tiles, strategy='approximation')
+assert result.strategy in ('approximation', 'bounds')
+check_solution(graph, tiles, result.moves)
+print("   [OK] 'approximation' strategy available through ScoreCalculator")
+
+print("\n" + "=" * 80)
+print("Approximation solver test complete!")
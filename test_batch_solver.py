@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Test the parallel batch solver."""
+
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import Future
+
+from batch_solver import BatchSolver, main, solve_record
+from graph_builder import GraphBuilder
+from score_calculator import ScoreCalculator
+
+print("Testing Batch Solver")
+print("=" * 80)
+
+random.seed(12)
+
+
+def random_record(record_id, num_nodes, num_edges):
+    """Puzzle record as it would appear in a JSONL file."""
+    num_edges = min(num_edges, num_nodes * (num_nodes - 1) // 2)
+    graph = GraphBuilder._generate_random_graph(num_nodes, num_edges)
+    nodes = graph.get_nodes()
+    tiles = nodes[:]
+    random.shuffle(tiles)
+    edges = [[u, v] for u, v in graph.compact().edges()]
+    return {'id': record_id, 'edges': edges, 'tiles': {str(n): t for n, t in zip(nodes, tiles)}}
+
+
+records = [random_record(i, random.randint(4, 10), random.randint(9, 15)) for i in range(120)]
+records = json.loads(json.dumps(records))  # Same types as parsed JSONL
+
+# Test 1: Parallel results match serial scoring, in order
+print("\n1. Parallel results match serial scoring")
+start = time.perf_counter()
+serial = [solve_record(record) for record in records]
+serial_time = time.perf_counter() - start
+
+ScoreCalculator.cache.clear()
+start = time.perf_counter()
+parallel = list(BatchSolver(workers=4, chunk_size=8).solve(records))
+parallel_time = time.perf_counter() - start
+
+assert [r['id'] for r in parallel] == list(range(120))
+assert parallel == serial
+print(f"   Serial {serial_time:.2f}s, 4 workers {parallel_time:.2f}s")
+print("   [OK] 120 puzzles scored identically and in input order")
+
+# Test 2: Malformed records become error results
+print("\n2. Malformed records")
+bad = [{'id': 'no-tiles', 'edges': [[1, 2]]},
+       {'id': 'not-perm', 'edges': [[1, 2]], 'tiles': {'1': 1, '2': 1}},
+       {'id': 'split', 'edges': [[1, 2], [3, 4]], 'tiles': {'1': 3, '2': 2, '3': 1, '4': 4}},
+       [1, 2]]
+results = list(BatchSolver(workers=2, chunk_size=1).solve(bad + records[:2]))
+assert 'KeyError' in results[0]['error'] and 'ValueError' in results[1]['error']
+assert results[2]['error'] == 'ValueError: Graph is not connected'
+assert 'optimal_moves' not in results[2]
+assert results[3] == {'id': None, 'error': 'TypeError: Record must be a JSON object'}
+assert results[4] == serial[0] and results[5] == serial[1]
+
+failed = Future()
+failed.set_exception(RuntimeError("worker died"))
+assert BatchSolver()._collect([{'id': 'a'}, [1]], failed) == [
+    {'id': 'a', 'error': 'RuntimeError: worker died'}, {'id': None, 'error': 'RuntimeError: worker died'}]
+print("   [OK] Errors are reported per record without stopping the batch")
+
+# Test 3: Chunks that miss the timeout are reported, later ones still arrive
+print("\n3. Task timeout")
+slow = random_record('slow', 20, 26)
+results = list(BatchSolver(workers=2, chunk_size=1, time_budget=5.0, timeout=0.05)
+               .solve([slow] + records[:1]))
+assert results[0] == {'id': 'slow', 'error': 'timeout'}
+print("   [OK] Timed-out chunk reported as an error")
+
+# Test 4: CLI round-trip through files
+print("\n4. Command line")
+directory = tempfile.mkdtemp()
+source = os.path.join(directory, 'puzzles.jsonl')
+target = os.path.join(directory, 'scores.jsonl')
+with open(source, 'w') as f:
+    for record in records[:10]:
+        f.write(json.dumps(record) + "\n")
+    f.write("\n")
+    f.write("{not json\n")
+main([source, '-o', target, '--workers', '2', '--chunk-size', '3'])
+with open(target) as f:
+    lines = [json.loads(line) for line in f]
+assert lines[:10] == serial[:10]
+assert lines[10]['id'] is None and lines[10]['error'].startswith('JSONDecodeError')
+os.remove(source)
+os.remove(target)
+os.rmdir(directory)
+print("   [OK] JSONL in, JSONL out; an unparsable line becomes an error result")
+
+print("\n" + "=" * 80)
+print("Batch solver test complete!")
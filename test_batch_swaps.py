@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Test atomic batched swaps."""
+
+from family_solver import FamilySolver
+from web_game_state import WebGameState
+
+print("Testing Batched Swaps")
+print("=" * 80)
+
+
+def new_game():
+    game = WebGameState()
+    game.create_graph_from_edges([(1, 2), (2, 3), (3, 4), (4, 5)])
+    game.assign_tiles({1: 2, 2: 1, 3: 3, 4: 5, 5: 4})
+    return game
+
+
+# Test 1: A valid batch equals the same swaps sent one by one
+print("\n1. Valid batch")
+batch, single = new_game(), new_game()
+moves = [[2, 3], [3, 4], [3, 4], [2, 3]]
+result = batch.swap_tiles_batch(moves)
+for move in moves:
+    single.swap_tiles(*move)
+assert result['success'] and result['applied'] == 4 and not result['solved']
+assert batch.get_game_state(include_graph=False)['tiles'] == \
+    single.get_game_state(include_graph=False)['tiles']
+assert batch.move_count == single.move_count == 4
+assert batch.move_history == single.move_history
+assert set(result['changed_tiles']) == {'2', '3', '4'}
+print(f"   [OK] 4 moves in one call, changed tiles {sorted(result['changed_tiles'])}")
+
+# Test 2: The first invalid move rolls the whole batch back
+print("\n2. Atomic rollback")
+for bad_move, message in (([1, 3], 'Nodes are not connected'),
+                          ([1, 9], 'Invalid nodes'),
+                          (['a'], 'Malformed move'),
+                          ([[1], 2], 'Malformed move')):
+    game = new_game()
+    game.swap_tiles(4, 5)
+    game.undo_move()
+    before = (dict(game.graph.tiles), game.move_count, list(game.move_history),
+              list(game.redo_stack), game.state_version, game.bound_tracker.as_dict())
+    result = game.swap_tiles_batch([[2, 3], [3, 4], bad_move, [1, 2]])
+    assert not result['success'] and result['index'] == 2 and result['message'] == message
+    after = (dict(game.graph.tiles), game.move_count, list(game.move_history),
+             list(game.redo_stack), game.state_version, game.bound_tracker.as_dict())
+    assert after == before, message
+print("   [OK] Tiles, history, redo stack, bounds and version untouched")
+
+# Test 3: Solving mid-batch
+print("\n3. Solving")
+game = new_game()
+optimal = FamilySolver.solve(game.graph, game.initial_tiles).optimal_moves
+result = game.swap_tiles_batch([[1, 2], [4, 5]])
+assert result['success'] and result['solved'] and not result['active']
+assert result['move_count'] == optimal == 2
+print("   [OK] Batch that solves the puzzle ends the game")
+
+game = new_game()
+result = game.swap_tiles_batch([[1, 2], [4, 5], [1, 2]])
+assert not result['success'] and result['index'] == 2 and game.game_active
+assert not game.swap_tiles_batch([])['success']
+print("   [OK] Moves after the solve are rejected with the batch")
+
+print("\n" + "=" * 80)
+print("Batched swaps test complete!")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Test the frozen CSR view of Graph."""
+
+from graph import Graph
+
+print("Testing Compact Graph")
+print("=" * 80)
+
+graph = Graph()
+graph.add_edge(3, 1)
+graph.add_edge(1, 2)
+graph.add_edge(2, 3)
+graph.add_edge(3, 4)
+
+# Test 1: Dense indices and neighbor arrays
+print("\n1. CSR layout")
+compact = graph.compact()
+print(f"   Nodes: {compact.nodes}")
+print(f"   Offsets: {list(compact.offsets)}, targets: {list(compact.targets)}")
+assert compact.nodes == (1, 2, 3, 4)
+assert list(compact.neighbors(compact.index[3])) == [0, 1, 3]
+assert compact.degree(compact.index[4]) == 1
+assert compact.num_edges() == 4
+assert compact.are_connected(1, 3) and not compact.are_connected(1, 4)
+assert sorted(compact.edges()) == [(1, 2), (1, 3), (2, 3), (3, 4)]
+print("   [OK] Neighbors, degrees and edges match the adjacency list")
+
+# Test 2: Frozen and cached
+print("\n2. Immutability and caching")
+try:
+    compact.nodes = ()
+    assert False, "CompactGraph allowed assignment"
+except AttributeError:
+    pass
+assert graph.compact() is compact
+graph.add_edge(4, 5)
+assert graph.compact() is not compact
+assert graph.get_nodes() == [1, 2, 3, 4, 5]
+print("   [OK] View is frozen and rebuilt after add_edge")
+
+print("\n" + "=" * 80)
+print("Compact graph test complete!")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Test graph family detection and the closed-form family solvers."""
+
+import random
+import time
+from itertools import combinations
+
+from family_solver import FamilySolver
+from graph import Graph
+from score_calculator import ScoreCalculator
+
+print("Testing Family Solver")
+print("=" * 80)
+
+random.seed(12)
+
+
+def build(edges):
+    """Graph from an edge list."""
+    graph = Graph()
+    for node1, node2 in edges:
+        graph.add_edge(node1, node2)
+    return graph
+
+
+def path_graph(n):
+    labels = random.sample(range(1, 10 * n), n)
+    return build(zip(labels, labels[1:]))
+
+
+def star_graph(n):
+    return build((1, i) for i in range(2, n + 1))
+
+
+def cycle_graph(n):
+    labels = random.sample(range(1, 10 * n), n)
+    return build(zip(labels, labels[1:] + labels[:1]))
+
+
+def complete_graph(n):
+    return build((i, j) for i in range(1, n + 1) for j in range(i + 1, n + 1))
+
+
+def shuffled_tiles(graph):
+    nodes = graph.get_nodes()
+    tiles = nodes[:]
+    random.shuffle(tiles)
+    return dict(zip(nodes, tiles))
+
+
+# Test 1: Detection
+print("\n1. Family detection")
+assert path_graph(6).family() == 'path'
+assert star_graph(6).family() == 'star'
+assert cycle_graph(6).family() == 'cycle'
+assert complete_graph(5).family() == 'complete'
+assert build([(1, 2), (2, 3), (3, 1)]).family() == 'complete'
+assert build([(1, 2), (2, 3), (3, 4), (4, 1), (1, 3)]).family() is None
+assert build([(1, 2), (2, 3), (4, 5), (5, 6), (6, 4)]).family() is None  # Disconnected
+graph = path_graph(5)
+graph.add_edge(graph.get_nodes()[0], 999)
+graph.add_edge(graph.get_nodes()[1], 998)
+assert graph.family() is None  # Cache reset by add_edge
+print("   [OK] Paths, stars, cycles and complete graphs recognised")
+
+# Test 2: Closed forms agree with exact search
+print("\n2. Closed forms against IDA* (160 puzzles, 4-8 nodes)")
+for make in (path_graph, star_graph, cycle_graph, complete_graph):
+    for trial in range(40):
+        graph = make(random.randint(4, 8))
+        tiles = shuffled_tiles(graph)
+        result = FamilySolver.solve(graph, tiles)
+        expected = ScoreCalculator.solve(graph, tiles, time_budget=10.0, strategy='ida_star')
+        assert expected.exact
+        assert result.exact and result.optimal_moves == expected.optimal_moves, \
+            f"{make.__name__} trial {trial}"
+    print(f"   [OK] {make.__name__.replace('_graph', '')} formula is exact")
+
+# Test 3: Large instances are instant
+print("\n3. Large families")
+for make, n in [(path_graph, 5000), (star_graph, 5000), (complete_graph, 300)]:
+    graph = make(n)
+    tiles = shuffled_tiles(graph)
+    start = time.perf_counter()
+    result = FamilySolver.solve(graph, tiles)
+    elapsed = time.perf_counter() - start
+    assert result.exact and result.strategy == graph.family()
+    print(f"   {graph.family()} with {n} nodes: {result.optimal_moves} moves in {elapsed:.3f}s")
+    assert elapsed < 1.0
+graph = cycle_graph(1000)
+tiles = shuffled_tiles(graph)
+start = time.perf_counter()
+result = FamilySolver.solve(graph, tiles)
+elapsed = time.perf_counter() - start
+assert result.exact and result.strategy == 'cycle'
+print(f"   cycle with 1000 nodes: {result.optimal_moves} moves in {elapsed:.3f}s")
+assert elapsed < 1.0
+
+
+def cycle_by_enumeration(graph, tiles):
+    """Try every choice of which tiles travel backwards around the ring."""
+    order = FamilySolver._walk(graph)
+    n = len(order)
+    position = {node: i for i, node in enumerate(order)}
+    steps = [(position[tiles[node]] - i) % n for i, node in enumerate(order)]
+    best = None
+    for chosen in combinations([i for i in range(n) if steps[i]], sum(steps) // n):
+        targets = [i + steps[i] - (n if i in chosen else 0) for i in range(n)]
+        crossings = sum(abs((targets[j] - targets[i]) // n)
+                        for i in range(n) for j in range(i + 1, n))
+        best = crossings if best is None else min(best, crossings)
+    return best
+
+
+for n in range(9, 14):
+    graph = cycle_graph(n)
+    for _ in range(20):
+        tiles = shuffled_tiles(graph)
+        assert FamilySolver.solve(graph, tiles).optimal_moves == cycle_by_enumeration(graph, tiles)
+print("   [OK] Large instances solved instantly; cycles match exhaustive enumeration")
+
+# Test 4: ScoreCalculator dispatches to the family solver by default
+print("\n4. ScoreCalculator dispatch")
+graph = path_graph(18)
+result = ScoreCalculator.solve(graph, shuffled_tiles(graph))
+assert result.strategy == 'path' and result.exact
+print("   [OK] Default scoring uses the closed form")
+
+graph = path_graph(6)
+tiles = shuffled_tiles(graph)
+default = ScoreCalculator.solve(graph, tiles, 1.0)
+explicit = ScoreCalculator.solve(graph, tiles, 1.0, strategy='approximation')
+assert default.strategy == 'path'
+assert explicit.strategy != 'path' and explicit.moves is not None
+assert ScoreCalculator.solve(graph, tiles, 1.0, strategy='approximation') is explicit
+assert ScoreCalculator.solve(graph, tiles, 1.0) is default
+print("   [OK] An explicit strategy bypasses the cached family result")
+
+print("\n" + "=" * 80)
+print("Family solver test complete!")
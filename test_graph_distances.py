@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Test the cached all-pairs distance matrix on Graph."""
+
+from graph import Graph
+
+print("Testing Graph Distances")
+print("=" * 80)
+
+# Test 1: Distances on a path
+print("\n1. Path graph 1-2-3-4")
+graph = Graph()
+graph.add_edge(1, 2)
+graph.add_edge(2, 3)
+graph.add_edge(3, 4)
+print(f"   distance(1, 4) = {graph.distance(1, 4)}")
+print(f"   eccentricity(1) = {graph.eccentricity(1)}, eccentricity(2) = {graph.eccentricity(2)}")
+assert graph.distance(1, 4) == 3
+assert graph.distance(4, 1) == 3
+assert graph.distance(2, 2) == 0
+assert graph.eccentricity(1) == 3
+assert graph.eccentricity(2) == 2
+print("   [OK] Distances and eccentricities correct")
+
+# Test 2: Matrix is cached until add_edge
+print("\n2. Cache invalidation")
+_, first = graph.distance_matrix()
+assert graph.distance_matrix_size() == first.itemsize * len(first) > 0
+_, second = graph.distance_matrix()
+assert first is second
+graph.add_edge(1, 4)
+assert graph.distance_matrix_size() == 0  # Dropped until asked for again
+print(f"   After adding edge 1-4: distance(1, 4) = {graph.distance(1, 4)}")
+assert graph.distance(1, 4) == 1
+assert graph.eccentricity(1) == 2
+print("   [OK] Matrix rebuilt after add_edge")
+
+print("\n" + "=" * 80)
+print("Graph distance test complete!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test the hint engine and WebGameState.get_hint()."""
+
+import random
+import threading
+import time
+
+from hint_engine import HintEngine
+from score_calculator import ScoreCalculator
+from web_game_state import WebGameState
+
+print("Testing Hint Engine")
+print("=" * 80)
+
+# Test 1: Following hints solves small puzzles optimally
+print("\n1. Following exact hints on 8-node graphs")
+random.seed(21)
+for trial in range(20):
+    game = WebGameState()
+    game.create_random_graph(8, 11)
+    game.assign_tiles_randomly()
+    assert game.optimal_exact
+
+    while game.game_active:
+        hint = game.get_hint()
+        assert hint['success'] and hint['exact']
+        assert game.swap_tiles(hint['node1'], hint['node2'])['success']
+
+    assert game.move_count == game.optimal_moves, f"trial {trial}"
+print("   [OK] 20 puzzles solved in exactly the optimal number of moves")
+
+# Test 2: Latency on the largest normal graphs
+print("\n2. Hint latency on 20-node graphs")
+ScoreCalculator.DEFAULT_TIME_BUDGET = 0.05  # Only the hint timing matters here
+timings = []
+for trial in range(30):
+    game = WebGameState()
+    game.create_random_graph(20, 28)
+    game.assign_tiles_randomly()
+    start = time.perf_counter()
+    hint = game.get_hint()
+    timings.append(time.perf_counter() - start)
+    assert hint['success']
+    assert game.graph.are_connected(hint['node1'], hint['node2'])
+timings.sort()
+print(f"   Slowest hint: {timings[-1] * 1000:.1f} ms")
+assert timings[-1] < 0.1
+print("   [OK] Hints are valid edges and stay within the latency budget")
+
+# Dense graphs make every expansion try many edges; the deadline must still hold
+for num_edges in (100, 180):
+    timings = []
+    for trial in range(10):
+        game = WebGameState()
+        game.create_random_graph(20, num_edges)
+        game.assign_tiles_randomly()
+        game.get_hint()  # warm the shared solver and distance matrix
+        game.assign_tiles_randomly()
+        start = time.perf_counter()
+        hint = game.get_hint()
+        timings.append(time.perf_counter() - start)
+        assert hint['success']
+    print(f"   {num_edges} edges: slowest hint {max(timings) * 1000:.1f} ms")
+    assert max(timings) < 0.05
+print("   [OK] Dense 20-node graphs stay under 50 ms")
+
+# Test 3: No hint once solved
+print("\n3. Solved puzzle")
+game = WebGameState()
+game.create_random_graph(5, 6)
+game.assign_tiles_randomly()
+game.game_active = False
+assert not game.get_hint()['success']
+print("   [OK] Inactive game returns no hint")
+
+# Test 4: Searches run outside the per-graph lock
+print("\n4. Concurrent hints")
+game = WebGameState()
+game.create_random_graph(8, 11)
+game.assign_tiles_randomly()
+entry = HintEngine(game.graph).entry
+entry['plans'].clear()
+pooled = entry['solvers'][0]
+original_solve = pooled.solve
+held = []
+
+
+def checked_solve(tiles):
+    held.append(entry['lock'].locked())
+    return original_solve(tiles)
+
+
+pooled.solve = checked_solve
+assert game.get_hint()['exact']
+assert held == [False]
+
+rng = random.Random(4)
+states = []
+for _ in range(8):
+    tiles = list(game.graph.tiles.values())
+    rng.shuffle(tiles)
+    states.append(dict(zip(game.graph.tiles, tiles)))
+hints = [None] * len(states)
+
+
+def hint_worker(i):
+    hints[i] = HintEngine(game.graph).suggest(states[i])
+
+
+threads = [threading.Thread(target=hint_worker, args=(i,)) for i in range(len(states))]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+for hint in hints:
+    assert hint is None or game.graph.are_connected(hint['node1'], hint['node2'])
+print(f"   [OK] Lock free during search, {len(entry['solvers'])} pooled solvers after 8 threads")
+
+print("\n" + "=" * 80)
+print("Hint engine test complete!")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Test the configurable node cap and large-graph mode."""
+
+import random
+import time
+
+from graph_builder import GraphBuilder
+from web_game_state import WebGameState
+
+print("Testing Large-Graph Mode")
+print("=" * 80)
+
+# Test 1: Default cap still rejects more than 20 nodes
+print("\n1. Default cap")
+assert GraphBuilder.create_random_with_params(21, 30) is None
+assert GraphBuilder.create_random_with_params(20, 30) is not None
+print("   [OK] 21 nodes rejected, 20 accepted")
+
+# Test 2: Large-graph mode generates exact edge counts quickly
+print("\n2. Large-graph mode")
+GraphBuilder.enable_large_graph_mode(2000)
+random.seed(7)
+for num_nodes, num_edges in ((2000, 6000), (200, 15000)):
+    start = time.time()
+    graph = GraphBuilder.create_random_with_params(num_nodes, num_edges)
+    elapsed = time.time() - start
+    edge_count = sum(len(n) for n in graph.adjacency_list.values()) // 2
+    print(f"   {num_nodes} nodes / {num_edges} edges in {elapsed:.3f}s")
+    assert edge_count == num_edges
+    assert graph.is_connected()
+print("   [OK] Sparse and dense generation hit the requested edge count")
+
+# Test 3: Large puzzles are scored with bounds and served as compact payloads
+print("\n3. Scoring and state payload for 2000 nodes")
+game = WebGameState()
+assert game.create_random_graph(2000, 5000)
+start = time.time()
+assert game.assign_tiles_randomly()
+print(f"   Scored in {time.time() - start:.3f}s: "
+      f"{game.optimal_lower_bound}-{game.optimal_moves} (exact: {game.optimal_exact})")
+state = game.get_game_state()
+assert state['compact'] and len(state['tile_list']) == 2000
+assert len(state['positions']) == 4000
+assert 'tiles' not in state
+print("   [OK] Bounds computed and payload uses parallel arrays")
+
+GraphBuilder.disable_large_graph_mode()
+assert GraphBuilder.create_random_with_params(21, 30) is None
+print("   [OK] Default cap restored")
+
+print("\n" + "=" * 80)
+print("Large-graph mode test complete!")
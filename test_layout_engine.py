@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Test the graph layout engine."""
+
+import time
+
+from graph import Graph
+from graph_builder import GraphBuilder
+from layout_engine import LayoutEngine, np
+from web_game_state import WebGameState
+
+print("Testing Layout Engine")
+print("=" * 80)
+print(f"NumPy {'available' if np is not None else 'not installed, using pure Python'}")
+
+
+def grid_graph(width):
+    graph = Graph()
+    for row in range(width):
+        for col in range(width):
+            node = row * width + col + 1
+            if col < width - 1:
+                graph.add_edge(node, node + 1)
+            if row < width - 1:
+                graph.add_edge(node, node + width)
+    return graph
+
+
+def crossings(graph, positions):
+    """Number of pairs of edges that cross."""
+    index = {node: i for i, node in enumerate(graph.get_nodes())}
+    edges = [(index[a], index[b]) for a, b in graph.compact().edges()]
+
+    def ccw(a, b, c):
+        return (c[1] - a[1]) * (b[0] - a[0]) > (b[1] - a[1]) * (c[0] - a[0])
+
+    count = 0
+    for i, (a, b) in enumerate(edges):
+        for c, d in edges[i + 1:]:
+            if len({a, b, c, d}) < 4:
+                continue
+            p, q, r, s = positions[a], positions[b], positions[c], positions[d]
+            if ccw(p, r, s) != ccw(q, r, s) and ccw(p, q, r) != ccw(p, q, s):
+                count += 1
+    return count
+
+
+# Test 1: Every method stays inside the margin box
+print("\n1. Layout bounds")
+graph = grid_graph(6)
+for method in ('circular', 'spectral', 'force'):
+    positions = LayoutEngine.layout(graph, method)
+    assert len(positions) == 36
+    assert all(0.1 - 1e-9 <= c <= 0.9 + 1e-9 for p in positions for c in p)
+    assert len({(round(x, 6), round(y, 6)) for x, y in positions}) == 36
+    print(f"   [OK] {method}: {crossings(graph, positions)} edge crossings on a 6x6 grid")
+
+try:
+    LayoutEngine.layout(graph, 'radial')
+    assert False, "Unknown method accepted"
+except ValueError:
+    print("   [OK] Unknown method rejected")
+
+# Test 2: Force-directed and spectral untangle what the circle tangles
+print("\n2. Fewer crossings than the circle")
+circle = crossings(graph, LayoutEngine.layout(graph, 'circular'))
+assert crossings(graph, LayoutEngine.layout(graph, 'force')) < circle / 4
+assert crossings(graph, LayoutEngine.layout(graph, 'spectral')) < circle / 4
+print(f"   [OK] Grid crossings down from {circle}")
+
+# Test 3: Auto choice, caching and determinism
+print("\n3. Auto method and caching")
+assert LayoutEngine.auto_method(6) == 'circular'
+assert LayoutEngine.auto_method(50) == 'force'
+assert LayoutEngine.auto_method(5000) == 'spectral'
+
+game = WebGameState()
+game.create_random_graph(6, 8)
+game.assign_tiles_randomly()
+circle = LayoutEngine.circular(6)
+state = game.get_game_state()
+assert [(p['x'], p['y']) for p in state['node_positions'].values()] == circle
+print("   [OK] Small games keep the circular layout")
+
+graph = grid_graph(12)
+start = time.time()
+first = LayoutEngine.layout(graph)
+elapsed = time.time() - start
+start = time.time()
+assert LayoutEngine.layout(graph) is first
+cached = time.time() - start
+assert LayoutEngine.layout(grid_graph(12)) is first
+print(f"   [OK] 144 nodes: {elapsed:.3f}s first, {cached * 1e6:.0f}us cached")
+
+LayoutEngine._cache.clear()
+assert LayoutEngine.layout(graph) == first
+print("   [OK] Layouts are deterministic")
+
+# Test 4: Large graphs
+print("\n4. Large graph")
+GraphBuilder.enable_large_graph_mode(2000)
+graph = GraphBuilder.create_random_with_params(1500, 2500, 7)
+start = time.time()
+positions = LayoutEngine.layout(graph)
+assert len(positions) == 1500
+print(f"   [OK] 1500 nodes laid out ({LayoutEngine.auto_method(1500)}) "
+      f"in {time.time() - start:.2f}s")
+
+print("\n" + "=" * 80)
+print("Layout engine test complete!")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Test delta leaderboard broadcasts against the full leaderboard."""
+
+import random
+
+from multiplayer import GameMode, GameRoom
+
+print("Testing Leaderboard Deltas")
+print("=" * 80)
+
+
+def apply_delta(board, version, delta):
+    """Client-side merge, mirroring MultiplayerClient.handleLeaderboardDelta."""
+    if delta['version'] != version + 1:
+        return None, version
+    players = {entry['session_id']: entry for entry in board}
+    for session_id in delta['removed']:
+        players.pop(session_id, None)
+    for entry in delta['entries']:
+        players[entry['session_id']] = entry
+
+    ordered = [None] * len(players)
+    for index, entry in enumerate(board):
+        if entry['session_id'] in players and entry['session_id'] not in delta['positions']:
+            ordered[index] = players[entry['session_id']]
+    for session_id, position in delta['positions'].items():
+        ordered[position] = players[session_id]
+    assert None not in ordered
+    return ordered, delta['version']
+
+
+def make_room(mode, count):
+    room = GameRoom(code='TILE-TEST', mode=mode)
+    for i in range(count):
+        room.add_player(f"s{i}", f"p{i}")
+    room.start_game([(1, 2)], {1: 2, 2: 1})
+    return room
+
+
+# Test 1: Deltas only carry changed players
+print("\n1. Delta contents")
+room = make_room(GameMode.REAL_TIME, 30)
+info = room.get_room_info(include_puzzle=False)
+assert info['leaderboard_version'] == 0
+
+room.update_player_progress('s5', 1, False)
+delta = room.get_leaderboard_delta()
+assert delta['version'] == 1
+assert [entry['session_id'] for entry in delta['entries']] == ['s5']
+assert delta['entries'][0]['moves'] == 1
+assert delta['removed'] == []
+print(f"   [OK] One move -> 1 entry, {len(delta['positions'])} position changes")
+
+delta = room.get_leaderboard_delta()
+assert delta['entries'] == [] and delta['positions'] == {}
+print("   [OK] Nothing changed -> empty delta")
+
+# Test 2: A client merging deltas stays identical to the full leaderboard
+print("\n2. Merged deltas match the full leaderboard")
+rng = random.Random(3)
+for mode in (GameMode.REAL_TIME, GameMode.TURN_BASED):
+    room = make_room(mode, 12)
+    info = room.get_room_info(include_puzzle=False)
+    board, version = info['leaderboard'], info['leaderboard_version']
+    moves = {f"s{i}": 0 for i in range(12)}
+
+    for step in range(300):
+        if mode == GameMode.TURN_BASED:
+            session_id = room.turn_order[room.current_turn_index]
+        else:
+            session_id = rng.choice(sorted(room.players))
+        moves[session_id] += 1
+        room.update_player_progress(session_id, moves[session_id], rng.random() < 0.02)
+        if mode == GameMode.TURN_BASED:
+            room.next_turn()
+        if step == 150:
+            room.remove_player('s7')
+
+        board, version = apply_delta(board, version, room.get_leaderboard_delta())
+        assert board == room.get_leaderboard(), f"diverged at step {step}"
+    print(f"   [OK] {mode.value}: 300 deltas merged without divergence")
+
+# Test 3: Snapshots are due periodically and reset the delta count
+print("\n3. Periodic snapshots")
+room = make_room(GameMode.REAL_TIME, 4)
+assert room.snapshot_due()  # nothing sent yet
+snapshot = room.get_leaderboard_snapshot()
+assert snapshot['leaderboard_version'] == 1
+assert 'graph_edges' not in snapshot and 'puzzle_seed' not in snapshot
+assert not room.snapshot_due()
+
+for i in range(GameRoom.SNAPSHOT_EVERY_DELTAS):
+    room.update_player_progress('s0', i + 1, False)
+    room.get_leaderboard_delta()
+assert room.snapshot_due()
+print(f"   [OK] Snapshot due after {GameRoom.SNAPSHOT_EVERY_DELTAS} deltas")
+
+room.get_leaderboard_snapshot()
+room.last_snapshot_at -= GameRoom.SNAPSHOT_INTERVAL
+assert room.snapshot_due()
+print(f"   [OK] Snapshot due after {GameRoom.SNAPSHOT_INTERVAL}s")
+
+# Test 4: A missed delta is detected by the version gap
+print("\n4. Version gaps")
+room = make_room(GameMode.REAL_TIME, 3)
+info = room.get_room_info(include_puzzle=False)
+room.update_player_progress('s1', 1, False)
+room.get_leaderboard_delta()  # lost in transit
+room.update_player_progress('s2', 1, False)
+board, version = apply_delta(info['leaderboard'], info['leaderboard_version'],
+                             room.get_leaderboard_delta())
+assert board is None
+print("   [OK] Client detects the gap and must request a resync")
+
+# Test 5: Full boards sent on leave/rename become the new delta baseline
+print("\n5. Baseline after room-wide full boards")
+room = make_room(GameMode.REAL_TIME, 6)
+for i in range(6):
+    room.update_player_progress(f"s{i}", 6 - i, False)
+room.remove_player('s3')
+info = room.get_leaderboard_snapshot()  # player_left
+room.change_player_name('s4', 'renamed')
+info = room.get_leaderboard_snapshot()  # player_name_changed
+board, version = info['leaderboard'], info['leaderboard_version']
+
+room.update_player_progress('s5', 7, False)
+delta = room.get_leaderboard_delta()
+assert delta['removed'] == [] and [e['session_id'] for e in delta['entries']] == ['s5']
+board, version = apply_delta(board, version, delta)
+assert board == room.get_leaderboard()
+print("   [OK] Next delta applies cleanly and only carries the new change")
+
+print("\n" + "=" * 80)
+print("Leaderboard delta test complete!")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Test the graph-aware optimal solver against brute force on small graphs."""
+
+import random
+from collections import deque
+
+from graph import Graph
+from graph_builder import GraphBuilder
+from optimal_solver import OptimalSolver
+from ida_star_solver import IDAStarSolver
+from score_calculator import ScoreCalculator
+
+
+def brute_force(graph, tiles):
+    """Plain single-direction BFS over tile configurations."""
+    nodes = graph.get_nodes()
+    start = tuple(tiles[n] for n in nodes)
+    goal = tuple(nodes)
+    index = {n: i for i, n in enumerate(nodes)}
+    edges = [(index[a], index[b]) for a in nodes for b in graph.get_neighbors(a) if a < b]
+    seen = {start: 0}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if state == goal:
+            return seen[state]
+        for i, j in edges:
+            child = list(state)
+            child[i], child[j] = child[j], child[i]
+            child = tuple(child)
+            if child not in seen:
+                seen[child] = seen[state] + 1
+                queue.append(child)
+
+
+def apply_moves(graph, tiles, moves):
+    """Replay a move list, checking every swap is along an edge."""
+    tiles = dict(tiles)
+    for node1, node2 in moves:
+        assert graph.are_connected(node1, node2), f"{node1}-{node2} is not an edge"
+        tiles[node1], tiles[node2] = tiles[node2], tiles[node1]
+    return tiles
+
+
+print("Testing Optimal Solver")
+print("=" * 80)
+
+# Test 1: Path graph where cycle decomposition underestimates
+print("\n1. Path graph 1-2-3 with tiles 1 and 3 swapped")
+path = Graph()
+path.add_edge(1, 2)
+path.add_edge(2, 3)
+tiles = {1: 3, 2: 2, 3: 1}
+result = ScoreCalculator.solve(path, tiles)
+print(f"   Cycle decomposition: {ScoreCalculator.calculate_optimal_moves(tiles)}")
+print(f"   Graph-aware optimum: {result.optimal_moves} (exact: {result.exact})")
+assert ScoreCalculator.calculate_optimal_moves(tiles) == 1
+assert result.optimal_moves == 3 and result.exact
+assert ScoreCalculator.calculate_optimal_moves(tiles, graph=path) == 3
+print("   [OK] Path graph solved exactly")
+
+# Test 2: Random sparse graphs against brute force
+print("\n2. Random sparse graphs against brute force")
+random.seed(415)
+for trial in range(40):
+    num_nodes = random.randint(2, 7)
+    max_edges = num_nodes * (num_nodes - 1) // 2
+    num_edges = min(max_edges, num_nodes - 1 + random.randint(0, 2))
+    graph = GraphBuilder.create_random_with_params(num_nodes, num_edges)
+    nodes = graph.get_nodes()
+    shuffled = nodes.copy()
+    random.shuffle(shuffled)
+    tiles = dict(zip(nodes, shuffled))
+
+    expected = brute_force(graph, tiles)
+    for solver in (OptimalSolver(graph, time_budget=5.0), IDAStarSolver(graph, time_budget=5.0)):
+        result = solver.solve(tiles)
+        assert result.exact, f"trial {trial} did not finish"
+        assert result.optimal_moves == expected, f"trial {trial}: {result.optimal_moves} != {expected}"
+        assert len(result.moves) == expected
+        assert apply_moves(graph, tiles, result.moves) == {n: n for n in nodes}
+print("   [OK] 40 random graphs match brute force (bidirectional BFS and IDA*)")
+
+# Test 3: Time budget fallback reports bounds
+print("\n3. Zero time budget on a 20-node path")
+big = Graph()
+for i in range(1, 20):
+    big.add_edge(i, i + 1)
+nodes = big.get_nodes()
+tiles = dict(zip(nodes, reversed(nodes)))
+result = OptimalSolver(big, time_budget=0.0).solve(tiles)
+print(f"   Exact: {result.exact}, range: {result.lower_bound}-{result.upper_bound}")
+assert not result.exact
+assert result.lower_bound <= result.upper_bound == result.optimal_moves
+assert apply_moves(big, tiles, result.moves) == {n: n for n in nodes}
+print("   [OK] Fallback returns a valid solution and bounds")
+
+# Test 4: Strategy selection and expansion counts
+print("\n4. Selecting the IDA* strategy through ScoreCalculator")
+ring = Graph()
+for i in range(1, 11):
+    ring.add_edge(i, i % 10 + 1)
+tiles = {i: (i + 4) % 10 + 1 for i in range(1, 11)}
+result = ScoreCalculator.solve(ring, tiles, time_budget=5.0, strategy='ida_star')
+print(f"   Optimum: {result.optimal_moves}, nodes expanded: {result.nodes_expanded}")
+assert result.exact and result.strategy in ('ida_star', 'bounds')
+assert result.optimal_moves == ScoreCalculator.solve(ring, tiles, 5.0, 'bidirectional').optimal_moves
+try:
+    ScoreCalculator.solve(ring, tiles, strategy='magic')
+    assert False, "unknown strategy accepted"
+except ValueError:
+    pass
+print("   [OK] Strategies agree and unknown strategies are rejected")
+
+print("\n" + "=" * 80)
+print("Optimal solver test complete!")
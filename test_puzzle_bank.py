@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Test the pre-scored puzzle bank."""
+
+import os
+import random
+import tempfile
+import threading
+import time
+
+from graph import Graph
+from puzzle_bank import PuzzleBank
+from score_calculator import ScoreCalculator
+from web_game_state import WebGameState
+
+print("Testing Puzzle Bank")
+print("=" * 80)
+
+random.seed(14)
+fd, db_path = tempfile.mkstemp(suffix=".db")
+os.close(fd)
+
+try:
+    # Test 1: Synchronous refill and take
+    print("\n1. Refill and take")
+    bank = PuzzleBank(db_path, stock=5, buckets=[(8, 16, None)])
+    assert bank.take(8, 16) is None  # Configured but not stocked yet
+    assert bank.add_bucket(8, 16, 'hard')
+    assert not bank.add_bucket(8, 100)
+    assert not bank.add_bucket(8, 16, 'impossible')
+    assert bank.refill() == 10
+    assert bank.count(8, 16) == 5 and bank.count(8, 16, 'hard') == 5
+
+    puzzle = bank.take(8, 16)
+    assert len(puzzle['edges']) == 16
+    assert sorted(puzzle['tiles']) == sorted(puzzle['tiles'].values()) == list(range(1, 9))
+    assert puzzle['tiles'] != {node: node for node in range(1, 9)}
+    graph = Graph()
+    for node1, node2 in puzzle['edges']:
+        graph.add_edge(node1, node2)
+    expected = ScoreCalculator.solve(graph, puzzle['tiles'])
+    assert puzzle['result'].optimal_moves == expected.optimal_moves
+    assert bank.count(8, 16) == 4
+    print("   [OK] Buckets stock to the target and serve scored puzzles once")
+
+    # Test 2: Stock survives a restart; only configured buckets are served
+    print("\n2. Persistence and configured buckets")
+    reopened = PuzzleBank(db_path, stock=5, buckets=[(8, 16, None), (8, 16, 'hard')])
+    assert reopened.count(8, 16, 'hard') == 5
+    assert PuzzleBank(db_path, stock=5).take(8, 16, 'hard') is None
+    assert reopened.take(7, 12) is None and (7, 12, None) not in reopened.buckets
+    assert reopened.refill() == 1 and reopened.count(8, 16) == 5  # Only the taken one
+    print("   [OK] Stock reloads from SQLite; unconfigured requests register nothing")
+
+    # Test 3: Background worker keeps buckets stocked
+    print("\n3. Refill worker")
+    reopened.start_refill_worker()
+    for _ in range(3):
+        reopened.take(8, 16)
+    reopened.add_bucket(6, 11, 'easy')  # New bucket
+    deadline = time.time() + 10
+    while time.time() < deadline and (reopened.count(8, 16) < 5 or reopened.count(6, 11, 'easy') < 5):
+        time.sleep(0.05)
+    reopened.stop_refill_worker()
+    assert reopened.count(8, 16) == 5 and reopened.count(6, 11, 'easy') == 5
+    print("   [OK] Taken puzzles and new buckets are restocked in the background")
+
+    # Test 4: Serving a game skips scoring on the request path
+    print("\n4. WebGameState.start_from_bank")
+    game = WebGameState()
+    start = time.perf_counter()
+    assert game.start_from_bank(reopened, 8, 16, 'hard')
+    elapsed = time.perf_counter() - start
+    assert game.game_active and game.optimal_moves > 0
+    assert len(game.graph.get_nodes()) == 8
+    assert not game.start_from_bank(reopened, 8, 16, 5)  # Exact targets aren't banked
+    print(f"   Served in {elapsed * 1000:.1f} ms")
+    print("   [OK] Banked puzzle started with its stored score")
+
+    # Test 5: Separate connections (as in separate worker processes) never
+    # serve the same puzzle twice
+    print("\n5. Concurrent takers")
+    stocked = reopened.count(8, 16)
+    served = []
+
+    def taker():
+        bank = PuzzleBank(db_path, buckets=[(8, 16, None)])
+        while True:
+            puzzle = bank.take(8, 16)
+            if puzzle is None:
+                return
+            served.append(tuple(sorted(puzzle['tiles'].items())) + tuple(puzzle['edges']))
+
+    threads = [threading.Thread(target=taker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(served) == stocked == len(set(served))
+    assert reopened.count(8, 16) == 0
+    print(f"   [OK] {stocked} puzzles served exactly once across 4 connections")
+finally:
+    os.remove(db_path)
+
+print("\n" + "=" * 80)
+print("Puzzle bank test complete!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test difficulty-targeted puzzle generation."""
+
+import random
+import time
+
+from graph_builder import GraphBuilder
+from puzzle_generator import PuzzleGenerator
+from score_calculator import ScoreCalculator
+from solution_bounds import SolutionBounds
+from web_game_state import WebGameState
+
+print("Testing Puzzle Generator")
+print("=" * 80)
+
+random.seed(13)
+
+# Test 1: Exact move-count targets
+print("\n1. Exact optimal move counts on 10-node graphs")
+start = time.perf_counter()
+hits = 0
+for trial in range(30):
+    graph = GraphBuilder.create_random_with_params(10, 14)
+    target = random.randint(1, 8)
+    tiles = PuzzleGenerator.generate(graph, target)
+    assert sorted(tiles) == sorted(tiles.values()) == graph.get_nodes()
+    assert graph.tiles == {}, "generator must not leave tiles on the graph"
+    result = ScoreCalculator.solve(graph, tiles)
+    hits += result.exact and result.optimal_moves == target
+elapsed = time.perf_counter() - start
+print(f"   {hits}/30 targets hit exactly in {elapsed:.2f}s")
+assert hits == 30
+print("   [OK] Generated puzzles have exactly the requested optimum")
+
+# Test 2: Lower-bound bands and named levels
+print("\n2. Bands and levels")
+graph = GraphBuilder.create_random_with_params(15, 20)
+for band in [(3, 5), (8, 10), (12, None)]:
+    tiles = PuzzleGenerator.generate(graph, band)
+    bound = SolutionBounds.lower_bound(graph, tiles)
+    assert band[0] <= bound and (band[1] is None or bound <= band[1]), (band, bound)
+bounds = {}
+for level in ('easy', 'medium', 'hard'):
+    low, high = PuzzleGenerator.band(graph, level)
+    tiles = PuzzleGenerator.generate(graph, level)
+    bounds[level] = SolutionBounds.lower_bound(graph, tiles)
+print(f"   Lower bounds by level: {bounds}")
+assert bounds['easy'] < bounds['medium'] < bounds['hard']
+print("   [OK] Bands are respected and levels are ordered")
+
+# Test 3: Bad difficulty values
+print("\n3. Invalid difficulty")
+for bad in ('impossible', (5, 2), 'x', True, 0):
+    try:
+        PuzzleGenerator.generate(graph, bad)
+        assert False, f"{bad!r} accepted"
+    except ValueError:
+        pass
+print("   [OK] Rejected with ValueError")
+
+# Test 4: WebGameState integration
+print("\n4. WebGameState.assign_tiles_randomly(difficulty)")
+game = WebGameState()
+game.create_random_graph(8, 11)
+assert game.assign_tiles_randomly(5)
+assert game.optimal_moves == 5 and game.optimal_exact and game.game_active
+assert game.assign_tiles_randomly('easy')
+assert game.assign_tiles_randomly()
+print("   [OK] Games start with the requested difficulty")
+
+print("\n" + "=" * 80)
+print("Puzzle generator test complete!")
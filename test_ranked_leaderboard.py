@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Test the incrementally maintained GameRoom leaderboard."""
+
+import random
+
+from multiplayer import GameMode, GameRoom, RoomState
+
+print("Testing Ranked Leaderboard")
+print("=" * 80)
+
+
+def brute_force_order(room):
+    """Leaderboard order by a full sort, as GameRoom used to compute it."""
+    return sorted(room.players, key=lambda sid: (GameRoom._leaderboard_key(room.players[sid]),
+                                                 room.join_order[sid]))
+
+
+# Test 1: Ready counter
+print("\n1. Ready tracking")
+room = GameRoom(code='TILE-TEST', mode=GameMode.REAL_TIME)
+assert not room.all_players_ready()
+for i in range(5):
+    room.add_player(f"s{i}", f"p{i}")
+for i in range(5):
+    assert not room.all_players_ready()
+    room.set_player_ready(f"s{i}", True)
+    room.set_player_ready(f"s{i}", True)  # repeated toggles count once
+assert room.ready_count == 5 and room.all_players_ready()
+room.set_player_ready('s2', False)
+assert not room.all_players_ready()
+room.remove_player('s2')
+assert room.all_players_ready()
+room.add_player('s9', '')
+assert not room.all_players_ready()
+print("   [OK] ready_count follows toggles, joins and leaves")
+
+# Test 2: Random play keeps the ranking equal to a full sort
+print("\n2. Ranking matches a full sort")
+rng = random.Random(11)
+room = GameRoom(code='TILE-TEST', mode=GameMode.REAL_TIME)
+for i in range(30):
+    room.add_player(f"s{i}", f"p{i}")
+room.start_game([(1, 2)], {1: 2, 2: 1})
+moves = {sid: 0 for sid in room.players}
+
+for step in range(2000):
+    if room.state != RoomState.PLAYING:
+        break
+    sid = rng.choice(sorted(room.players))
+    moves[sid] += rng.randint(0, 2)
+    room.update_player_progress(sid, moves[sid], rng.random() < 0.01)
+    if step % 400 == 399:
+        room.remove_player(rng.choice(sorted(room.players)))
+
+    order = brute_force_order(room)
+    assert [entry['session_id'] for entry in room.get_leaderboard()] == order
+    assert room.get_position(order[-1]) == len(order) - 1
+    assert room.finished_count == sum(1 for p in room.players.values() if p.solved)
+print(f"   [OK] {step + 1} updates, {room.finished_count} finished, order always matches")
+
+top = room.get_top_players(3)
+assert [entry['session_id'] for entry in top] == brute_force_order(room)[:3]
+assert room.get_position('nobody') is None
+print("   [OK] get_top_players and get_position")
+
+# Test 3: Finish ranks and end of game
+print("\n3. Finish ranks")
+room = GameRoom(code='TILE-TEST', mode=GameMode.REAL_TIME)
+for i in range(3):
+    room.add_player(f"s{i}", f"p{i}")
+room.start_game([(1, 2)], {1: 2, 2: 1})
+room.update_player_progress('s2', 9, True)
+room.update_player_progress('s2', 9, True)  # a second report does not re-rank
+room.update_player_progress('s0', 4, True)
+assert room.players['s2'].finish_rank == 1 and room.players['s0'].finish_rank == 2
+assert room.get_position('s2') == 0 and room.get_position('s1') == 2
+assert room.state == RoomState.PLAYING
+room.update_player_progress('s1', 20, True)
+assert room.state == RoomState.FINISHED
+print("   [OK] Ranks assigned in finishing order, game ends when all finish")
+
+print("\n" + "=" * 80)
+print("Ranked leaderboard test complete!")
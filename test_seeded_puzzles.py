@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test reproducible seeded puzzle generation."""
+
+import json
+import random
+
+from graph_builder import GraphBuilder
+from multiplayer import GameMode, GameRoom
+from tile_manager import TileManager
+from web_game_state import WebGameState
+
+print("Testing Seeded Puzzles")
+print("=" * 80)
+
+
+def edge_list(graph):
+    return list(graph.compact().edges())
+
+
+# Test 1: GraphBuilder and TileManager are reproducible from a seed
+print("\n1. Same seed, same puzzle")
+for seed in (0, 7, 123456789):
+    graph_a = GraphBuilder.create_random_with_params(12, 20, seed)
+    random.random()  # Shared generator state must not matter
+    graph_b = GraphBuilder.create_random_with_params(12, 20, seed)
+    assert edge_list(graph_a) == edge_list(graph_b)
+    TileManager(graph_a).assign_tiles_randomly(seed)
+    TileManager(graph_b).assign_tiles_randomly(seed)
+    assert graph_a.tiles == graph_b.tiles
+assert edge_list(GraphBuilder.create_random_with_params(12, 20, 1)) != \
+    edge_list(GraphBuilder.create_random_with_params(12, 20, 2))
+
+state = random.getstate()
+GraphBuilder.create_random_with_params(15, 40, 99)
+assert random.getstate() == state
+print("   [OK] Private generators reproduce graphs and tiles")
+
+# Test 2: WebGameState replays a puzzle from its descriptor
+print("\n2. Regenerating games from puzzle_seed")
+for difficulty in (None, 'medium', (4, 6)):
+    game = WebGameState()
+    game.create_random_graph(10)
+    game.assign_tiles_randomly(difficulty)
+    descriptor = json.loads(json.dumps(game.puzzle_seed))  # As sent to a client
+
+    replay = WebGameState()
+    assert replay.create_seeded_game(descriptor)
+    assert edge_list(replay.graph) == edge_list(game.graph)
+    assert replay.graph.tiles == game.graph.tiles
+    assert replay.optimal_moves == game.optimal_moves
+print("   [OK] Uniform, level and band puzzles replay exactly")
+
+game = WebGameState()
+game.create_random_graph(8)
+game.assign_tiles_randomly(4)
+assert game.puzzle_seed is None
+game.create_random_graph(8)
+game.assign_tiles({node: node % 8 + 1 for node in game.graph.get_nodes()})
+assert game.puzzle_seed is None
+print("   [OK] Exact targets and explicit tiles are not marked replayable")
+
+# Test 3: Saves carry the seed instead of the graph
+print("\n3. Save and load")
+game = WebGameState()
+game.create_random_graph(9)
+game.assign_tiles_randomly()
+node1, node2 = edge_list(game.graph)[0]
+game.swap_tiles(node1, node2)
+save_data = json.loads(json.dumps(game.save_game()))
+assert 'puzzle_seed' in save_data and 'edges' not in save_data
+
+loaded = WebGameState()
+assert loaded.load_game(save_data)
+assert edge_list(loaded.graph) == edge_list(game.graph)
+assert loaded.graph.tiles == game.graph.tiles
+assert loaded.initial_tiles == game.initial_tiles and loaded.move_count == 1
+assert loaded.puzzle_seed == game.puzzle_seed
+print("   [OK] Seeded save round-trips without storing edges")
+
+# Test 4: Rooms only ship the seed, and only when asked
+print("\n4. Room payloads")
+room = GameRoom(code='TILE-TEST', mode=GameMode.REAL_TIME)
+room.add_player('host', 'Host')
+room.start_game(edge_list(game.graph), dict(game.initial_tiles), dict(game.puzzle_seed))
+info = room.get_room_info()
+assert info['puzzle_seed'] == game.puzzle_seed and 'graph_edges' not in info
+update = room.get_room_info(include_puzzle=False)
+assert 'puzzle_seed' not in update and 'initial_tiles' not in update
+room.puzzle_seed = None
+assert room.get_room_info()['graph_edges']
+print(f"   Full graph payload {len(json.dumps(room.get_room_info()))} bytes, "
+      f"leaderboard update {len(json.dumps(update))} bytes")
+print("   [OK] Seeded rooms send the seed; updates send no puzzle at all")
+
+print("\n" + "=" * 80)
+print("Seeded puzzles test complete!")
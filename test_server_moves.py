@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Test server-side validation of multiplayer moves."""
+
+import contextlib
+import io
+import pickle
+import random
+
+from multiplayer import GameMode, GameRoom, RoomState
+from web_game_state import WebGameState
+
+print("Testing Server-Side Multiplayer Moves")
+print("=" * 80)
+
+
+def new_room(mode, game, players=3):
+    room = GameRoom(code='TILE-TEST', mode=mode)
+    for i in range(players):
+        room.add_player(f"s{i}", f"p{i}")
+    edges = [(node, neighbor) for node in game.graph.get_nodes()
+             for neighbor in game.graph.get_neighbors(node) if node < neighbor]
+    room.start_game(edges, game.graph.tiles.copy())
+    return room
+
+
+def board(room, session_id):
+    """A player's server-side board as a node -> tile dict."""
+    nodes = room.graph.nodes
+    return {nodes[i]: nodes[tile] for i, tile in enumerate(room.players[session_id].tiles)}
+
+
+# Test 1: Random valid moves track a single-player game exactly
+print("\n1. Boards match WebGameState")
+rng = random.Random(3)
+game = WebGameState()
+game.create_random_graph(num_nodes=9, seed=5)
+game.assign_tiles_randomly()
+room = new_room(GameMode.REAL_TIME, game)
+assert room.players['s0'].misplaced == game.tile_manager.tiles_remaining()
+
+edges = list(room.graph.edges())
+for step in range(300):
+    if not game.game_active:
+        break
+    node1, node2 = rng.choice(edges)
+    expected = game.swap_tiles(node1, node2)
+    result = room.apply_move('s0', node1, node2)
+    assert result['success']
+    assert result['changed_tiles'] == expected['changed_tiles']
+    assert result['tiles_remaining'] == expected['tiles_remaining']
+    assert result['moves'] == game.move_count == room.players['s0'].moves
+    assert result['solved'] == expected['solved']
+    assert board(room, 's0') == game.graph.tiles
+assert room.players['s1'].moves == 0 and board(room, 's1') != board(room, 's0')
+print(f"   [OK] {step + 1} moves, tiles, counts and solved status agree")
+
+# Test 2: Invalid moves are rejected without changing anything
+print("\n2. Rejected moves")
+game = WebGameState()
+game.create_graph_from_edges([(1, 2), (2, 3), (3, 4)])
+game.assign_tiles({1: 2, 2: 1, 3: 4, 4: 3})
+room = new_room(GameMode.REAL_TIME, game)
+before = board(room, 's0')
+for node1, node2, message in ((1, 3, 'Nodes are not connected'),
+                              (1, 9, 'Invalid nodes'),
+                              (2, 2, 'Nodes are not connected')):
+    result = room.apply_move('s0', node1, node2)
+    assert not result['success'] and result['message'] == message
+assert room.apply_move('nobody', 1, 2)['message'] == 'Not in this game'
+assert board(room, 's0') == before and room.players['s0'].moves == 0
+
+assert room.apply_move('s0', 1, 2)['success']
+result = room.apply_move('s0', 3, 4)
+assert result['solved'] and result['moves'] == 2 and result['tiles_remaining'] == 0
+assert room.players['s0'].finish_rank == 1
+assert room.apply_move('s0', 1, 2)['message'] == 'Puzzle already solved'
+print("   [OK] Bad nodes, missing edges, strangers and finished players rejected")
+
+# Test 3: Turn order is enforced
+print("\n3. Turn-based rooms")
+room = new_room(GameMode.TURN_BASED, game)
+first, second = room.turn_order[0], room.turn_order[1]
+assert room.apply_move(second, 1, 2)['message'] == 'Not your turn'
+assert room.apply_move(first, 1, 2)['success']
+assert room.next_turn() == second
+assert room.apply_move(first, 3, 4)['message'] == 'Not your turn'
+assert room.apply_move(second, 3, 4)['success']
+print("   [OK] Only the current player may move")
+
+# Test 4: Rooms pickle for the SQLite backend with their boards intact
+print("\n4. Pickled rooms")
+room = new_room(GameMode.REAL_TIME, game, players=2)
+room.apply_move('s1', 1, 2)
+restored = pickle.loads(pickle.dumps(room, pickle.HIGHEST_PROTOCOL))
+assert restored.graph.nodes == room.graph.nodes
+assert list(restored.graph.edges()) == list(room.graph.edges())
+assert board(restored, 's1') == board(room, 's1')
+assert restored.apply_move('s1', 3, 4)['solved']
+assert restored.players['s1'].moves == 2 and room.players['s1'].moves == 1
+assert restored.state == RoomState.PLAYING
+print("   [OK] Shared graph and player boards survive a round trip")
+
+# Test 5: The socket handlers end to end, called directly with emit stubbed
+print("\n5. Socket handlers")
+try:
+    from flask import request, session
+    import web_app_multiplayer as mp_app
+except ImportError as e:
+    mp_app = None
+    print(f"   [SKIP] Multiplayer app not importable here ({e})")
+
+sent = []
+
+
+def stub_emit(event, *args, **kwargs):
+    sent.append((event, args[0] if args else None))
+
+
+def call(handler, session_id, *args):
+    """Run a socket handler as session_id would; returns what it emitted."""
+    del sent[:]
+    with mp_app.app.test_request_context('/'), contextlib.redirect_stdout(io.StringIO()):
+        session['session_id'] = request.sid = session_id
+        handler(*args)
+    return list(sent)
+
+
+def play_room(seeded):
+    """Host and guest start a room; returns (room, room_joined, game_started)."""
+    code = call(mp_app.handle_create_room, 'host', {'mode': 'realtime', 'num_nodes': 6})[-1][1]['room_code']
+    if not seeded:
+        # Re-dealing the same tiles drops the seed, as a custom board would
+        game = mp_app.state_backend.get_game('host')
+        game.assign_tiles(dict(game.initial_tiles))
+        mp_app.state_backend.save_game('host', game)
+    (event, joined), = [m for m in call(mp_app.handle_join_room, 'guest', {'room_code': code, 'name': 'guest'})
+                        if m[0] == 'room_joined']
+    call(mp_app.handle_toggle_ready, 'host', {'ready': True})
+    call(mp_app.handle_toggle_ready, 'guest', {'ready': True})
+    (event, started), = [m for m in call(mp_app.handle_start_game, 'host') if m[0] == 'game_started']
+    return mp_app.mp_manager.get_room(code), joined, started
+
+
+def board_tiles(board):
+    return {node: board['tiles'][str(node)]['tile'] for node in board['nodes']}
+
+
+def move_replies(payload):
+    return [m for m in call(mp_app.handle_player_move, 'guest', payload)
+            if m[0] in ('move_accepted', 'move_failed')]
+
+
+if mp_app is not None:
+    mp_app.emit = mp_app.socketio.emit = stub_emit
+    mp_app.join_room = mp_app.leave_room = lambda room: None
+    mp_app.socketio.start_background_task = lambda *args: None
+
+    room, joined, started = play_room(seeded=True)
+    assert room.puzzle_seed and started['room_info']['puzzle_seed'] == room.puzzle_seed
+    assert 'initial_tiles' not in started['room_info']
+    assert board_tiles(joined['board']) == board_tiles(started['board']) == room.initial_tiles
+    assert started['board']['move_count'] == 0
+
+    node1, node2 = next(room.graph.edges())
+    (event, reply), = move_replies({'node1': node1, 'node2': node2})
+    assert event == 'move_accepted' and reply['moves'] == 1
+    for payload in ('swap', [node1, node2], None, {'node1': 'x', 'node2': node2}):
+        (event, reply), = move_replies(payload)
+        assert event == 'move_failed'
+    assert room.players['guest'].moves == 1 and room.players['host'].moves == 0
+
+    room, joined, started = play_room(seeded=False)
+    assert room.puzzle_seed is None and started['board']['move_count'] == 0
+    assert board_tiles(started['board']) == room.initial_tiles
+    print("   [OK] Every room previews and starts from the host's board; bad payloads rejected")
+
+print("\n" + "=" * 80)
+print("Server-side moves test complete!")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test the bounded single-player session store."""
+
+import time
+
+from session_store import SessionStore
+from web_game_state import WebGameState
+
+print("Testing Session Store")
+print("=" * 80)
+
+# Test 1: Sessions are created once and reused
+print("\n1. Get-or-create")
+store = SessionStore(WebGameState, max_sessions=3)
+game = store.get('a')
+assert isinstance(game, WebGameState)
+assert store.get('a') is game
+assert 'a' in store and store['a'] is game and len(store) == 1
+assert store.peek('missing') is None and 'missing' not in store
+print("   [OK] Same state returned for the same session")
+
+# Test 2: LRU eviction at max_sessions
+print("\n2. LRU eviction")
+store.get('b')
+store.get('c')
+store.get('a')          # a is now most recently used
+store.get('d')          # evicts b
+assert 'b' not in store and all(s in store for s in 'acd')
+assert store.stats()['evictions'] == 1 and store.stats()['live_sessions'] == 3
+print("   [OK] Least recently used session evicted")
+
+# Test 3: Idle sessions expire
+print("\n3. TTL expiry")
+store = SessionStore(WebGameState, ttl=0.05)
+store.get('old')
+time.sleep(0.1)
+store.get('new')
+assert 'old' not in store and 'new' in store
+assert store.stats()['expirations'] == 1
+print("   [OK] Idle session expired")
+
+# Test 4: Memory accounting
+print("\n4. Memory accounting")
+store = SessionStore(WebGameState)
+empty = store.stats()['approx_bytes']
+game = store.get('big')
+game.create_random_graph(10, 20)
+game.assign_tiles_randomly()
+before = store.stats()['approx_bytes']
+store.refresh('big')
+grown = store.stats()['approx_bytes']
+assert grown > before > empty
+for node1 in game.graph.get_nodes():
+    game.swap_tiles(node1, min(game.graph.get_neighbors(node1)))
+store.refresh('big')
+assert store.stats()['approx_bytes'] > grown
+store.remove('big')
+assert store.stats()['approx_bytes'] == 0
+print(f"   [OK] Estimated size follows the game ({grown} bytes after setup)")
+
+store = SessionStore(WebGameState, max_bytes=3 * WebGameState().approx_size())
+for i in range(10):
+    store.get(f"s{i}")
+assert len(store) == 3 and store.stats()['evictions'] == 7
+game = store.get('s9')
+game.create_random_graph(10, 20)
+store.refresh('s9')
+assert 's9' in store and len(store) < 3
+print(f"   [OK] max_bytes keeps {len(store)} session(s), never the active one")
+
+print("\n" + "=" * 80)
+print("Session store test complete!")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Test the solver result cache."""
+
+import os
+import random
+import tempfile
+
+from graph import Graph
+from graph_builder import GraphBuilder
+from optimal_solver import SolverResult
+from score_calculator import ScoreCalculator
+from solver_cache import SolverCache
+from tile_manager import TileManager
+
+print("Testing Solver Cache")
+print("=" * 80)
+
+random.seed(9)
+
+
+def random_puzzle(num_nodes, num_edges):
+    """Build a connected random graph with shuffled tiles."""
+    graph = GraphBuilder.create_random_with_params(num_nodes, num_edges)
+    TileManager(graph).assign_tiles_randomly()
+    return graph
+
+
+# Test 1: Key ignores edge insertion order but not the permutation
+print("\n1. Canonical keys")
+a = Graph()
+b = Graph()
+for u, v in [(1, 2), (2, 3), (3, 4)]:
+    a.add_edge(u, v)
+for u, v in [(4, 3), (3, 2), (2, 1)]:
+    b.add_edge(u, v)
+tiles = {1: 2, 2: 1, 3: 4, 4: 3}
+assert SolverCache.make_key(a, tiles) == SolverCache.make_key(b, dict(reversed(list(tiles.items()))))
+assert SolverCache.make_key(a, tiles) != SolverCache.make_key(a, {1: 1, 2: 2, 3: 4, 4: 3})
+print("   [OK] Same edge set and permutation share a key")
+
+# Test 2: Hits, misses and LRU eviction
+print("\n2. Hits, misses and eviction")
+cache = SolverCache(max_size=3)
+puzzles = [random_puzzle(6, 8) for _ in range(4)]
+result = SolverResult(5, True, 5, 5)
+assert cache.get(puzzles[0], puzzles[0].tiles, 1.0) is None
+for graph in puzzles[:3]:
+    cache.put(graph, graph.tiles, result, 1.0)
+assert cache.get(puzzles[0], puzzles[0].tiles, 1.0) is result  # Now most recent
+cache.put(puzzles[3], puzzles[3].tiles, result, 1.0)  # Evicts puzzles[1]
+assert cache.get(puzzles[1], puzzles[1].tiles, 1.0) is None
+assert cache.get(puzzles[0], puzzles[0].tiles, 1.0) is result
+stats = cache.stats()
+assert stats['size'] == 3 and stats['hits'] == 2 and stats['misses'] == 2
+print(f"   Stats: {stats}")
+print("   [OK] Least recently used entry is evicted")
+
+# Test 3: Inexact results only satisfy budgets they were computed with
+print("\n3. Time budget rule for inexact results")
+cache = SolverCache()
+graph = puzzles[0]
+cache.put(graph, graph.tiles, SolverResult(7, False, 5, 7), 0.5)
+assert cache.get(graph, graph.tiles, 0.2) is not None
+assert cache.get(graph, graph.tiles, 0.5) is not None
+assert cache.get(graph, graph.tiles, 2.0) is None
+cache.put(graph, graph.tiles, SolverResult(6, True, 6, 6), 2.0)
+assert cache.get(graph, graph.tiles, 60.0).exact
+print("   [OK] Larger budgets recompute bounds; exact results always reused")
+
+# Test 4: SQLite persistence survives a new cache instance
+print("\n4. SQLite round-trip")
+fd, db_path = tempfile.mkstemp(suffix=".db")
+os.close(fd)
+try:
+    graph = random_puzzle(7, 9)
+    solved = ScoreCalculator.solve(graph, graph.tiles)
+    SolverCache(db_path=db_path).put(graph, graph.tiles, solved, 1.0)
+
+    reopened = SolverCache(db_path=db_path)
+    loaded = reopened.get(graph, graph.tiles, 1.0)
+    assert loaded == solved
+    assert reopened.stats()['disk_hits'] == 1
+    print("   [OK] Results reload from disk with moves intact")
+finally:
+    os.remove(db_path)
+
+# Test 5: ScoreCalculator reuses results
+print("\n5. ScoreCalculator integration")
+ScoreCalculator.configure_cache()
+graph = random_puzzle(10, 14)
+first = ScoreCalculator.solve(graph, graph.tiles)
+second = ScoreCalculator.solve(graph, dict(graph.tiles))
+assert first is second
+assert ScoreCalculator.cache.stats()['hits'] == 1
+print("   [OK] Second solve of the same puzzle is a cache hit")
+
+# Test 6: Bad configurations fail validation, not the key lookup
+print("\n6. Invalid configurations")
+for bad in ({node: node for node in list(graph.tiles)[1:]},
+            dict(graph.tiles, **{str(min(graph.tiles)): 0}),
+            {node: min(graph.tiles) for node in graph.tiles}):
+    try:
+        ScoreCalculator.solve(graph, bad)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+print("   [OK] Missing, extra and repeated tiles raise ValueError")
+
+print("\n" + "=" * 80)
+print("Solver cache test complete!")
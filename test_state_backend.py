@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Test the in-memory and SQLite state backends."""
+
+import os
+import tempfile
+
+from multiplayer import GameMode, MultiplayerManager, RoomState
+from state_backend import InMemoryStateBackend, SQLiteStateBackend
+from web_game_state import WebGameState
+
+print("Testing State Backends")
+print("=" * 80)
+
+# Test 1: Compact WebGameState serialization round trip
+print("\n1. WebGameState.to_bytes / from_bytes")
+game = WebGameState()
+assert WebGameState.from_bytes(game.to_bytes()).get_game_state() == game.get_game_state()
+
+game.create_random_graph(12, 20)
+game.assign_tiles_randomly()
+node1 = game.graph.get_nodes()[0]
+node2 = min(game.graph.get_neighbors(node1))
+game.swap_tiles(node1, node2)
+game.swap_tiles(node1, node2)
+game.undo_move()
+
+blob = game.to_bytes()
+restored = WebGameState.from_bytes(blob)
+assert restored.get_game_state() == game.get_game_state()
+assert restored.move_history == game.move_history and restored.redo_stack == game.redo_stack
+assert restored.redo_move()
+print(f"   [OK] 12-node game restored from {len(blob)} bytes "
+      f"(save_game JSON is {len(str(game.save_game()))})")
+
+# Test 2: Both backends load, create and save game states
+print("\n2. Game states")
+tmpdir = tempfile.mkdtemp()
+db_path = os.path.join(tmpdir, "state.db")
+for backend in (InMemoryStateBackend(), SQLiteStateBackend(db_path)):
+    name = backend.stats()['backend']
+    game = backend.get_game('s1')
+    assert game.graph is None
+    game.create_random_graph(8, 10)
+    game.assign_tiles_randomly()
+    backend.save_game('s1', game)
+    assert backend.get_game('s1').get_game_state() == game.get_game_state()
+    assert backend.stats()['live_sessions'] == 1
+    backend.touch_game('s1')
+    print(f"   [OK] {name}: state survives a save and reload")
+
+# Test 3: Rooms edited in a transaction are visible to another worker
+print("\n3. Rooms shared between workers")
+worker_a = SQLiteStateBackend(db_path)
+worker_b = SQLiteStateBackend(db_path)
+manager_a = MultiplayerManager(worker_a.rooms)
+manager_b = MultiplayerManager(worker_b.rooms)
+
+with worker_a.transaction():
+    code = manager_a.create_room('host', GameMode.REAL_TIME)
+    room = manager_a.get_room(code)
+    room.add_player('host', 'Alice')
+    worker_a.session_rooms['host'] = code
+
+with worker_b.transaction():
+    room = manager_b.get_room(code)
+    assert list(room.players) == ['host'] and worker_b.session_rooms['host'] == code
+    room.add_player('guest', 'Bob')
+    room.set_player_ready('guest', True)
+
+with worker_a.transaction():
+    room = manager_a.get_room(code)
+    assert room.ready_count == 1 and [e['name'] for e in room.get_leaderboard()] == \
+        ['Player 1: Alice', 'Player 2: Bob']
+assert manager_b.get_active_rooms_count() == 1
+print("   [OK] In-place room changes written back on commit")
+
+db = worker_b._db()
+writes = db.total_changes
+with worker_b.transaction():
+    assert manager_b.get_room(code).ready_count == 1
+assert db.total_changes == writes
+with worker_b.transaction():
+    manager_b.get_room(code).set_player_ready('host', True)
+assert db.total_changes == writes + 1
+print("   [OK] Only rooms that changed are written back")
+
+try:
+    with worker_b.transaction():
+        manager_b.get_room(code).remove_player('guest')
+        raise RuntimeError("handler failed")
+except RuntimeError:
+    pass
+with worker_a.transaction():
+    assert 'guest' in manager_a.get_room(code).players
+print("   [OK] A failed handler rolls its changes back")
+
+with worker_b.transaction():
+    manager_b.delete_room(code)
+    del worker_b.session_rooms['host']
+assert manager_a.get_room(code) is None and 'host' not in worker_a.session_rooms
+print("   [OK] Deletes are shared")
+
+# Test 4: Socket handlers save the game states they change
+print("\n4. Socket handlers on the SQLite backend")
+os.environ['TILE_SWAP_STATE_DB'] = os.path.join(tmpdir, "app.db")
+try:
+    import contextlib
+    import io
+    from flask import request, session
+    import web_app_multiplayer as mp_app
+except ImportError as e:
+    mp_app = None
+    print(f"   [SKIP] Multiplayer app not importable here ({e})")
+
+if mp_app is not None:
+    sent = []
+    mp_app.emit = lambda event, *args, **kwargs: sent.append((event,) + args)
+    mp_app.socketio.emit = mp_app.emit
+    mp_app.join_room = mp_app.leave_room = lambda room: None
+    mp_app.socketio.start_background_task = lambda *args: None
+
+    def call(handler, session_id, *args):
+        """Run a socket handler as session_id would trigger it."""
+        with mp_app.app.test_request_context('/'), contextlib.redirect_stdout(io.StringIO()):
+            session['session_id'] = request.sid = session_id
+            handler(*args)
+
+    call(mp_app.handle_create_room, 'host', {'mode': 'realtime', 'num_nodes': 6})
+    code = sent[-1][1]['room_code']
+    assert isinstance(mp_app.state_backend, SQLiteStateBackend)
+    assert mp_app.state_backend.get_game('host').graph.tiles == mp_app.mp_manager.get_room(code).initial_tiles
+
+    call(mp_app.handle_join_room, 'guest', {'room_code': code, 'name': 'guest'})
+    call(mp_app.handle_toggle_ready, 'host', {'ready': True})
+    call(mp_app.handle_toggle_ready, 'guest', {'ready': True})
+    call(mp_app.handle_start_game, 'host')
+    assert sent[-1][0] == 'game_started', sent[-1]
+    with mp_app.state_backend.transaction():
+        assert mp_app.mp_manager.get_room(code).state == RoomState.PLAYING
+    print("   [OK] The host's game is saved by create_room and read back by start_game")
+
+    http = mp_app.app.test_client()
+    http.post('/api/new_game', json={'num_nodes': 8})
+    with mp_app.state_backend.transaction():
+        pass
+    db = mp_app.state_backend._db()
+    writes = db.total_changes
+    state = http.get('/api/state').get_json()
+    assert db.total_changes == writes + 1  # last_access only
+    blob = db.execute("SELECT data FROM games").fetchall()
+    http.post('/api/swap', json=dict(zip(('node1', 'node2'), state['edges'][0])))
+    assert db.execute("SELECT data FROM games").fetchall() != blob
+    print("   [OK] Requests that leave the game unchanged only touch it")
+
+print("\n" + "=" * 80)
+print("State backend test complete!")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Test the cached graph payload and per-move state deltas."""
+
+import random
+
+from web_game_state import WebGameState
+
+print("Testing State Deltas")
+print("=" * 80)
+
+# Test 1: The static graph payload is built once per graph
+print("\n1. Graph payload cache")
+game = WebGameState()
+game.create_random_graph(10, 15)
+game.assign_tiles_randomly()
+payload = game.get_graph_payload()
+assert game.get_graph_payload() is payload
+assert set(payload) == {'graph_version', 'nodes', 'edges', 'node_positions'}
+
+other = WebGameState()
+other.create_graph_from_edges([tuple(edge) for edge in reversed(payload['edges'])])
+other.assign_tiles_randomly()
+assert other.get_graph_payload() is payload
+print(f"   [OK] Two games on the same graph share version {payload['graph_version']}")
+
+state = game.get_game_state()
+assert all(state[key] == payload[key] for key in payload)
+slim = game.get_game_state(include_graph=False)
+assert 'edges' not in slim and 'node_positions' not in slim
+assert slim['graph_version'] == payload['graph_version'] and slim['tiles'] == state['tiles']
+print("   [OK] Full state embeds the payload; include_graph=False leaves it out")
+
+# Test 2: A client applying deltas tracks the full state
+print("\n2. Deltas reproduce the full state")
+
+
+def apply_delta(client, delta):
+    """Client-side merge, mirroring TileSwapGame.applyDelta in game.js."""
+    assert delta['graph_version'] == client['graph_version']
+    for node, tile in delta['changed_tiles'].items():
+        client['tiles'][node] = {'tile': tile, 'matched': tile == int(node)}
+    for key in ('active', 'move_count', 'tiles_remaining', 'lower_bounds', 'can_undo', 'can_redo',
+                'state_version'):
+        client[key] = delta[key]
+
+
+rng = random.Random(5)
+client = game.get_game_state()
+edges = payload['edges']
+applied = 0
+while game.game_active and applied < 200:
+    choice = rng.random()
+    if choice < 0.7:
+        result = game.swap_tiles(*rng.choice(edges))
+    elif choice < 0.85:
+        result = game.undo_move()
+    else:
+        result = game.redo_move()
+    if result['success']:
+        assert len(result['changed_tiles']) == 2
+        apply_delta(client, result)
+        applied += 1
+    assert client == game.get_game_state()
+print(f"   [OK] {applied} swaps/undos/redos applied without divergence")
+
+# Test 3: state_version and ETags
+print("\n3. State versions")
+game = WebGameState()
+seen = {game.state_version}
+tags = {game.state_etag()}
+game.create_random_graph(8, 10)
+game.assign_tiles_randomly()
+edge = game.get_graph_payload()['edges'][0]
+steps = [
+    lambda: game.swap_tiles(*edge),
+    game.undo_move,
+    game.redo_move,
+    lambda: game.load_game(game.save_game()),
+]
+for step in steps:
+    version, tag = game.state_version, game.state_etag()
+    assert game.state_etag() == tag  # idle polls see the same tag
+    step()
+    assert game.state_version > version and game.state_etag() != tag
+    assert game.state_etag() != game.state_etag(include_graph=False)
+    seen.add(game.state_version)
+    tags.add(game.state_etag())
+
+version = game.state_version
+assert not game.swap_tiles(-1, -2)['success']
+assert game.state_version == version  # rejected moves change nothing
+game.reset_game()
+assert game.state_version > version and game.state_etag() not in tags
+assert game.get_game_state()['state_version'] == game.state_version
+assert WebGameState.from_bytes(game.to_bytes()).state_version == game.state_version
+print(f"   [OK] Version bumped on every change ({len(seen)} distinct), ETags never reused")
+
+# A state recreated for the same session (e.g. after eviction) can reach
+# the same version on the same graph with other tiles; its tag must differ
+old, new = WebGameState(), WebGameState()
+for state, tiles in ((old, {1: 2, 2: 1, 3: 3}), (new, {1: 1, 2: 3, 3: 2})):
+    state.create_graph_from_edges([(1, 2), (2, 3)])
+    state.assign_tiles(tiles)
+assert old.state_version == new.state_version
+assert old.state_etag() != new.state_etag()
+restored = WebGameState.from_bytes(old.to_bytes())
+assert restored.state_etag() == old.state_etag()
+print("   [OK] Per-instance epoch keeps recreated states from matching old tags")
+
+# Tags and move deltas never build the (layout-heavy) graph payload
+game = WebGameState()
+game.create_random_graph(12, 20)
+game.assign_tiles_randomly()
+WebGameState._graph_payloads.pop(game.graph_version(), None)
+assert game.graph_version() in game.state_etag()
+edge = next(game.graph.compact().edges())
+assert game.swap_tiles(*edge)['graph_version'] == game.graph_version()
+assert game.graph_version() not in WebGameState._graph_payloads
+assert game.get_graph_payload()['graph_version'] == game.graph_version()
+print("   [OK] ETags and deltas use the fingerprint without building the payload")
+
+# Test 4: Conditional GET through the Flask app
+print("\n4. /api/state conditional GET")
+try:
+    import web_app
+except ImportError as e:
+    web_app = None
+    print(f"   [SKIP] Web app not importable here ({e})")
+
+if web_app is not None:
+    client = web_app.app.test_client()
+    state = client.post('/api/new_game', json={'num_nodes': 6}).get_json()['state']
+    first = client.get('/api/state')
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and first.headers['Cache-Control'] == 'no-cache'
+    again = client.get('/api/state', headers={'If-None-Match': etag})
+    assert again.status_code == 304 and again.headers['ETag'] == etag and not again.data
+
+    node1, node2 = state['edges'][0]
+    assert client.post('/api/swap', json={'node1': node1, 'node2': node2}).get_json()['success']
+    changed = client.get('/api/state', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    etag = changed.headers['ETag']
+
+    # Evict the session; the cookie stays, the game state is recreated
+    with client.session_transaction() as flask_session:
+        session_id = flask_session['session_id']
+    web_app.state_backend.sessions.remove(session_id)
+    evicted = client.get('/api/state', headers={'If-None-Match': etag})
+    assert evicted.status_code == 200 and evicted.headers['ETag'] != etag
+    print("   [OK] 304 while unchanged, 200 after a move and after eviction")
+
+print("\n" + "=" * 80)
+print("State delta test complete!")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Test incremental solved-state tracking in TileManager."""
+
+import random
+
+from graph_builder import GraphBuilder
+from tile_manager import TileManager
+
+print("Testing TileManager Solved Tracking")
+print("=" * 80)
+
+# Test 1: Counter matches a full scan through random swaps
+print("\n1. Misplaced count through 500 random swaps")
+random.seed(3)
+graph = GraphBuilder.create_random_with_params(10, 15)
+manager = TileManager(graph)
+nodes = graph.get_nodes()
+shuffled = nodes.copy()
+random.shuffle(shuffled)
+manager.assign_tiles(dict(zip(nodes, shuffled)))
+
+edges = [(a, b) for a in nodes for b in graph.get_neighbors(a) if a < b]
+for _ in range(500):
+    manager.swap_tiles(*random.choice(edges))
+    expected = sum(1 for n in nodes if graph.tiles[n] != n)
+    assert manager.tiles_remaining() == expected
+    assert manager.is_solved() == (expected == 0)
+print(f"   Tiles remaining at end: {manager.tiles_remaining()}")
+print("   [OK] Counter always matches a full scan")
+
+# Test 2: Solving a single transposition
+print("\n2. Solving a swapped pair")
+manager.assign_tiles({n: n for n in nodes})
+assert manager.is_solved()
+node1, node2 = edges[0]
+manager.swap_tiles(node1, node2)
+assert manager.tiles_remaining() == 2 and not manager.is_solved()
+manager.swap_tiles(node1, node2)
+assert manager.is_solved()
+print("   [OK] is_solved flips with the counter")
+
+print("\n" + "=" * 80)
+print("TileManager test complete!")
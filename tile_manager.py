@@ -13,10 +13,18 @@ class TileManager:
 
     def __init__(self, graph):
         self.graph = graph
+        # Running count of tiles not on their home node, kept up to date by
+        # assign_tiles() and swap_tiles() so is_solved() is O(1)
+        self.misplaced_count = self._count_misplaced()
+
+    def _count_misplaced(self):
+        """Count tiles that are not on their home node."""
+        return sum(1 for node, tile in self.graph.tiles.items() if node != tile)
 
     def assign_tiles(self, tile_assignment):
         """Assign tiles to nodes."""
         self.graph.tiles = tile_assignment.copy()
+        self.misplaced_count = self._count_misplaced()
 
     def assign_tiles_manually(self):
         """Allow user to manually assign tiles to nodes."""
@@ -50,11 +58,18 @@ class TileManager:
         self.assign_tiles(tile_assignment)
         return True
 
-    def assign_tiles_randomly(self):
-        """Randomly assign tiles to nodes."""
+    def assign_tiles_randomly(self, seed=None):
+        """
+        Randomly assign tiles to nodes.
+
+        Args:
+            seed: Optional seed for a private random.Random, making the
+                assignment reproducible for the same graph
+        """
         nodes = self.graph.get_nodes()
         tiles = nodes.copy()
-        random.shuffle(tiles)
+        rng = random.Random(seed) if seed is not None else random
+        rng.shuffle(tiles)
 
         tile_assignment = {}
         for i, node in enumerate(nodes):
@@ -65,14 +80,20 @@ class TileManager:
 
     def swap_tiles(self, node1, node2):
         """Swap tiles between two nodes."""
-        self.graph.tiles[node1], self.graph.tiles[node2] = self.graph.tiles[node2], self.graph.tiles[node1]
+        tiles = self.graph.tiles
+        tile1, tile2 = tiles[node1], tiles[node2]
+        tiles[node1], tiles[node2] = tile2, tile1
+
+        self.misplaced_count += ((tile2 != node1) + (tile1 != node2)
+                                 - (tile1 != node1) - (tile2 != node2))
 
     def is_solved(self):
         """Check if all tiles match their node numbers."""
-        for node in self.graph.get_nodes():
-            if self.graph.tiles[node] != node:
-                return False
-        return True
+        return self.misplaced_count == 0
+
+    def tiles_remaining(self):
+        """Return the number of tiles not yet on their home node."""
+        return self.misplaced_count
 
     def get_initial_configuration(self):
         """Get a copy of the current tile configuration."""
@@ -21,6 +21,7 @@ class TileSwapGame:
         self.move_count = 0
         self.initial_tiles = None
         self.optimal_moves = 0
+        self.optimal_result = None
 
     def setup_graph(self):
         """Guide player through graph creation."""
@@ -86,7 +87,8 @@ class TileSwapGame:
 
         # Store initial state for optimal calculation
         self.initial_tiles = self.tile_manager.get_initial_configuration()
-        self.optimal_moves = ScoreCalculator.calculate_optimal_moves(self.initial_tiles)
+        self.optimal_result = ScoreCalculator.solve(self.graph, self.initial_tiles)
+        self.optimal_moves = self.optimal_result.optimal_moves
 
         # Display adjacency matrix after tiles are assigned
         print("\n" + "="*50)
@@ -107,7 +109,7 @@ class TileSwapGame:
         self.display.display_tiles()
 
         print(f"\nCurrent Score (moves): {self.move_count}")
-        print(f"Optimal Solution: {self.optimal_moves} moves")
+        print(f"Optimal Solution: {self._format_optimal()}")
         print("\nSwap tiles between connected nodes to match all tiles to their nodes.")
         print("Enter 'q' at any time to quit.")
 
@@ -165,9 +167,9 @@ class TileSwapGame:
         print("CONGRATULATIONS! YOU WON!")
         print("="*50)
         print(f"Final Score: {self.move_count} moves")
-        print(f"Optimal Solution: {self.optimal_moves} moves")
+        print(f"Optimal Solution: {self._format_optimal()}")
 
-        if self.move_count == self.optimal_moves:
+        if self.move_count <= self.optimal_result.lower_bound:
             print("PERFECT! You solved it optimally!")
         elif self.move_count <= self.optimal_moves * 1.5:
             print("Great job! Very efficient solution!")
@@ -176,6 +178,13 @@ class TileSwapGame:
 
         print("="*50)
 
+    def _format_optimal(self):
+        """Describe the optimal solution, or its range if only bounds are known."""
+        if self.optimal_result.exact:
+            return f"{self.optimal_moves} moves"
+        return (f"between {self.optimal_result.lower_bound} and "
+                f"{self.optimal_result.upper_bound} moves (search timed out)")
+
     def run(self):
         """Run the complete game session."""
         print("="*50)
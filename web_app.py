@@ -6,15 +6,55 @@ Provides a web interface for the tile swap puzzle game with
 interactive graph visualization.
 """
 
-from flask import Flask, render_template, jsonify, request, session
+from flask import Flask, render_template, jsonify, request, session, g
 from web_game_state import WebGameState
+from graph_builder import GraphBuilder
+from layout_engine import LayoutEngine
+from score_calculator import ScoreCalculator
+from puzzle_bank import PuzzleBank
+from session_store import SessionStore
+from state_backend import InMemoryStateBackend, SQLiteStateBackend
+import os
 import secrets
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# Store game states per session
-game_states = {}
+# Large-graph mode (training/benchmark deployments): raise the node cap
+if os.environ.get('TILE_SWAP_MAX_NODES'):
+    GraphBuilder.enable_large_graph_mode(int(os.environ['TILE_SWAP_MAX_NODES']))
+
+# Node layout for the board: auto, circular, spectral or force
+if os.environ.get('TILE_SWAP_LAYOUT'):
+    LayoutEngine.DEFAULT_METHOD = os.environ['TILE_SWAP_LAYOUT']
+
+# Persist optimal-move results across restarts
+if os.environ.get('TILE_SWAP_SOLVER_CACHE_DB'):
+    ScoreCalculator.configure_cache(db_path=os.environ['TILE_SWAP_SOLVER_CACHE_DB'])
+
+# Serve new games from a pre-scored puzzle bank, refilled in the background.
+# Only the node counts listed in TILE_SWAP_PUZZLE_BANK_SIZES are banked;
+# other games are generated on the request path
+puzzle_bank = None
+if os.environ.get('TILE_SWAP_PUZZLE_BANK'):
+    bank_sizes = [int(n) for n in os.environ.get('TILE_SWAP_PUZZLE_BANK_SIZES', '6,8,10').split(',')]
+    puzzle_bank = PuzzleBank(os.environ['TILE_SWAP_PUZZLE_BANK'],
+                             buckets=WebGameState.bank_buckets(bank_sizes))
+    puzzle_bank.start_refill_worker()
+
+# Game states (and multiplayer rooms) live in a state backend: in process by
+# default, evicting idle and least recently used sessions so memory stays
+# bounded, or in a SQLite file shared by several worker processes
+session_ttl = float(os.environ.get('TILE_SWAP_SESSION_TTL', SessionStore.DEFAULT_TTL))
+if os.environ.get('TILE_SWAP_STATE_DB'):
+    state_backend = SQLiteStateBackend(os.environ['TILE_SWAP_STATE_DB'], ttl=session_ttl)
+else:
+    state_backend = InMemoryStateBackend(SessionStore(
+        WebGameState,
+        max_sessions=int(os.environ.get('TILE_SWAP_MAX_SESSIONS', SessionStore.DEFAULT_MAX_SESSIONS)),
+        ttl=session_ttl,
+        max_bytes=int(os.environ['TILE_SWAP_SESSION_MAX_BYTES']) if os.environ.get('TILE_SWAP_SESSION_MAX_BYTES') else None
+    ))
 
 
 def get_game_state():
@@ -22,11 +62,22 @@ def get_game_state():
     if 'session_id' not in session:
         session['session_id'] = secrets.token_hex(16)
 
-    session_id = session['session_id']
-    if session_id not in game_states:
-        game_states[session_id] = WebGameState()
+    # Loaded once per request, and only by requests that use it
+    if 'game' not in g:
+        g.game = state_backend.get_game(session['session_id'])
+        g.game_version = g.game.state_version
+    return g.game
 
-    return game_states[session_id]
+
+@app.after_request
+def save_game_state(response):
+    """Store the session's game state if this request changed it."""
+    if 'game' in g:
+        if g.game.state_version != g.game_version:
+            state_backend.save_game(session['session_id'], g.game)
+        else:
+            state_backend.touch_game(session['session_id'])
+    return response
 
 
 @app.route('/')
@@ -41,15 +92,25 @@ def new_game():
     data = request.get_json()
     num_nodes = data.get('num_nodes', 6)
     num_edges = data.get('num_edges', None)
+    difficulty = data.get('difficulty', None)
 
     game = get_game_state()
     game.reset_game()
 
+    if puzzle_bank and game.start_from_bank(puzzle_bank, num_nodes, num_edges, difficulty):
+        return jsonify({
+            'success': True,
+            'state': game.get_game_state()
+        })
+
     if not game.create_random_graph(num_nodes, num_edges):
         return jsonify({'success': False, 'message': 'Failed to create graph'}), 400
 
-    if not game.assign_tiles_randomly():
-        return jsonify({'success': False, 'message': 'Failed to assign tiles'}), 400
+    try:
+        if not game.assign_tiles_randomly(difficulty):
+            return jsonify({'success': False, 'message': 'Failed to assign tiles'}), 400
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
 
     return jsonify({
         'success': True,
@@ -81,6 +142,23 @@ def custom_game():
     })
 
 
+@app.route('/api/seeded_game', methods=['POST'])
+def seeded_game():
+    """Regenerate a game from its puzzle seed (seed, num_nodes, num_edges, difficulty)."""
+    data = request.get_json()
+
+    game = get_game_state()
+    game.reset_game()
+
+    if not game.create_seeded_game(data or {}):
+        return jsonify({'success': False, 'message': 'Invalid puzzle seed'}), 400
+
+    return jsonify({
+        'success': True,
+        'state': game.get_game_state()
+    })
+
+
 @app.route('/api/swap', methods=['POST'])
 def swap():
     """Swap tiles between two nodes."""
@@ -97,16 +175,68 @@ def swap():
     if not result['success']:
         return jsonify(result), 400
 
-    # Add updated game state to response
-    result['state'] = game.get_game_state()
+    return jsonify(result)
+
+
+# Largest batch /api/swaps accepts in one request
+MAX_BATCH_MOVES = 1000
+
+
+@app.route('/api/swaps', methods=['POST'])
+def swaps():
+    """
+    Apply an ordered list of swaps in one request.
+
+    All-or-nothing: the first invalid move rolls the whole batch back and
+    its position is returned as 'index'.
+    """
+    data = request.get_json()
+    moves = data.get('moves') if data else None
+
+    if not isinstance(moves, list) or not moves:
+        return jsonify({'success': False, 'message': 'Missing moves'}), 400
+    if len(moves) > MAX_BATCH_MOVES:
+        return jsonify({'success': False,
+                        'message': f'At most {MAX_BATCH_MOVES} moves per request'}), 400
+
+    game = get_game_state()
+    result = game.swap_tiles_batch(moves)
+
+    if not result['success']:
+        return jsonify(result), 400
+
     return jsonify(result)
 
 
 @app.route('/api/state', methods=['GET'])
 def get_state():
-    """Get current game state."""
+    """
+    Get current game state; ?graph=0 leaves out the static graph payload.
+
+    Answers If-None-Match with 304 while the state is unchanged, without
+    building the payload.
+    """
     game = get_game_state()
-    return jsonify(game.get_game_state())
+    include_graph = request.args.get('graph') != '0'
+    etag = game.state_etag(include_graph)
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(game.get_game_state(include_graph=include_graph))
+    response.set_etag(etag)
+    # Let browsers cache, but revalidate on every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/graph', methods=['GET'])
+def get_graph():
+    """Get the static graph payload (nodes, edges, positions)."""
+    game = get_game_state()
+    payload = game.get_graph_payload()
+    if payload is None:
+        return jsonify({'success': False, 'message': 'No game loaded'}), 400
+    return jsonify({'success': True, 'graph': payload})
 
 
 @app.route('/api/reset', methods=['POST'])
@@ -126,7 +256,6 @@ def undo():
     if not result['success']:
         return jsonify(result), 400
 
-    result['state'] = game.get_game_state()
     return jsonify(result)
 
 
@@ -139,7 +268,18 @@ def redo():
     if not result['success']:
         return jsonify(result), 400
 
-    result['state'] = game.get_game_state()
+    return jsonify(result)
+
+
+@app.route('/api/hint', methods=['GET'])
+def hint():
+    """Suggest the next swap."""
+    game = get_game_state()
+    result = game.get_hint()
+
+    if not result['success']:
+        return jsonify(result), 400
+
     return jsonify(result)
 
 
@@ -174,6 +314,15 @@ def load():
     })
 
 
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    """Report session store and solver cache metrics."""
+    return jsonify({
+        'sessions': state_backend.stats(),
+        'solver_cache': ScoreCalculator.cache.stats()
+    })
+
+
 if __name__ == '__main__':
     print("="*50)
     print("TILE SWAP - WEB INTERFACE")
@@ -6,31 +6,77 @@ Enhanced version with WebSocket support for competitive multiplayer gaming.
 Supports both real-time and turn-based modes with up to 30 players per room.
 """
 
-from flask import Flask, render_template, jsonify, request, session
+from flask import Flask, render_template, jsonify, request, session, g
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from web_game_state import WebGameState
-from multiplayer import MultiplayerManager, GameMode
+from graph_builder import GraphBuilder
+from layout_engine import LayoutEngine
 from score_calculator import ScoreCalculator
+from puzzle_bank import PuzzleBank
+from session_store import SessionStore
+from state_backend import InMemoryStateBackend, SQLiteStateBackend
+from multiplayer import MultiplayerManager, GameMode, GameRoom, RoomState
+import functools
+import os
 import secrets
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 app.config['SECRET_KEY'] = app.secret_key
 
-# Initialize SocketIO
-socketio = SocketIO(app, cors_allowed_origins="*")
-
-# Store game states per session (single player)
-game_states = {}
+# Large-graph mode (training/benchmark deployments): raise the node cap
+if os.environ.get('TILE_SWAP_MAX_NODES'):
+    GraphBuilder.enable_large_graph_mode(int(os.environ['TILE_SWAP_MAX_NODES']))
+
+# Node layout for the board: auto, circular, spectral or force
+if os.environ.get('TILE_SWAP_LAYOUT'):
+    LayoutEngine.DEFAULT_METHOD = os.environ['TILE_SWAP_LAYOUT']
+
+# Persist optimal-move results across restarts
+if os.environ.get('TILE_SWAP_SOLVER_CACHE_DB'):
+    ScoreCalculator.configure_cache(db_path=os.environ['TILE_SWAP_SOLVER_CACHE_DB'])
+
+# Serve new games from a pre-scored puzzle bank, refilled in the background.
+# Only the node counts listed in TILE_SWAP_PUZZLE_BANK_SIZES are banked;
+# other games are generated on the request path
+puzzle_bank = None
+if os.environ.get('TILE_SWAP_PUZZLE_BANK'):
+    bank_sizes = [int(n) for n in os.environ.get('TILE_SWAP_PUZZLE_BANK_SIZES', '6,8,10').split(',')]
+    puzzle_bank = PuzzleBank(os.environ['TILE_SWAP_PUZZLE_BANK'],
+                             buckets=WebGameState.bank_buckets(bank_sizes))
+    puzzle_bank.start_refill_worker()
+
+# Leaderboard broadcast tick for real-time rooms, in seconds
+if os.environ.get('TILE_SWAP_BROADCAST_TICK'):
+    GameRoom.BROADCAST_TICK = float(os.environ['TILE_SWAP_BROADCAST_TICK'])
+
+# Initialize SocketIO; several workers need a message queue (e.g. a Redis
+# URL) to reach each other's clients
+socketio = SocketIO(app, cors_allowed_origins="*",
+                    message_queue=os.environ.get('TILE_SWAP_SOCKETIO_QUEUE'))
+
+# Game states (and multiplayer rooms) live in a state backend: in process by
+# default, evicting idle and least recently used sessions so memory stays
+# bounded, or in a SQLite file shared by several worker processes
+session_ttl = float(os.environ.get('TILE_SWAP_SESSION_TTL', SessionStore.DEFAULT_TTL))
+if os.environ.get('TILE_SWAP_STATE_DB'):
+    state_backend = SQLiteStateBackend(os.environ['TILE_SWAP_STATE_DB'], ttl=session_ttl)
+else:
+    state_backend = InMemoryStateBackend(SessionStore(
+        WebGameState,
+        max_sessions=int(os.environ.get('TILE_SWAP_MAX_SESSIONS', SessionStore.DEFAULT_MAX_SESSIONS)),
+        ttl=session_ttl,
+        max_bytes=int(os.environ['TILE_SWAP_SESSION_MAX_BYTES']) if os.environ.get('TILE_SWAP_SESSION_MAX_BYTES') else None
+    ))
 
 # Multiplayer manager
-mp_manager = MultiplayerManager()
+mp_manager = MultiplayerManager(state_backend.rooms)
 
 # Track session -> room mapping
-session_rooms = {}
+session_rooms = state_backend.session_rooms
 
 # Track session -> socket ID mapping
-session_sockets = {}
+session_sockets = state_backend.session_sockets
 
 
 def get_game_state():
@@ -38,11 +84,29 @@ def get_game_state():
     if 'session_id' not in session:
         session['session_id'] = secrets.token_hex(16)
 
-    session_id = session['session_id']
-    if session_id not in game_states:
-        game_states[session_id] = WebGameState()
+    # Loaded once per request, and only by requests that use it
+    if 'game' not in g:
+        g.game = state_backend.get_game(session['session_id'])
+        g.game_version = g.game.state_version
+    return g.game
+
+
+def store_game_state():
+    """Store the game state this request or event loaded, if it changed."""
+    game = g.pop('game', None)
+    if game is None:
+        return
+    if game.state_version != g.pop('game_version'):
+        state_backend.save_game(session['session_id'], game)
+    else:
+        state_backend.touch_game(session['session_id'])
+
 
-    return game_states[session_id]
+@app.after_request
+def save_game_state(response):
+    """Store the session's game state if this request changed it."""
+    store_game_state()
+    return response
 
 
 def get_session_id():
@@ -52,6 +116,33 @@ def get_session_id():
     return session['session_id']
 
 
+def host_board(room):
+    """
+    The host's board for players to preview in the lobby, so nobody has to
+    rebuild the puzzle (seeded or not) in a session game of their own.
+    """
+    host_game = state_backend.get_game(room.host_session_id)
+    if host_game is None or host_game.graph is None:
+        return None
+    return host_game.get_game_state()
+
+
+def room_transaction(handler):
+    """
+    Run a socket handler inside a state backend transaction.
+
+    Socket events never reach after_request, so a game state the handler
+    loaded is saved here, in the same transaction as its room changes.
+    """
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        with state_backend.transaction():
+            result = handler(*args, **kwargs)
+            store_game_state()
+            return result
+    return wrapper
+
+
 # ============================================================================
 # REGULAR ROUTES (Single Player)
 # ============================================================================
@@ -68,15 +159,25 @@ def new_game():
     data = request.get_json()
     num_nodes = data.get('num_nodes', 6)
     num_edges = data.get('num_edges', None)
+    difficulty = data.get('difficulty', None)
 
     game = get_game_state()
     game.reset_game()
 
+    if puzzle_bank and game.start_from_bank(puzzle_bank, num_nodes, num_edges, difficulty):
+        return jsonify({
+            'success': True,
+            'state': game.get_game_state()
+        })
+
     if not game.create_random_graph(num_nodes, num_edges):
         return jsonify({'success': False, 'message': 'Failed to create graph'}), 400
 
-    if not game.assign_tiles_randomly():
-        return jsonify({'success': False, 'message': 'Failed to assign tiles'}), 400
+    try:
+        if not game.assign_tiles_randomly(difficulty):
+            return jsonify({'success': False, 'message': 'Failed to assign tiles'}), 400
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
 
     return jsonify({
         'success': True,
@@ -128,17 +229,10 @@ def custom_game_with_tiles():
         # Convert tile keys from strings to ints if needed
         if tiles:
             tile_dict = {int(k): int(v) for k, v in tiles.items()}
-            game.graph.tiles = tile_dict
-
-            # Set up game state properly
-            game.initial_tiles = tile_dict.copy()
-            game.game_active = True
-            game.move_count = 0
-            game.move_history = []
-            game.redo_stack = []
 
-            # Calculate optimal moves using ScoreCalculator
-            game.optimal_moves = ScoreCalculator.calculate_optimal_moves(tile_dict)
+            # Set up game state properly (also scores the optimal solution)
+            if not game.assign_tiles(tile_dict):
+                return jsonify({'success': False, 'message': 'Tiles do not match graph nodes'}), 400
         else:
             print("WARNING: No tiles provided to custom_game_with_tiles")
 
@@ -153,6 +247,23 @@ def custom_game_with_tiles():
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+@app.route('/api/seeded_game', methods=['POST'])
+def seeded_game():
+    """Regenerate a game from its puzzle seed (seed, num_nodes, num_edges, difficulty)."""
+    data = request.get_json()
+
+    game = get_game_state()
+    game.reset_game()
+
+    if not game.create_seeded_game(data or {}):
+        return jsonify({'success': False, 'message': 'Invalid puzzle seed'}), 400
+
+    return jsonify({
+        'success': True,
+        'state': game.get_game_state()
+    })
+
+
 @app.route('/api/swap', methods=['POST'])
 def swap():
     """Swap tiles between two nodes."""
@@ -169,15 +280,68 @@ def swap():
     if not result['success']:
         return jsonify(result), 400
 
-    result['state'] = game.get_game_state()
+    return jsonify(result)
+
+
+# Largest batch /api/swaps accepts in one request
+MAX_BATCH_MOVES = 1000
+
+
+@app.route('/api/swaps', methods=['POST'])
+def swaps():
+    """
+    Apply an ordered list of swaps in one request.
+
+    All-or-nothing: the first invalid move rolls the whole batch back and
+    its position is returned as 'index'.
+    """
+    data = request.get_json()
+    moves = data.get('moves') if data else None
+
+    if not isinstance(moves, list) or not moves:
+        return jsonify({'success': False, 'message': 'Missing moves'}), 400
+    if len(moves) > MAX_BATCH_MOVES:
+        return jsonify({'success': False,
+                        'message': f'At most {MAX_BATCH_MOVES} moves per request'}), 400
+
+    game = get_game_state()
+    result = game.swap_tiles_batch(moves)
+
+    if not result['success']:
+        return jsonify(result), 400
+
     return jsonify(result)
 
 
 @app.route('/api/state', methods=['GET'])
 def get_state():
-    """Get current game state."""
+    """
+    Get current game state; ?graph=0 leaves out the static graph payload.
+
+    Answers If-None-Match with 304 while the state is unchanged, without
+    building the payload.
+    """
+    game = get_game_state()
+    include_graph = request.args.get('graph') != '0'
+    etag = game.state_etag(include_graph)
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(game.get_game_state(include_graph=include_graph))
+    response.set_etag(etag)
+    # Let browsers cache, but revalidate on every poll
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/graph', methods=['GET'])
+def get_graph():
+    """Get the static graph payload (nodes, edges, positions)."""
     game = get_game_state()
-    return jsonify(game.get_game_state())
+    payload = game.get_graph_payload()
+    if payload is None:
+        return jsonify({'success': False, 'message': 'No game loaded'}), 400
+    return jsonify({'success': True, 'graph': payload})
 
 
 @app.route('/api/reset', methods=['POST'])
@@ -197,7 +361,6 @@ def undo():
     if not result['success']:
         return jsonify(result), 400
 
-    result['state'] = game.get_game_state()
     return jsonify(result)
 
 
@@ -210,7 +373,18 @@ def redo():
     if not result['success']:
         return jsonify(result), 400
 
-    result['state'] = game.get_game_state()
+    return jsonify(result)
+
+
+@app.route('/api/hint', methods=['GET'])
+def hint():
+    """Suggest the next swap."""
+    game = get_game_state()
+    result = game.get_hint()
+
+    if not result['success']:
+        return jsonify(result), 400
+
     return jsonify(result)
 
 
@@ -245,11 +419,21 @@ def load():
     })
 
 
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    """Report session store and solver cache metrics."""
+    return jsonify({
+        'sessions': state_backend.stats(),
+        'solver_cache': ScoreCalculator.cache.stats()
+    })
+
+
 # ============================================================================
 # WEBSOCKET EVENTS (Multiplayer)
 # ============================================================================
 
 @socketio.on('connect')
+@room_transaction
 def handle_connect():
     """Handle client connection."""
     session_id = get_session_id()
@@ -259,6 +443,7 @@ def handle_connect():
 
 
 @socketio.on('disconnect')
+@room_transaction
 def handle_disconnect():
     """Handle client disconnection."""
     session_id = get_session_id()
@@ -275,7 +460,7 @@ def handle_disconnect():
             # Notify other players
             socketio.emit('player_left', {
                 'session_id': session_id,
-                'room_info': room.get_room_info()
+                'room_info': room.get_leaderboard_snapshot()
             }, to=room_code)
 
             # Delete empty rooms
@@ -291,6 +476,7 @@ def handle_disconnect():
 
 
 @socketio.on('create_room')
+@room_transaction
 def handle_create_room(data):
     """Create a new multiplayer room."""
     session_id = get_session_id()
@@ -298,6 +484,7 @@ def handle_create_room(data):
     player_name = data.get('name', '').strip()
     # Don't auto-generate name here - will be set based on player number
     num_nodes = data.get('num_nodes', 6)
+    difficulty = data.get('difficulty', None)
 
     # Create mode enum
     mode = GameMode.REAL_TIME if mode_str == 'realtime' else GameMode.TURN_BASED
@@ -317,10 +504,15 @@ def handle_create_room(data):
     # Create the game graph (host's game state)
     game = get_game_state()
     game.reset_game()
-    game.create_random_graph(num_nodes)
-
-    # Assign tiles to the host's graph so they're ready when game starts
-    game.assign_tiles_randomly()
+    if not (puzzle_bank and game.start_from_bank(puzzle_bank, num_nodes, difficulty=difficulty)):
+        game.create_random_graph(num_nodes)
+
+        # Assign tiles to the host's graph so they're ready when game starts
+        try:
+            game.assign_tiles_randomly(difficulty)
+        except ValueError as e:
+            print(f"Invalid difficulty {difficulty!r} ({e}), using a uniform shuffle")
+            game.assign_tiles_randomly()
     print(f"Host graph created with tiles: {game.graph.tiles}")
 
     # Store graph structure AND tiles in room (for all players to use)
@@ -331,6 +523,7 @@ def handle_create_room(data):
                 graph_edges.append((node, neighbor))
     room.graph_edges = graph_edges
     room.initial_tiles = game.graph.tiles.copy()  # Store tiles in room immediately!
+    room.puzzle_seed = dict(game.puzzle_seed) if game.puzzle_seed else None
 
     print(f"Room {room_code} created with {len(graph_edges)} edges, {num_nodes} nodes")
     print(f"Graph edges: {graph_edges}")
@@ -339,11 +532,13 @@ def handle_create_room(data):
     emit('room_created', {
         'success': True,
         'room_code': room_code,
-        'room_info': room.get_room_info()
+        'room_info': room.get_room_info(),
+        'board': game.get_game_state()
     })
 
 
 @socketio.on('join_room')
+@room_transaction
 def handle_join_room(data):
     """Join an existing multiplayer room."""
     session_id = get_session_id()
@@ -367,23 +562,25 @@ def handle_join_room(data):
     session_rooms[session_id] = room_code
     print(f"Socket {request.sid} joined room {room_code}")
 
-    room_info = room.get_room_info()
     print(f"Player {player_name} (session {session_id}) joined room {room_code}")
-    print(f"Room info graph_edges: {room_info['graph_edges']}")
-    print(f"Room info initial_tiles: {room_info['initial_tiles']}")
 
     # Notify everyone
     print(f"Broadcasting player_joined to room {room_code}")
     socketio.emit('player_joined', {
         'session_id': session_id,
         'name': player_name,
-        'room_info': room_info
+        'room_info': room.get_leaderboard_snapshot()
     }, to=room_code)
 
+    # Taken after the snapshot so the joiner starts from its version
+    room_info = room.get_room_info()
+    print(f"Room info puzzle seed: {room_info.get('puzzle_seed')}")
+
     emit('room_joined', {
         'success': True,
         'room_code': room_code,
-        'room_info': room_info
+        'room_info': room_info,
+        'board': host_board(room)
     })
 
     # Test broadcast to verify room membership works
@@ -394,6 +591,7 @@ def handle_join_room(data):
 
 
 @socketio.on('leave_room')
+@room_transaction
 def handle_leave_room():
     """Leave current room."""
     session_id = get_session_id()
@@ -411,7 +609,7 @@ def handle_leave_room():
         # Notify others
         socketio.emit('player_left', {
             'session_id': session_id,
-            'room_info': room.get_room_info()
+            'room_info': room.get_leaderboard_snapshot()
         }, to=room_code)
 
         # Delete if empty
@@ -423,6 +621,7 @@ def handle_leave_room():
 
 
 @socketio.on('toggle_ready')
+@room_transaction
 def handle_toggle_ready(data):
     """Toggle player ready status."""
     session_id = get_session_id()
@@ -444,12 +643,13 @@ def handle_toggle_ready(data):
     socketio.emit('player_ready_changed', {
         'session_id': session_id,
         'ready': ready,
-        'room_info': room.get_room_info()
+        'room_info': room.get_leaderboard_snapshot()
     }, to=room_code)
     print(f"Ready status broadcast complete")
 
 
 @socketio.on('change_name')
+@room_transaction
 def handle_change_name(data):
     """Change player name."""
     session_id = get_session_id()
@@ -470,7 +670,7 @@ def handle_change_name(data):
         socketio.emit('player_name_changed', {
             'session_id': session_id,
             'name': new_name,
-            'room_info': room.get_room_info()
+            'room_info': room.get_leaderboard_snapshot()
         }, to=room_code)
         emit('name_change_success', {'success': True, 'name': new_name})
     else:
@@ -478,6 +678,7 @@ def handle_change_name(data):
 
 
 @socketio.on('start_game')
+@room_transaction
 def handle_start_game():
     """Start the multiplayer game (host only)."""
     session_id = get_session_id()
@@ -502,7 +703,10 @@ def handle_start_game():
         return
 
     # Get graph from host's game state
-    host_game = game_states[session_id]
+    host_game = state_backend.get_game(session_id)
+    if host_game is None or host_game.graph is None:
+        emit('start_failed', {'message': 'Host has no game loaded'})
+        return
 
     # DIAGNOSTIC: Check host's game state
     print(f"DEBUG: host_game exists: {host_game is not None}")
@@ -519,8 +723,14 @@ def handle_start_game():
     initial_tiles = host_game.graph.tiles.copy()
     print(f"Starting game in room {room_code} with tiles: {initial_tiles}")
 
+    # Players regenerate the puzzle from its seed unless the host's tiles
+    # no longer match it
+    puzzle_seed = None
+    if host_game.puzzle_seed and initial_tiles == host_game.initial_tiles:
+        puzzle_seed = dict(host_game.puzzle_seed)
+
     # Start the game
-    room.start_game(graph_edges, initial_tiles)
+    room.start_game(graph_edges, initial_tiles, puzzle_seed)
 
     # Broadcast to all players in room
     print(f"Broadcasting game_started to room {room_code}")
@@ -529,24 +739,35 @@ def handle_start_game():
     room_info_data = room.get_room_info()
     print(f"Room info state: {room_info_data.get('state')}")
     print(f"Room info has tiles: {bool(room_info_data.get('initial_tiles'))}")
+    print(f"Room info puzzle seed: {room_info_data.get('puzzle_seed')}")
 
     # DIAGNOSTIC: Show exactly what tiles are in room_info
     print(f"DEBUG: room_info_data['initial_tiles'] = {room_info_data.get('initial_tiles')}")
     print(f"DEBUG: type(room_info_data['initial_tiles']) = {type(room_info_data.get('initial_tiles'))}")
     print(f"DEBUG: len(room_info_data['initial_tiles']) = {len(room_info_data.get('initial_tiles', {}))}")
 
+    # Everyone starts from the host's board, seeded or not; the seed only
+    # identifies the puzzle. Moves are then played against the room
+    game_started = {'room_info': room_info_data, 'board': host_game.get_game_state()}
+
     # Use emit() with broadcast=True to send to room including sender
-    emit('game_started', {
-        'room_info': room_info_data
-    }, broadcast=True, to=room_code, include_self=True)
+    emit('game_started', game_started, broadcast=True, to=room_code, include_self=True)
     print(f"Game started event broadcast complete")
 
+    if room.mode == GameMode.REAL_TIME:
+        socketio.start_background_task(leaderboard_ticker, room.code)
+
 
 @socketio.on('player_move')
+@room_transaction
 def handle_player_move(data):
     """Handle a player making a move."""
     session_id = get_session_id()
 
+    if not isinstance(data, dict):
+        emit('move_failed', {'message': 'Invalid move'})
+        return
+
     if session_id not in session_rooms:
         return
 
@@ -556,26 +777,90 @@ def handle_player_move(data):
     if not room or room.state.value != 'playing':
         return
 
-    # For turn-based, check if it's this player's turn
-    if room.mode == GameMode.TURN_BASED:
-        if session_id not in room.players or not room.players[session_id].current_turn:
-            emit('move_failed', {'message': 'Not your turn'})
-            return
+    # The client only reports which nodes it swapped; the room checks the
+    # move against its shared graph and derives moves and solved itself
+    try:
+        node1 = int(data.get('node1'))
+        node2 = int(data.get('node2'))
+    except (TypeError, ValueError):
+        emit('move_failed', {'message': 'Invalid nodes'})
+        return
 
-    moves = data.get('moves', 0)
-    solved = data.get('solved', False)
+    result = room.apply_move(session_id, node1, node2)
+    if not result['success']:
+        emit('move_failed', {'message': result['message']})
+        return
 
-    # Update player progress
-    room.update_player_progress(session_id, moves, solved)
+    emit('move_accepted', {
+        'node1': node1,
+        'node2': node2,
+        'changed_tiles': result['changed_tiles'],
+        'moves': result['moves'],
+        'tiles_remaining': result['tiles_remaining'],
+        'solved': result['solved']
+    })
 
     # Advance turn if turn-based (always advance, even if solved)
     if room.mode == GameMode.TURN_BASED:
         next_session = room.next_turn()
+        broadcast_leaderboard(room)
+    else:
+        # Picked up by the room's leaderboard_ticker
+        room.broadcast_pending = True
+
+
+def leaderboard_ticker(room_code):
+    """
+    Background task for a real-time room: broadcast the leaderboard at most
+    once per GameRoom.BROADCAST_TICK while the game is running, so outbound
+    messages follow the tick rate instead of the move rate.
+    """
+    while True:
+        socketio.sleep(GameRoom.BROADCAST_TICK)
+        with state_backend.transaction():
+            room = mp_manager.get_room(room_code)
+            if room is None:
+                return
+            if room.broadcast_pending and room.players:
+                room.broadcast_pending = False
+                broadcast_leaderboard(room)
+            # The move that finished the game has just been flushed
+            if room.state != RoomState.PLAYING:
+                return
+
+
+def broadcast_leaderboard(room):
+    """
+    Send leaderboard changes to a room.
+
+    Normally only the players that changed are sent (leaderboard_delta);
+    every GameRoom.SNAPSHOT_EVERY_DELTAS deltas or SNAPSHOT_INTERVAL seconds
+    the full leaderboard goes out instead so clients cannot drift.
+    """
+    if room.snapshot_due():
+        socketio.emit('leaderboard_update', {
+            'room_info': room.get_leaderboard_snapshot()
+        }, to=room.code)
+    else:
+        socketio.emit('leaderboard_delta', room.get_leaderboard_delta(), to=room.code)
 
-    # Broadcast updated leaderboard
-    socketio.emit('leaderboard_update', {
-        'room_info': room.get_room_info()
-    }, to=room_code)
+
+@socketio.on('request_leaderboard')
+@room_transaction
+def handle_request_leaderboard():
+    """Resend the full leaderboard to a client that missed a delta."""
+    session_id = get_session_id()
+
+    if session_id not in session_rooms:
+        return
+
+    room = mp_manager.get_room(session_rooms[session_id])
+    if not room:
+        return
+
+    emit('leaderboard_update', {
+        'room_info': room.get_room_info(include_puzzle=False)
+    })
 
 
 if __name__ == '__main__':
@@ -10,34 +10,100 @@ from graph import Graph
 from graph_builder import GraphBuilder
 from tile_manager import TileManager
 from score_calculator import ScoreCalculator
-import math
+from bound_tracker import BoundTracker
+from hint_engine import HintEngine
+from puzzle_generator import PuzzleGenerator
+from layout_engine import LayoutEngine
+import json
+import secrets
+import threading
+import zlib
+from collections import OrderedDict
 
 
 class WebGameState:
     """Manages game state for web interface with enhanced features."""
 
+    # Static graph payloads (nodes, edges, positions) shared by every game on
+    # the same graph, keyed by graph fingerprint, least recently used last
+    GRAPH_PAYLOAD_CACHE_SIZE = 256
+    _graph_payloads = OrderedDict()
+    _graph_payloads_lock = threading.Lock()
+
     def __init__(self):
         self.graph = None
         self.tile_manager = None
         self.move_count = 0
         self.initial_tiles = None
         self.optimal_moves = 0
+        self.optimal_exact = True
+        self.optimal_lower_bound = 0
         self.game_active = False
         self.move_history = []  # For undo/redo: list of (node1, node2) tuples
         self.redo_stack = []    # For redo functionality
+        self.bound_tracker = None  # Live "moves left at least" bounds
+        # {'seed', 'num_nodes', 'num_edges', 'difficulty'} when the puzzle
+        # can be regenerated from its seed, else None
+        self.puzzle_seed = None
+        # Bumped on every change clients can see; never goes back, not
+        # even on reset, so it can serve as an ETag
+        self.state_version = 0
+        # Random per-instance tag prefix: a new instance for the same
+        # session (after eviction) restarts state_version from 0
+        self.state_epoch = secrets.token_hex(4)
+
+    @staticmethod
+    def default_edge_count(num_nodes):
+        """Edge count used when a random game does not specify one."""
+        min_edges = num_nodes - 1
+        max_edges = num_nodes * (num_nodes - 1) // 2
+        # Default to a moderately connected graph
+        return min(min_edges + num_nodes, max_edges)
+
+    def create_random_graph(self, num_nodes=6, num_edges=None, seed=None):
+        """
+        Create a random connected graph.
 
-    def create_random_graph(self, num_nodes=6, num_edges=None):
-        """Create a random connected graph."""
+        The graph (and tiles later assigned with assign_tiles_randomly) is
+        reproducible from (seed, num_nodes, num_edges); a seed is picked
+        when none is given.
+        """
         if num_edges is None:
-            min_edges = num_nodes - 1
-            max_edges = num_nodes * (num_nodes - 1) // 2
-            # Default to a moderately connected graph
-            num_edges = min(min_edges + num_nodes, max_edges)
+            num_edges = WebGameState.default_edge_count(num_nodes)
+        if seed is None:
+            seed = GraphBuilder.new_seed()
 
-        self.graph = GraphBuilder.create_random_with_params(num_nodes, num_edges)
+        self.graph = GraphBuilder.create_random_with_params(num_nodes, num_edges, seed)
         self.tile_manager = TileManager(self.graph)
+        self.state_version += 1
+        self.puzzle_seed = None
+        if self.graph is not None:
+            self.puzzle_seed = {'seed': seed, 'num_nodes': num_nodes, 'num_edges': num_edges}
         return self.graph is not None
 
+    def create_seeded_game(self, puzzle_seed):
+        """
+        Regenerate and start a puzzle from a puzzle_seed descriptor.
+
+        Args:
+            puzzle_seed: dict with 'seed', 'num_nodes' and optional
+                'num_edges' and 'difficulty', as produced by this class
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            seed = int(puzzle_seed['seed'])
+            num_nodes = int(puzzle_seed['num_nodes'])
+            num_edges = puzzle_seed.get('num_edges')
+            difficulty = puzzle_seed.get('difficulty')
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        if not self.create_random_graph(num_nodes, num_edges, seed):
+            return False
+        return self.assign_tiles_randomly(difficulty)
+
     def create_graph_from_edges(self, edges):
         """
         Create a graph from a list of edge tuples.
@@ -56,35 +122,134 @@ class WebGameState:
             if node1 != node2 and node1 > 0 and node2 > 0:
                 self.graph.add_edge(node1, node2)
 
+        if len(self.graph.adjacency_list) > GraphBuilder.max_nodes:
+            return False
+
         if not self.graph.is_connected():
             return False
 
         self.tile_manager = TileManager(self.graph)
+        self.puzzle_seed = None
+        self.state_version += 1
         return True
 
-    def assign_tiles_randomly(self):
-        """Randomly assign tiles and start the game."""
+    def assign_tiles_randomly(self, difficulty=None):
+        """
+        Randomly assign tiles and start the game.
+
+        Args:
+            difficulty: Optional target for PuzzleGenerator (an exact move
+                count, a (low, high) lower-bound band or a level name);
+                a uniform shuffle when omitted
+
+        Raises:
+            ValueError: if the difficulty is not understood
+        """
         if not self.tile_manager:
             return False
 
-        self.tile_manager.assign_tiles_randomly()
+        seed = self.puzzle_seed['seed'] if self.puzzle_seed else None
+        if difficulty is not None:
+            tiles = PuzzleGenerator.generate(self.graph, difficulty, seed=seed)
+            self.tile_manager.assign_tiles(tiles)
+        else:
+            self.tile_manager.assign_tiles_randomly(seed)
+
+            # Make sure not already solved
+            if self.tile_manager.is_solved():
+                self.tile_manager.assign_tiles_randomly(None if seed is None else seed + 1)
+
+        if self.puzzle_seed:
+            if isinstance(difficulty, int) and not isinstance(difficulty, bool):
+                # Exact targets depend on solver timing, so can't be replayed
+                self.puzzle_seed = None
+            else:
+                self.puzzle_seed['difficulty'] = difficulty
+
+        self._start_game()
+        return True
+
+    def assign_tiles(self, tile_assignment, result=None):
+        """
+        Start the game with a specific tile assignment.
 
-        # Make sure not already solved
-        if self.tile_manager.is_solved():
-            self.tile_manager.assign_tiles_randomly()
+        Args:
+            tile_assignment: dict mapping node -> tile number
+            result: Optional precomputed SolverResult for the assignment
 
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.tile_manager:
+            return False
+
+        if sorted(tile_assignment.keys()) != self.graph.get_nodes() or \
+                sorted(tile_assignment.values()) != self.graph.get_nodes():
+            return False
+
+        self.tile_manager.assign_tiles(tile_assignment)
+        self.puzzle_seed = None
+        self._start_game(result)
+        return True
+
+    @staticmethod
+    def bank_buckets(sizes):
+        """
+        PuzzleBank buckets for new games of the given node counts: the
+        default edge count with a uniform shuffle and every named level.
+        """
+        return [(num_nodes, WebGameState.default_edge_count(num_nodes), difficulty)
+                for num_nodes in sizes
+                for difficulty in (None, *PuzzleGenerator.LEVELS)]
+
+    def start_from_bank(self, puzzle_bank, num_nodes, num_edges=None, difficulty=None):
+        """
+        Start a pre-scored puzzle from a PuzzleBank, if one is stocked.
+
+        Returns:
+            True if a banked puzzle was started, False if the caller should
+            generate one instead
+        """
+        if num_edges is None:
+            num_edges = WebGameState.default_edge_count(num_nodes)
+        if difficulty is not None and not isinstance(difficulty, str):
+            return False  # Exact targets and bands are generated on demand
+
+        puzzle = puzzle_bank.take(num_nodes, num_edges, difficulty)
+        if puzzle is None:
+            return False
+
+        return (self.create_graph_from_edges(puzzle['edges']) and
+                self.assign_tiles(puzzle['tiles'], puzzle['result']))
+
+    def _start_game(self, result=None):
+        """Record the initial tiles, score them and reset move tracking."""
         self.initial_tiles = self.tile_manager.get_initial_configuration()
-        self.optimal_moves = ScoreCalculator.calculate_optimal_moves(self.initial_tiles)
+        if result is None:
+            result = ScoreCalculator.solve(self.graph, self.initial_tiles)
+        self.optimal_moves = result.optimal_moves
+        self.optimal_exact = result.exact
+        self.optimal_lower_bound = result.lower_bound
         self.move_count = 0
+        self.move_history = []
+        self.redo_stack = []
         self.game_active = True
-        return True
+        self.bound_tracker = BoundTracker(self.graph)
+        self.state_version += 1
+
+    def _apply_swap(self, node1, node2):
+        """Swap tiles and keep the incremental bounds in step."""
+        self.tile_manager.swap_tiles(node1, node2)
+        self.bound_tracker.apply_swap(node1, node2)
 
     def swap_tiles(self, node1, node2):
         """
         Attempt to swap tiles between two nodes.
 
         Returns:
-            dict with 'success' boolean and optional 'message' string
+            dict with 'success' boolean and optional 'message' string; a
+            successful swap also carries the move delta ('changed_tiles',
+            'move_count', flags and 'graph_version')
         """
         if not self.game_active:
             return {'success': False, 'message': 'Game not active'}
@@ -100,21 +265,88 @@ class WebGameState:
         # Clear redo stack when new move is made
         self.redo_stack = []
 
-        self.tile_manager.swap_tiles(node1, node2)
+        self._apply_swap(node1, node2)
         self.move_count += 1
+        self.state_version += 1
 
-        result = {
-            'success': True,
-            'move_count': self.move_count,
-            'solved': self.tile_manager.is_solved(),
-            'can_undo': len(self.move_history) > 0,
-            'can_redo': len(self.redo_stack) > 0
-        }
+        result = self._move_delta((node1, node2))
+        result['success'] = True
+        result['solved'] = self.tile_manager.is_solved()
 
         if result['solved']:
             self.game_active = False
             result['optimal_moves'] = self.optimal_moves
+            result['optimal_exact'] = self.optimal_exact
 
+        result['active'] = self.game_active
+        return result
+
+    def swap_tiles_batch(self, moves):
+        """
+        Apply an ordered list of swaps atomically.
+
+        Every move is checked as swap_tiles() would; at the first invalid
+        one (including any move after the puzzle is solved) all earlier
+        moves of the batch are rolled back and nothing changes.
+
+        Args:
+            moves: List of [node1, node2] pairs
+
+        Returns:
+            dict with 'success' and, on success, 'applied' plus the combined
+            move delta; on failure 'message' and the failing move's 'index'
+        """
+        if not self.game_active:
+            return {'success': False, 'message': 'Game not active', 'index': 0}
+
+        history_length = len(self.move_history)
+        redo_stack = self.redo_stack
+        touched = {}
+        solved = False
+        error = None
+
+        for index, move in enumerate(moves):
+            try:
+                node1, node2 = move
+            except (TypeError, ValueError):
+                node1 = node2 = None
+            if not isinstance(node1, int) or not isinstance(node2, int):
+                error = 'Malformed move'
+            elif solved:
+                error = 'Puzzle already solved'
+            elif not self.graph.has_node(node1) or not self.graph.has_node(node2):
+                error = 'Invalid nodes'
+            elif not self.graph.are_connected(node1, node2):
+                error = 'Nodes are not connected'
+            if error:
+                # Undo this batch's swaps, newest first
+                for node1, node2 in reversed(self.move_history[history_length:]):
+                    self._apply_swap(node1, node2)
+                del self.move_history[history_length:]
+                self.redo_stack = redo_stack
+                return {'success': False, 'message': error, 'index': index}
+
+            self._apply_swap(node1, node2)
+            self.move_history.append((node1, node2))
+            touched[node1] = touched[node2] = True
+            solved = self.tile_manager.is_solved()
+
+        if not touched:
+            return {'success': False, 'message': 'No moves given', 'index': 0}
+
+        self.redo_stack = []
+        self.move_count += len(moves)
+        self.state_version += 1
+
+        result = self._move_delta(touched)
+        result['success'] = True
+        result['applied'] = len(moves)
+        result['solved'] = solved
+        if solved:
+            self.game_active = False
+            result['optimal_moves'] = self.optimal_moves
+            result['optimal_exact'] = self.optimal_exact
+        result['active'] = self.game_active
         return result
 
     def undo_move(self):
@@ -133,15 +365,14 @@ class WebGameState:
         self.redo_stack.append((node1, node2))
 
         # Swap back
-        self.tile_manager.swap_tiles(node1, node2)
+        self._apply_swap(node1, node2)
         self.move_count = max(0, self.move_count - 1)
+        self.state_version += 1
 
-        return {
-            'success': True,
-            'move_count': self.move_count,
-            'can_undo': len(self.move_history) > 0,
-            'can_redo': len(self.redo_stack) > 0
-        }
+        result = self._move_delta((node1, node2))
+        result['success'] = True
+        result['active'] = self.game_active
+        return result
 
     def redo_move(self):
         """
@@ -159,71 +390,254 @@ class WebGameState:
         self.move_history.append((node1, node2))
 
         # Swap tiles
-        self.tile_manager.swap_tiles(node1, node2)
+        self._apply_swap(node1, node2)
         self.move_count += 1
+        self.state_version += 1
 
-        result = {
-            'success': True,
-            'move_count': self.move_count,
-            'solved': self.tile_manager.is_solved(),
-            'can_undo': len(self.move_history) > 0,
-            'can_redo': len(self.redo_stack) > 0
-        }
+        result = self._move_delta((node1, node2))
+        result['success'] = True
+        result['solved'] = self.tile_manager.is_solved()
 
         if result['solved']:
             self.game_active = False
             result['optimal_moves'] = self.optimal_moves
+            result['optimal_exact'] = self.optimal_exact
 
+        result['active'] = self.game_active
         return result
 
-    def get_game_state(self):
+    def get_hint(self):
         """
-        Get current game state as a dictionary for JSON serialization.
+        Suggest the next swap from the current tile configuration.
 
         Returns:
-            dict with graph structure, tiles, and game status
+            dict with 'success' boolean, the suggested 'node1'/'node2',
+            whether the hint is 'exact' (on a shortest solution) and the
+            optimal 'moves_left' when known
+        """
+        if not self.game_active:
+            return {'success': False, 'message': 'Game not active'}
+
+        hint = HintEngine(self.graph).suggest(self.graph.tiles)
+        if hint is None:
+            return {'success': False, 'message': 'Puzzle already solved'}
+
+        hint['success'] = True
+        return hint
+
+    def get_graph_payload(self):
+        """
+        Get the immutable part of the state: nodes, edges and positions.
+
+        Computed once per graph and cached by fingerprint, so it is shared
+        across sessions and requests. 'graph_version' identifies it; clients
+        keep it until a state or delta reports a different version.
+
+        Returns:
+            dict, or None if there is no graph; treat it as read-only
         """
         if not self.graph:
-            return {'active': False}
+            return None
 
-        # Build node positions for visualization (circular layout)
-        nodes = self.graph.get_nodes()
+        version = self.graph_version()
+        cache = WebGameState._graph_payloads
+        with WebGameState._graph_payloads_lock:
+            payload = cache.get(version)
+            if payload is not None:
+                cache.move_to_end(version)
+                return payload
+
+        compact = self.graph.compact()
+        nodes = list(compact.nodes)
         num_nodes = len(nodes)
-        node_positions = {}
-
-        for i, node in enumerate(nodes):
-            angle = 2 * math.pi * i / num_nodes - math.pi / 2
-            x = 0.5 + 0.4 * math.cos(angle)  # Normalized to [0.1, 0.9]
-            y = 0.5 + 0.4 * math.sin(angle)
-            node_positions[str(node)] = {'x': x, 'y': y}
-
-        # Build edge list
-        edges = []
-        for node in nodes:
-            for neighbor in self.graph.get_neighbors(node):
-                if node < neighbor:  # Only add each edge once
-                    edges.append([node, neighbor])
-
-        # Build tile information
-        tiles = {}
-        for node in nodes:
-            tile = self.graph.tiles.get(node, node)
-            tiles[str(node)] = {
-                'tile': tile,
-                'matched': tile == node
+
+        payload = {
+            'graph_version': version,
+            'nodes': nodes,
+            # Each edge once
+            'edges': [[node1, node2] for node1, node2 in compact.edges()]
+        }
+
+        # Node positions for visualization, normalized to [0.1, 0.9]
+        positions = LayoutEngine.layout(self.graph)
+
+        if GraphBuilder.is_large_graph(num_nodes):
+            # Parallel arrays in node order instead of per-node dicts keep
+            # large-graph payloads small; the client expands them
+            payload['compact'] = True
+            payload['positions'] = [round(c, 4) for position in positions for c in position]
+        else:
+            payload['node_positions'] = {
+                str(node): {'x': x, 'y': y} for node, (x, y) in zip(nodes, positions)
             }
 
-        return {
+        with WebGameState._graph_payloads_lock:
+            cache[version] = payload
+            while len(cache) > WebGameState.GRAPH_PAYLOAD_CACHE_SIZE:
+                cache.popitem(last=False)
+        return payload
+
+    def graph_version(self):
+        """Version of the graph payload, known without building it."""
+        return self.graph.fingerprint()[:16]
+
+    def state_etag(self, include_graph=True):
+        """
+        ETag for get_game_state(include_graph), computed without building it
+        or the graph payload, so answering a 304 never runs a layout.
+
+        Combines state_epoch, the graph version and state_version. A state
+        recreated for the same session restarts from version 0, possibly
+        on the same graph, but gets a new epoch, so it cannot match a tag
+        the client kept from the old one.
+        """
+        graph_version = self.graph_version() if self.graph else 'none'
+        return f"{self.state_epoch}-{graph_version}-{self.state_version}" + \
+            ("" if include_graph else "-s")
+
+    def get_game_state(self, include_graph=True):
+        """
+        Get current game state as a dictionary for JSON serialization.
+
+        Args:
+            include_graph: Include the static graph payload; without it
+                only 'graph_version' identifies the graph
+
+        Returns:
+            dict with graph structure, tiles, and game status
+        """
+        if not self.graph:
+            return {'active': False, 'state_version': self.state_version}
+
+        graph_payload = self.get_graph_payload()
+        state = dict(graph_payload) if include_graph else \
+            {'graph_version': graph_payload['graph_version']}
+        state.update({
             'active': self.game_active,
-            'nodes': nodes,
-            'edges': edges,
-            'node_positions': node_positions,
-            'tiles': tiles,
             'move_count': self.move_count,
             'optimal_moves': self.optimal_moves,
+            'optimal_exact': self.optimal_exact,
+            'optimal_lower_bound': self.optimal_lower_bound,
+            'tiles_remaining': self.tile_manager.tiles_remaining(),
+            'lower_bounds': self.bound_tracker.as_dict() if self.bound_tracker else None,
             'can_undo': len(self.move_history) > 0,
-            'can_redo': len(self.redo_stack) > 0
+            'can_redo': len(self.redo_stack) > 0,
+            'puzzle_seed': self.puzzle_seed,
+            'state_version': self.state_version
+        })
+
+        nodes = graph_payload['nodes']
+        tile_list = [self.graph.tiles.get(node, node) for node in nodes]
+
+        if graph_payload.get('compact'):
+            state['compact'] = True
+            state['tile_list'] = tile_list
+            return state
+
+        state['tiles'] = {
+            str(node): {'tile': tile, 'matched': tile == node}
+            for node, tile in zip(nodes, tile_list)
         }
+        return state
+
+    def _move_delta(self, nodes):
+        """Changes made by swaps touching the given nodes, for move results."""
+        return {
+            'graph_version': self.graph_version(),
+            'changed_tiles': {str(node): self.graph.tiles[node] for node in nodes},
+            'move_count': self.move_count,
+            'tiles_remaining': self.tile_manager.tiles_remaining(),
+            'lower_bounds': self.bound_tracker.as_dict(),
+            'can_undo': len(self.move_history) > 0,
+            'can_redo': len(self.redo_stack) > 0,
+            'state_version': self.state_version
+        }
+
+    def approx_size(self):
+        """
+        Rough memory footprint in bytes, for session store accounting.
+
+        Counts the graph (adjacency, tiles, cached distance matrix) and the
+        undo/redo history; interpreter overhead is folded into per-item
+        constants, so treat the figure as an estimate.
+        """
+        size = 2048
+        if self.graph is not None:
+            num_nodes = len(self.graph.tiles) or len(self.graph.adjacency_list)
+            num_edges = sum(len(n) for n in self.graph.adjacency_list.values()) // 2
+            size += 400 * num_nodes + 200 * num_edges
+            size += self.graph.distance_matrix_size()
+        size += 120 * (len(self.move_history) + len(self.redo_stack))
+        return size
+
+    def to_bytes(self):
+        """
+        Serialize the full state compactly for a shared state backend.
+
+        Unlike save_game(), the graph is always stored as edges and nothing
+        is re-scored on restore, so a round trip is cheap enough to do on
+        every request.
+
+        Returns:
+            zlib-compressed JSON bytes for from_bytes()
+        """
+        data = {'v': self.state_version, 'p': self.state_epoch}
+        if self.graph is not None:
+            nodes = self.graph.get_nodes()
+            data = {
+                'e': [node for edge in self.graph.compact().edges() for node in edge],
+                't': [self.graph.tiles[node] for node in nodes] if self.graph.tiles else None,
+                'i': [self.initial_tiles[node] for node in nodes] if self.initial_tiles else None,
+                'm': self.move_count,
+                'o': [self.optimal_moves, int(self.optimal_exact), self.optimal_lower_bound],
+                'a': int(self.game_active),
+                'h': [node for move in self.move_history for node in move],
+                'r': [node for move in self.redo_stack for node in move],
+                's': self.puzzle_seed,
+                'v': self.state_version,
+                'p': self.state_epoch
+            }
+            if self.bound_tracker is not None:
+                data['b'] = [self.bound_tracker.cycle_count, self.bound_tracker.distance_total]
+        return zlib.compress(json.dumps(data, separators=(',', ':')).encode())
+
+    @staticmethod
+    def from_bytes(blob):
+        """
+        Rebuild a game state serialized with to_bytes().
+
+        Returns:
+            WebGameState
+        """
+        game = WebGameState()
+        data = json.loads(zlib.decompress(blob))
+        game.state_version = data.get('v', 0)
+        game.state_epoch = data.get('p', game.state_epoch)
+        if 'e' not in data:
+            return game
+
+        def pairs(flat):
+            return [(flat[k], flat[k + 1]) for k in range(0, len(flat), 2)]
+
+        game.graph = Graph()
+        for node1, node2 in pairs(data['e']):
+            game.graph.add_edge(node1, node2)
+        nodes = game.graph.get_nodes()
+        if data['t'] is not None:
+            game.graph.tiles = dict(zip(nodes, data['t']))
+        game.tile_manager = TileManager(game.graph)
+        game.initial_tiles = dict(zip(nodes, data['i'])) if data['i'] is not None else None
+        game.move_count = data['m']
+        game.optimal_moves, optimal_exact, game.optimal_lower_bound = data['o']
+        game.optimal_exact = bool(optimal_exact)
+        game.game_active = bool(data['a'])
+        game.move_history = pairs(data['h'])
+        game.redo_stack = pairs(data['r'])
+        game.puzzle_seed = data['s']
+        if game.graph.tiles:
+            # Saved counts spare rebuilding all-pairs distances per request
+            game.bound_tracker = BoundTracker(game.graph, data.get('b'))
+        return game
 
     def save_game(self):
         """
@@ -235,25 +649,28 @@ class WebGameState:
         if not self.graph:
             return None
 
-        nodes = self.graph.get_nodes()
-        edges = []
-        for node in nodes:
-            for neighbor in self.graph.get_neighbors(node):
-                if node < neighbor:
-                    edges.append([node, neighbor])
-
-        return {
+        save_data = {
             'version': '1.0',
-            'edges': edges,
             'tiles': {str(k): v for k, v in self.graph.tiles.items()},
-            'initial_tiles': {str(k): v for k, v in self.initial_tiles.items()} if self.initial_tiles else {},
             'move_count': self.move_count,
             'optimal_moves': self.optimal_moves,
+            'optimal_exact': self.optimal_exact,
+            'optimal_lower_bound': self.optimal_lower_bound,
             'game_active': self.game_active,
             'move_history': self.move_history,
             'redo_stack': self.redo_stack
         }
 
+        # A seeded puzzle is regenerated on load instead of storing the graph
+        if self.puzzle_seed:
+            save_data['puzzle_seed'] = self.puzzle_seed
+        else:
+            save_data['edges'] = [[node1, node2] for node1, node2 in self.graph.compact().edges()]
+            save_data['initial_tiles'] = {str(k): v for k, v in self.initial_tiles.items()} \
+                if self.initial_tiles else {}
+
+        return save_data
+
     def load_game(self, save_data):
         """
         Restore game state from saved data.
@@ -265,22 +682,30 @@ class WebGameState:
             True if successful, False otherwise
         """
         try:
-            # Recreate graph
-            edges = [(e[0], e[1]) for e in save_data['edges']]
-            if not self.create_graph_from_edges(edges):
+            # Recreate graph, from its seed when the save carries one
+            if 'edges' in save_data:
+                edges = [(e[0], e[1]) for e in save_data['edges']]
+                if not self.create_graph_from_edges(edges):
+                    return False
+                self.initial_tiles = {int(k): v for k, v in save_data['initial_tiles'].items()}
+            elif not self.create_seeded_game(save_data['puzzle_seed']):
                 return False
 
             # Restore tiles
             tiles = {int(k): v for k, v in save_data['tiles'].items()}
             self.tile_manager.assign_tiles(tiles)
+            self.bound_tracker = BoundTracker(self.graph)
 
             # Restore game state
-            self.initial_tiles = {int(k): v for k, v in save_data['initial_tiles'].items()}
+            self.puzzle_seed = save_data.get('puzzle_seed')
             self.move_count = save_data['move_count']
             self.optimal_moves = save_data['optimal_moves']
+            self.optimal_exact = save_data.get('optimal_exact', True)
+            self.optimal_lower_bound = save_data.get('optimal_lower_bound', self.optimal_moves)
             self.game_active = save_data['game_active']
             self.move_history = save_data.get('move_history', [])
             self.redo_stack = save_data.get('redo_stack', [])
+            self.state_version += 1
 
             return True
         except Exception as e:
@@ -294,6 +719,11 @@ class WebGameState:
         self.move_count = 0
         self.initial_tiles = None
         self.optimal_moves = 0
+        self.optimal_exact = True
+        self.optimal_lower_bound = 0
         self.game_active = False
         self.move_history = []
         self.redo_stack = []
+        self.bound_tracker = None
+        self.puzzle_seed = None
+        self.state_version += 1